@@ -1,66 +1,138 @@
 #!/usr/bin/env python3
 """
-Servidor simplificado para Railway
+Servidor Reception Sync para Railway
+
+create_app(config_name) monta o app com a classe de Config, JWT, CORS e
+todos os blueprints. Os blueprints são importados dentro de create_app (não
+no import deste módulo), mas todos no boot de cada worker; o que fica para
+depois é só o requests, carregado na primeira sessão HTTP do database.py.
+
+O cliente do Supabase é aquecido em segundo plano: /api/health é liveness
+(não toca no banco) e /api/ready informa se a conexão está pronta.
 """
 
 import os
+from importlib import import_module
 from flask import Flask, jsonify
 from flask_cors import CORS
+from flask_jwt_extended import JWTManager
+from config import config
+from utils.logs import configurar_logs
+
+# (módulo, blueprint, prefixo da URL)
+BLUEPRINTS = [
+    ('blueprints.auth', 'auth_bp', '/api/auth'),
+    ('blueprints.dashboard', 'dashboard_bp', '/api/dashboard'),
+    ('blueprints.recepcao', 'recepcao_bp', '/api/recepcao'),
+    ('blueprints.admin', 'admin_bp', '/api/admin'),
+    ('blueprints.salas', 'salas_bp', '/api/salas'),
+    ('blueprints.orcamentos', 'orcamentos_bp', '/api/orcamentos'),
+    ('blueprints.estoque', 'estoque_bp', '/api/estoque'),
+    ('blueprints.brindes', 'brindes_bp', '/api/brindes'),
+    ('blueprints.anamnese', 'anamneses_bp', '/api/anamneses'),
+    ('blueprints.lista_espera', 'lista_espera_bp', '/api/lista-espera'),
+    ('blueprints.visitas', 'visitas_bp', '/api/visitas'),
+]
+
+def register_blueprints(app):
+    for modulo, nome, prefixo in BLUEPRINTS:
+        blueprint = getattr(import_module(modulo), nome)
+        app.register_blueprint(blueprint, url_prefix=prefixo)
+
+def register_routes(app):
+    from database import SupabaseIndisponivel
+
+    # Liveness para Railway: responde na hora, sem tocar no banco
+    @app.route('/api/health')
+    def health_check():
+        return jsonify({
+            'status': 'ok',
+            'message': 'Reception Sync API is running',
+            'port': os.environ.get('PORT', 'not_set'),
+            'python_version': '3.11'
+        }), 200
+
+    # Readiness: último resultado do aquecimento/verificação da conexão com o Supabase
+    @app.route('/api/ready')
+    def ready_check():
+        from database import estado_prontidao
+        estado = estado_prontidao()
+        return jsonify(estado), 200 if estado['status'] == 'pronto' else 503
+
+    # Root endpoint
+    @app.route('/')
+    def root():
+        return jsonify({
+            'message': 'Reception Sync API',
+            'status': 'online',
+            'version': '1.0.0'
+        }), 200
+
+    # Test endpoint
+    @app.route('/api/test')
+    def test():
+        return jsonify({
+            'message': 'API está funcionando!',
+            'status': 'success'
+        }), 200
+
+    # Error handlers
+    @app.errorhandler(404)
+    def not_found(error):
+        return jsonify({'error': 'Endpoint não encontrado'}), 404
+
+    @app.errorhandler(500)
+    def internal_error(error):
+        return jsonify({'error': 'Erro interno do servidor'}), 500
 
-# Criar app Flask
-app = Flask(__name__)
-
-# Configurar CORS
-CORS(app, origins="*")
-
-# Configurações básicas
-app.config['SECRET_KEY'] = os.environ.get('SECRET_KEY', 'dev-secret-for-testing')
-
-# Health check para Railway
-@app.route('/api/health')
-def health_check():
-    return jsonify({
-        'status': 'ok',
-        'message': 'Reception Sync API is running',
-        'port': os.environ.get('PORT', 'not_set'),
-        'python_version': '3.11'
-    }), 200
-
-# Root endpoint
-@app.route('/')
-def root():
-    return jsonify({
-        'message': 'Reception Sync API',
-        'status': 'online',
-        'version': '1.0.0'
-    }), 200
-
-# Test endpoint
-@app.route('/api/test')
-def test():
-    return jsonify({
-        'message': 'API está funcionando!',
-        'status': 'success'
-    }), 200
-
-# Error handlers
-@app.errorhandler(404)
-def not_found(error):
-    return jsonify({'error': 'Endpoint não encontrado'}), 404
-
-@app.errorhandler(500)
-def internal_error(error):
-    return jsonify({'error': 'Erro interno do servidor'}), 500
+    # Supabase fora do ar (prazo/novas tentativas esgotados ou circuito aberto)
+    @app.errorhandler(SupabaseIndisponivel)
+    def banco_indisponivel(error):
+        response = jsonify({'error': 'Banco de dados indisponível. Tente novamente em instantes.'})
+        response.headers['Retry-After'] = str(getattr(error, 'retry_after', 5))
+        return response, 503
+
+def create_app(config_name=None):
+    """Cria o app Flask; config_name é uma chave de config (development, production, testing)"""
+    if config_name is None:
+        config_name = os.environ.get('FLASK_ENV', 'default')
+
+    # Logs via fila: nenhuma escrita em stdout na thread da requisição
+    configurar_logs()
+
+    app = Flask(__name__)
+    app.config.from_object(config.get(config_name, config['default']))
+
+    CORS(app, origins=app.config['CORS_ORIGINS'])
+    JWTManager(app)
+
+    # Histogramas por rota e por tabela do Supabase, em /api/metrics
+    from utils.metricas import instalar_metricas
+    instalar_metricas(app)
+
+    # Chamadas ao Supabase por requisição: Server-Timing e aviso de orçamento
+    from utils.rastreio import instalar_rastreio
+    instalar_rastreio(app)
+
+    register_blueprints(app)
+    register_routes(app)
+
+    # Cliente do Supabase aquecido em segundo plano, fora do caminho das requisições
+    if not app.testing:
+        from database import iniciar_aquecimento
+        iniciar_aquecimento()
+    return app
 
 if __name__ == '__main__':
-    print("🚀 Iniciando Reception Sync Backend (Versão Simplificada)...")
-    
+    print("🚀 Iniciando Reception Sync Backend...")
+    app = create_app()
+
     # Configurações para Railway
     port = int(os.environ.get('PORT', 8000))
     host = '0.0.0.0'
-    
+
     print(f"📡 Rodando em: {host}:{port}")
     print(f"🔗 Health check: http://{host}:{port}/api/health")
     print("-" * 50)
-    
-    app.run(host=host, port=port, debug=False)
\ No newline at end of file
+
+    app.run(host=host, port=port, debug=False)
@@ -1,7 +1,10 @@
 from flask import Blueprint, request, jsonify
-from utils.permissions import require_role, get_current_user
+from utils.permissions import require_role, usuario_resolvido
 from models.user import User
 from database import get_supabase
+from database_async import get_supabase_async, coletar, rota_async
+from utils import stats as stats_db
+from utils.stats import invalida_dashboard
 
 admin_bp = Blueprint('admin', __name__)
 
@@ -27,6 +30,7 @@ def get_all_users():
 
 @admin_bp.route('/users', methods=['POST'])
 @require_role(['admin'])
+@invalida_dashboard
 def create_user():
     data = request.get_json()
     
@@ -56,30 +60,35 @@ def create_user():
 
 @admin_bp.route('/dashboard/overview', methods=['GET'])
 @require_role(['admin'])
-def dashboard_overview():
-    supabase = get_supabase()
+@rota_async
+async def dashboard_overview():
+    supabase = get_supabase_async()
+    # Resolvido por @require_role na thread da requisição
+    user = usuario_resolvido()
+    stats = await stats_db.dashboard_em_cache('admin.overview', user, lambda: calcular_overview(supabase))
     
+    return jsonify({'stats': stats}), 200
+
+async def calcular_overview(supabase):
     # Buscar estatísticas gerais
     stats = {}
     
+    resultados = await coletar({
+        'usuarios': stats_db.contar_tabela(supabase, 'usuarios'),
+        'salas': stats_db.resumo_salas(supabase),
+        'orcamentos': stats_db.contar_tabela(supabase, 'orcamentos')
+    })
+    
     # Total de usuários
-    users_result = supabase.table('usuarios').select('id').execute()
-    stats['total_usuarios'] = len(users_result.data)
+    stats['total_usuarios'] = resultados['usuarios']
     
-    # Total de salas
-    salas_result = supabase.table('salas').select('id').execute()
-    stats['total_salas'] = len(salas_result.data)
+    # Total de salas e salas por recepção
+    salas = resultados['salas']
+    stats['total_salas'] = salas['total']
     
     # Total de orçamentos
-    orcamentos_result = supabase.table('orcamentos').select('id').execute()
-    stats['total_orcamentos'] = len(orcamentos_result.data)
-    
-    # Salas por recepção
-    salas_por_recepcao = {}
-    for sala in salas_result.data:
-        recepcao = sala.get('recepcao_id', 'Não definida')
-        salas_por_recepcao[recepcao] = salas_por_recepcao.get(recepcao, 0) + 1
+    stats['total_orcamentos'] = resultados['orcamentos']
     
-    stats['salas_por_recepcao'] = salas_por_recepcao
+    stats['salas_por_recepcao'] = salas['por_recepcao']
     
-    return jsonify({'stats': stats}), 200
\ No newline at end of file
+    return stats
\ No newline at end of file
@@ -1,11 +1,15 @@
 # blueprints/anamneses.py - Sistema completo de anamneses
 from flask import Blueprint, request, jsonify
-from utils.permissions import require_recepcao, require_auth, get_current_user
-from database import get_supabase
+from utils.permissions import require_recepcao, require_auth, get_current_user, usuario_resolvido
+from database import get_supabase, SupabaseIndisponivel
+from utils.pagination import ler_paginacao
+from utils.stats import invalida_dashboard
+from database_async import get_supabase_async, rota_async
 from datetime import datetime, date
-import traceback
+import logging
 
 anamneses_bp = Blueprint('anamneses', __name__)
+logger = logging.getLogger(__name__)
 
 def can_access_anamneses(user):
     """Verifica se o usuário pode acessar o módulo de anamneses"""
@@ -22,6 +26,7 @@ def can_access_anamneses(user):
 @anamneses_bp.route('/', methods=['GET'])
 @require_auth
 def get_anamneses():
+    pagina = ler_paginacao('anamneses')
     try:
         user = get_current_user()
         
@@ -34,17 +39,16 @@ def get_anamneses():
         supabase = get_supabase()
         
         # Se for admin, busca todas as anamneses
-        if user.role in ['admin', 'admin_geral', 'admin_limitado']:
-            query = supabase.table('anamneses').select('*')
-        else:
+        query = pagina.select(supabase.table('anamneses'))
+        if user.role not in ['admin', 'admin_geral', 'admin_limitado']:
             # Se for recepção, busca apenas suas anamneses
-            query = supabase.table('anamneses').select('*').eq('recepcao_id', user.recepcao_id)
+            query = query.eq('recepcao_id', user.recepcao_id)
         
-        result = query.order('created_at', desc=True).execute()
+        anamneses, next_cursor = pagina.executar(query)
         
         # Processar dados para incluir informações calculadas
         anamneses_processadas = []
-        for anamnese in result.data:
+        for anamnese in anamneses:
             anamnese_data = dict(anamnese)
             
             # Calcular dias desde a criação
@@ -55,21 +59,24 @@ def get_anamneses():
             
             anamneses_processadas.append(anamnese_data)
         
-        print(f"✅ Anamneses carregadas: {len(anamneses_processadas)} para usuário {user.username}")
+        logger.debug('Anamneses carregadas', extra={'usuario': user.username, 'total': len(anamneses_processadas)})
         
         return jsonify({
             'anamneses': anamneses_processadas,
-            'total': len(anamneses_processadas),
-            'user_recepcao': user.recepcao_nome
+            'count': len(anamneses_processadas),
+            'user_recepcao': user.recepcao_nome,
+            'next_cursor': next_cursor
         }), 200
         
-    except Exception as e:
-        print(f"💥 ERRO ao buscar anamneses: {str(e)}")
-        print(f"📋 Traceback: {traceback.format_exc()}")
+    except SupabaseIndisponivel:
+        raise
+    except Exception:
+        logger.exception('Erro ao buscar anamneses')
         return jsonify({'error': 'Erro interno do servidor'}), 500
 
 @anamneses_bp.route('/', methods=['POST'])
 @require_auth
+@invalida_dashboard
 def registrar_anamnese():
     try:
         user = get_current_user()
@@ -81,7 +88,6 @@ def registrar_anamnese():
             }), 403
         
         data = request.get_json()
-        print(f"📝 Registrando nova anamnese: {data}")
         
         # Campos obrigatórios
         required_fields = ['nome_pais', 'nome_paciente', 'data_anamnese', 'profissional', 'motivo_consulta']
@@ -120,7 +126,7 @@ def registrar_anamnese():
         
         if result.data:
             anamnese_criada = result.data[0]
-            print(f"✅ Anamnese criada com sucesso: ID {anamnese_criada['id']}")
+            logger.info('Anamnese criada', extra={'anamnese_id': anamnese_criada['id'], 'usuario': user.username})
             
             return jsonify({
                 'message': 'Anamnese registrada com sucesso',
@@ -129,13 +135,15 @@ def registrar_anamnese():
         
         return jsonify({'error': 'Erro ao inserir anamnese no banco de dados'}), 500
         
-    except Exception as e:
-        print(f"💥 ERRO ao registrar anamnese: {str(e)}")
-        print(f"📋 Traceback: {traceback.format_exc()}")
+    except SupabaseIndisponivel:
+        raise
+    except Exception:
+        logger.exception('Erro ao registrar anamnese')
         return jsonify({'error': 'Erro interno do servidor'}), 500
 
 @anamneses_bp.route('/<int:anamnese_id>', methods=['PUT'])
 @require_auth
+@invalida_dashboard
 def atualizar_anamnese(anamnese_id):
     try:
         user = get_current_user()
@@ -147,7 +155,6 @@ def atualizar_anamnese(anamnese_id):
             }), 403
         
         data = request.get_json()
-        print(f"📝 Atualizando anamnese {anamnese_id}: {data}")
         
         supabase = get_supabase()
         
@@ -189,7 +196,9 @@ def atualizar_anamnese(anamnese_id):
             result = supabase.table('anamneses').update(update_data).eq('id', anamnese_id).execute()
             
             if result.data:
-                print(f"✅ Anamnese {anamnese_id} atualizada com sucesso")
+                logger.info('Anamnese atualizada', extra={
+                    'anamnese_id': anamnese_id, 'usuario': user.username, 'campos': sorted(update_data)
+                })
                 return jsonify({
                     'message': 'Anamnese atualizada com sucesso',
                     'anamnese': result.data[0]
@@ -197,13 +206,15 @@ def atualizar_anamnese(anamnese_id):
         
         return jsonify({'error': 'Nenhum dado para atualizar ou erro no banco'}), 400
         
-    except Exception as e:
-        print(f"💥 ERRO ao atualizar anamnese: {str(e)}")
-        print(f"📋 Traceback: {traceback.format_exc()}")
+    except SupabaseIndisponivel:
+        raise
+    except Exception:
+        logger.exception('Erro ao atualizar anamnese', extra={'anamnese_id': anamnese_id})
         return jsonify({'error': 'Erro interno do servidor'}), 500
 
 @anamneses_bp.route('/<int:anamnese_id>', methods=['DELETE'])
 @require_auth
+@invalida_dashboard
 def deletar_anamnese(anamnese_id):
     try:
         user = get_current_user()
@@ -231,21 +242,24 @@ def deletar_anamnese(anamnese_id):
         result = supabase.table('anamneses').delete().eq('id', anamnese_id).execute()
         
         if result.data:
-            print(f"✅ Anamnese {anamnese_id} deletada com sucesso")
+            logger.info('Anamnese deletada', extra={'anamnese_id': anamnese_id, 'usuario': user.username})
             return jsonify({'message': 'Anamnese deletada com sucesso'}), 200
         
         return jsonify({'error': 'Erro ao deletar anamnese'}), 500
         
-    except Exception as e:
-        print(f"💥 ERRO ao deletar anamnese: {str(e)}")
-        print(f"📋 Traceback: {traceback.format_exc()}")
+    except SupabaseIndisponivel:
+        raise
+    except Exception:
+        logger.exception('Erro ao deletar anamnese', extra={'anamnese_id': anamnese_id})
         return jsonify({'error': 'Erro interno do servidor'}), 500
 
 @anamneses_bp.route('/estatisticas', methods=['GET'])
 @require_auth
-def get_estatisticas_anamneses():
+@rota_async
+async def get_estatisticas_anamneses():
     try:
-        user = get_current_user()
+        # Resolvido por @require_auth na thread da requisição
+        user = usuario_resolvido()
         
         # Verificar se o usuário pode acessar anamneses
         if not can_access_anamneses(user):
@@ -253,68 +267,32 @@ def get_estatisticas_anamneses():
                 'error': 'Acesso negado. Módulo disponível apenas para recepções 808 e 108.'
             }), 403
         
-        supabase = get_supabase()
+        supabase = get_supabase_async()
         
-        # Buscar anamneses para estatísticas
-        if user.role in ['admin', 'admin_geral', 'admin_limitado']:
-            result = supabase.table('anamneses').select('*').execute()
-        else:
-            result = supabase.table('anamneses').select('*').eq('recepcao_id', user.recepcao_id).execute()
-        
-        anamneses = result.data
-        hoje = date.today()
-        
-        # Calcular estatísticas
-        estatisticas = {
-            'total_anamneses': len(anamneses),
-            'agendadas': len([a for a in anamneses if a.get('status') == 'agendada']),
-            'realizadas': len([a for a in anamneses if a.get('status') == 'realizada']),
-            'canceladas': len([a for a in anamneses if a.get('status') == 'cancelada']),
-            'este_mes': 0,
-            'proximo_mes': 0,
-            'por_profissional': {},
-            'por_tipo': {},
-            'por_mes': {}
-        }
-        
-        for anamnese in anamneses:
-            # Anamneses por mês
-            data_anamnese = datetime.strptime(anamnese['data_anamnese'], '%Y-%m-%d').date()
-            
-            if data_anamnese.month == hoje.month and data_anamnese.year == hoje.year:
-                estatisticas['este_mes'] += 1
-            
-            # Próximo mês
-            proximo_mes = hoje.month + 1 if hoje.month < 12 else 1
-            proximo_ano = hoje.year if hoje.month < 12 else hoje.year + 1
-            if data_anamnese.month == proximo_mes and data_anamnese.year == proximo_ano:
-                estatisticas['proximo_mes'] += 1
-            
-            # Por profissional
-            profissional = anamnese.get('profissional', 'Não informado')
-            estatisticas['por_profissional'][profissional] = estatisticas['por_profissional'].get(profissional, 0) + 1
-            
-            # Por tipo
-            tipo = anamnese.get('tipo_anamnese', 'Não informado')
-            estatisticas['por_tipo'][tipo] = estatisticas['por_tipo'].get(tipo, 0) + 1
-            
-            # Por mês (para gráficos)
-            mes_ano = data_anamnese.strftime('%Y-%m')
-            estatisticas['por_mes'][mes_ano] = estatisticas['por_mes'].get(mes_ano, 0) + 1
+        # Agregado no Postgres (rpc da migration estatisticas_anamneses): um objeto, não a tabela inteira
+        recepcao_id = None if user.role in ['admin', 'admin_geral', 'admin_limitado'] else user.recepcao_id
+        result = await supabase.rpc('estatisticas_anamneses', {
+            'p_recepcao_id': recepcao_id,
+            'p_hoje': date.today().isoformat()
+        }).execute_async()
+        estatisticas = result.data[0]
         
         # Profissionais mais ativos
         estatisticas['profissionais_ativos'] = len(estatisticas['por_profissional'])
         
-        print(f"📊 Estatísticas calculadas para {user.username}: {estatisticas['total_anamneses']} anamneses")
+        logger.debug('Estatísticas de anamneses calculadas', extra={
+            'usuario': user.username, 'total': estatisticas['total_anamneses']
+        })
         
         return jsonify({
             'estatisticas': estatisticas,
             'user_recepcao': user.recepcao_nome
         }), 200
         
-    except Exception as e:
-        print(f"💥 ERRO ao calcular estatísticas: {str(e)}")
-        print(f"📋 Traceback: {traceback.format_exc()}")
+    except SupabaseIndisponivel:
+        raise
+    except Exception:
+        logger.exception('Erro ao calcular estatísticas de anamneses')
         return jsonify({'error': 'Erro interno do servidor'}), 500
 
 @anamneses_bp.route('/profissionais', methods=['GET'])
@@ -350,6 +328,8 @@ def get_profissionais():
             'total': len(profissionais)
         }), 200
         
-    except Exception as e:
-        print(f"💥 ERRO ao buscar profissionais: {str(e)}")
+    except SupabaseIndisponivel:
+        raise
+    except Exception:
+        logger.exception('Erro ao buscar profissionais')
         return jsonify({'error': 'Erro interno do servidor'}), 500
\ No newline at end of file
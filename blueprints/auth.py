@@ -1,55 +1,68 @@
 # blueprints/auth.py - Versão melhorada
 from flask import Blueprint, request, jsonify
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
+from database import SupabaseIndisponivel
 from models.user import User
-from utils.permissions import get_current_user
-from werkzeug.security import generate_password_hash, check_password_hash
-import traceback
+from utils.permissions import get_current_user, require_auth
+from utils.senhas import HashSaturado, gerar_hash_no_pool, login_bloqueado, registrar_falha, limpar_falhas
+import logging
 import re
 
 auth_bp = Blueprint('auth', __name__)
+logger = logging.getLogger(__name__)
+
+def ip_cliente():
+    # O último X-Forwarded-For é o adicionado pelo proxy da Railway (não forjável pelo cliente)
+    return request.access_route[-1] if request.access_route else request.remote_addr
+
+def muitas_tentativas(retry_after, mensagem):
+    response = jsonify({'error': mensagem})
+    response.headers['Retry-After'] = str(retry_after)
+    return response, 429
 
 @auth_bp.route('/login', methods=['POST'])
 def login():
     try:
-        print("🔍 DEBUG: Início do login")
-        
         data = request.get_json()
-        print(f"📥 Dados recebidos: {data}")
         
         username = data.get('username')
         password = data.get('password')
         
         if not username or not password:
-            print("❌ Username ou password vazios")
             return jsonify({'error': 'Username e password são obrigatórios'}), 400
         
-        print(f"🔍 Buscando usuário: {username}")
+        ip = ip_cliente()
+        espera = login_bloqueado(username, ip)
+        if espera:
+            logger.warning('Login bloqueado por tentativas', extra={'usuario': username, 'ip': ip, 'espera_s': espera})
+            return muitas_tentativas(espera, 'Muitas tentativas de login. Tente novamente em instantes.')
+        
         user = User.find_by_username(username)
         
         if not user:
-            print(f"❌ Usuário '{username}' não encontrado")
+            logger.info('Login com usuário inexistente', extra={'usuario': username, 'ip': ip})
+            registrar_falha(username, ip)
             return jsonify({'error': 'Credenciais inválidas'}), 401
         
-        print(f"✅ Usuário encontrado: {user.username}")
-        
         # Verificar se o usuário está ativo
         if not user.ativo:
-            print(f"❌ Usuário '{username}' está inativo")
+            logger.info('Login de usuário inativo', extra={'usuario': username})
             return jsonify({'error': 'Usuário inativo. Entre em contato com o administrador.'}), 401
         
-        print("🔐 Verificando senha...")
         password_check = user.check_password(password)
         
         if not password_check:
-            print("❌ Senha incorreta")
+            logger.info('Login com senha incorreta', extra={'usuario': username, 'ip': ip})
+            registrar_falha(username, ip)
             return jsonify({'error': 'Credenciais inválidas'}), 401
         
-        print("🎫 Criando access token...")
-        access_token = create_access_token(identity=username)
+        limpar_falhas(username, ip)
+        user.atualizar_hash_se_necessario(password)
+        
+        access_token = create_access_token(identity=user.username, additional_claims=user.token_claims())
         
         user_dict = user.to_dict()
-        print(f"✅ Login bem-sucedido para: {username}")
+        logger.info('Login ok', extra={'usuario': user.username})
         
         return jsonify({
             'access_token': access_token,
@@ -57,28 +70,31 @@ def login():
             'message': 'Login realizado com sucesso'
         }), 200
         
-    except Exception as e:
-        print(f"💥 ERRO NO LOGIN: {str(e)}")
-        print(f"📋 Traceback: {traceback.format_exc()}")
+    except HashSaturado:
+        logger.warning('Pool de hash saturado no login')
+        return muitas_tentativas(1, 'Servidor ocupado. Tente novamente em instantes.')
+    except SupabaseIndisponivel:
+        raise
+    except Exception:
+        logger.exception('Erro no login')
         return jsonify({'error': 'Erro interno do servidor'}), 500
 
 @auth_bp.route('/me', methods=['GET'])
-@jwt_required()
+@require_auth
 def get_current_user_info():
     try:
-        print("🔍 DEBUG: Verificando usuário atual")
         user = get_current_user()
         if user:
-            print(f"✅ Usuário autenticado: {user.username}")
             return jsonify({'user': user.to_dict()}), 200
-        print("❌ Usuário não encontrado")
         return jsonify({'error': 'Usuário não encontrado'}), 404
-    except Exception as e:
-        print(f"💥 ERRO NO /me: {str(e)}")
+    except SupabaseIndisponivel:
+        raise
+    except Exception:
+        logger.exception('Erro no /me')
         return jsonify({'error': 'Token inválido'}), 401
 
 @auth_bp.route('/change-password', methods=['POST'])
-@jwt_required()
+@require_auth
 def change_password():
     try:
         from database import get_supabase
@@ -87,8 +103,6 @@ def change_password():
         current_password = data.get('current_password')
         new_password = data.get('new_password')
         
-        print(f"🔑 Tentativa de mudança de senha")
-        
         # Validações básicas
         if not current_password or not new_password:
             return jsonify({'error': 'Senha atual e nova senha são obrigatórias'}), 400
@@ -103,24 +117,29 @@ def change_password():
         if not re.search(r'[a-zA-Z]', new_password):
             return jsonify({'error': 'Nova senha deve conter pelo menos 1 letra'}), 400
         
-        # Buscar usuário atual
-        user = get_current_user()
+        # Buscar usuário atual (registro completo, com hash de senha)
+        if not get_current_user():
+            return jsonify({'error': 'Usuário não encontrado'}), 404
+        user = User.find_by_username(get_jwt_identity())
         if not user:
             return jsonify({'error': 'Usuário não encontrado'}), 404
         
-        print(f"🔐 Verificando senha atual para: {user.username}")
+        ip = ip_cliente()
+        espera = login_bloqueado(user.username, ip)
+        if espera:
+            return muitas_tentativas(espera, 'Muitas tentativas. Tente novamente em instantes.')
         
         # Verificar senha atual
         if not user.check_password(current_password):
-            print("❌ Senha atual incorreta")
+            logger.info('Troca de senha com senha atual incorreta', extra={'usuario': user.username, 'ip': ip})
+            registrar_falha(user.username, ip)
             return jsonify({'error': 'Senha atual incorreta'}), 400
         
-        # Verificar se a nova senha é diferente da atual
-        if user.check_password(new_password):
+        # A senha atual acabou de ser confirmada, então basta comparar sem outro hash
+        if new_password == current_password:
             return jsonify({'error': 'A nova senha deve ser diferente da senha atual'}), 400
         
-        print("🔒 Gerando nova hash de senha...")
-        new_password_hash = generate_password_hash(new_password)
+        new_password_hash = gerar_hash_no_pool(new_password)
         
         # Atualizar senha no banco
         supabase = get_supabase()
@@ -129,18 +148,30 @@ def change_password():
             'updated_at': 'now()'
         }).eq('id', user.id).execute()
         
+        User.invalidate_cache(user.username, user.email)
+        
         if result.data:
-            print(f"✅ Senha alterada com sucesso para: {user.username}")
+            logger.info('Senha alterada', extra={'usuario': user.username})
+            limpar_falhas(user.username, ip)
+            # O token atual foi revogado pela troca de senha; emitir um novo
+            # (a linha devolvida já traz a senha_versao incrementada pelo banco)
+            user = User._from_row(result.data[0])
+            access_token = create_access_token(identity=user.username, additional_claims=user.token_claims())
             return jsonify({
                 'message': 'Senha alterada com sucesso',
-                'timestamp': result.data[0].get('updated_at')
+                'timestamp': result.data[0].get('updated_at'),
+                'access_token': access_token
             }), 200
         
         return jsonify({'error': 'Erro ao alterar senha no banco de dados'}), 500
         
-    except Exception as e:
-        print(f"💥 ERRO na mudança de senha: {str(e)}")
-        print(f"📋 Traceback: {traceback.format_exc()}")
+    except HashSaturado:
+        logger.warning('Pool de hash saturado na troca de senha')
+        return muitas_tentativas(1, 'Servidor ocupado. Tente novamente em instantes.')
+    except SupabaseIndisponivel:
+        raise
+    except Exception:
+        logger.exception('Erro na mudança de senha')
         return jsonify({'error': 'Erro interno do servidor'}), 500
 
 @auth_bp.route('/validate-password', methods=['POST'])
@@ -177,8 +208,8 @@ def validate_password():
             'strength': strength
         }), 200
         
-    except Exception as e:
-        print(f"💥 ERRO na validação de senha: {str(e)}")
+    except Exception:
+        logger.exception('Erro na validação de senha')
         return jsonify({'error': 'Erro interno do servidor'}), 500
 
 @auth_bp.route('/logout', methods=['POST'])
@@ -188,21 +219,22 @@ def logout():
     try:
         user = get_current_user()
         if user:
-            print(f"🚪 Logout realizado para: {user.username}")
+            logger.info('Logout', extra={'usuario': user.username})
         
         return jsonify({
             'message': 'Logout realizado com sucesso'
         }), 200
         
-    except Exception as e:
-        print(f"💥 ERRO no logout: {str(e)}")
+    except SupabaseIndisponivel:
+        raise
+    except Exception:
+        logger.exception('Erro no logout')
         return jsonify({'error': 'Erro interno do servidor'}), 500
 
 # Rota adicional para debug
 @auth_bp.route('/debug-user/<username>', methods=['GET'])
 def debug_user(username):
     try:
-        print(f"🔍 DEBUG: Buscando dados do usuário {username}")
         user = User.find_by_username(username)
         
         if not user:
@@ -218,6 +250,8 @@ def debug_user(username):
             'hash_preview': user.password_hash[:50] + '...' if user.password_hash else None
         })
         
+    except SupabaseIndisponivel:
+        raise
     except Exception as e:
-        print(f"💥 ERRO NO DEBUG: {str(e)}")
+        logger.exception('Erro no debug-user')
         return jsonify({'error': str(e)}), 500
\ No newline at end of file
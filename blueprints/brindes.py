@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from utils.permissions import require_recepcao, get_current_user
 from database import get_supabase
+from utils.pagination import ler_paginacao
+from utils.stats import invalida_dashboard
 from datetime import datetime
 
 brindes_bp = Blueprint('brindes', __name__)
@@ -10,15 +12,15 @@ brindes_bp = Blueprint('brindes', __name__)
 def get_brindes():
     user = get_current_user()
     supabase = get_supabase()
+    pagina = ler_paginacao('brindes')
     
-    if user.recepcao_id == '1002' or user.role == 'admin':
-        # 1002 e admin veem tudo
-        result = supabase.table('brindes').select('*').order('created_at', desc=True).execute()
-    else:
-        # Outras recepções veem apenas seus registros
-        result = supabase.table('brindes').select('*').eq('recepcao_id', user.recepcao_id).order('created_at', desc=True).execute()
+    query = pagina.select(supabase.table('brindes'))
+    if user.recepcao_id != '1002' and user.role != 'admin':
+        # Outras recepções veem apenas seus registros (1002 e admin veem tudo)
+        query = query.eq('recepcao_id', user.recepcao_id)
     
-    return jsonify({'brindes': result.data}), 200
+    brindes, next_cursor = pagina.executar(query)
+    return jsonify({'brindes': brindes, 'next_cursor': next_cursor}), 200
 
 @brindes_bp.route('/estoque', methods=['GET'])
 @require_recepcao(['1002'])
@@ -29,6 +31,7 @@ def get_estoque_brindes():
 
 @brindes_bp.route('/distribuir', methods=['POST'])
 @require_recepcao(['1002'])
+@invalida_dashboard
 def distribuir_brindes():
     user = get_current_user()
     data = request.get_json()
@@ -40,36 +43,27 @@ def distribuir_brindes():
     
     supabase = get_supabase()
     
-    # Verificar estoque disponível
-    item_result = supabase.table('estoque_brindes').select('*').eq('id', data['item_id']).execute()
-    if not item_result.data:
+    # Verifica saldo, baixa o estoque e registra a distribuição numa única transação
+    result = supabase.rpc('registrar_distribuicao_brindes', {
+        'p_item_id': data['item_id'],
+        'p_quantidade': data['quantidade'],
+        'p_recepcao_origem': '1002',
+        'p_recepcao_destino': data['recepcao_destino'],
+        'p_observacoes': data.get('observacoes', ''),
+        'p_created_by': user.username
+    }).execute()
+    resposta = result.data[0] if isinstance(result.data, list) else result.data
+    
+    status = resposta.get('status') if resposta else None
+    if status == 'item_nao_encontrado':
         return jsonify({'error': 'Item não encontrado'}), 404
-    
-    item = item_result.data[0]
-    if item['quantidade'] < data['quantidade']:
+    if status == 'quantidade_insuficiente':
         return jsonify({'error': 'Quantidade insuficiente em estoque'}), 400
+    if status == 'quantidade_invalida':
+        return jsonify({'error': 'Quantidade deve ser maior que zero'}), 400
     
-    # Registrar distribuição
-    distribuicao_data = {
-        'item_id': data['item_id'],
-        'item_nome': item['nome'],
-        'quantidade': data['quantidade'],
-        'recepcao_origem': '1002',
-        'recepcao_destino': data['recepcao_destino'],
-        'observacoes': data.get('observacoes', ''),
-        'created_at': datetime.now().isoformat(),
-        'created_by': user.username
-    }
-    
-    # Atualizar estoque
-    nova_quantidade = item['quantidade'] - data['quantidade']
-    supabase.table('estoque_brindes').update({'quantidade': nova_quantidade}).eq('id', data['item_id']).execute()
-    
-    # Inserir registro de distribuição
-    result = supabase.table('distribuicao_brindes').insert(distribuicao_data).execute()
-    
-    if result.data:
-        return jsonify({'message': 'Distribuição registrada com sucesso', 'distribuicao': result.data[0]}), 201
+    if status == 'ok':
+        return jsonify({'message': 'Distribuição registrada com sucesso', 'distribuicao': resposta['registro']}), 201
     
     return jsonify({'error': 'Erro ao registrar distribuição'}), 500
 
@@ -110,9 +104,11 @@ def solicitar_brindes():
 def get_brindes_visitantes():
     user = get_current_user()
     supabase = get_supabase()
+    pagina = ler_paginacao('brindes_visitantes')
     
-    result = supabase.table('brindes_visitantes').select('*').eq('recepcao_id', user.recepcao_id).order('created_at', desc=True).execute()
-    return jsonify({'brindes_visitantes': result.data}), 200
+    query = pagina.select(supabase.table('brindes_visitantes')).eq('recepcao_id', user.recepcao_id)
+    brindes_visitantes, next_cursor = pagina.executar(query)
+    return jsonify({'brindes_visitantes': brindes_visitantes, 'next_cursor': next_cursor}), 200
 
 @brindes_bp.route('/visitantes', methods=['POST'])
 @require_recepcao(['108'])
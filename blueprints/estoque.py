@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from utils.permissions import require_recepcao, get_current_user
 from database import get_supabase
+from utils.pagination import ler_paginacao
+from utils.stats import invalida_dashboard
 from datetime import datetime
 
 estoque_bp = Blueprint('estoque', __name__)
@@ -16,6 +18,7 @@ def get_estoque():
 
 @estoque_bp.route('/item', methods=['POST'])
 @require_recepcao(['103'])
+@invalida_dashboard
 def add_item_estoque():
     user = get_current_user()
     data = request.get_json()
@@ -46,6 +49,7 @@ def add_item_estoque():
 
 @estoque_bp.route('/retirada', methods=['POST'])
 @require_recepcao(['103'])
+@invalida_dashboard
 def registrar_retirada():
     user = get_current_user()
     data = request.get_json()
@@ -57,36 +61,27 @@ def registrar_retirada():
     
     supabase = get_supabase()
     
-    # Verificar se o item existe e tem quantidade suficiente
-    item_result = supabase.table('estoque').select('*').eq('id', data['item_id']).execute()
-    if not item_result.data:
+    # Verifica saldo, baixa o estoque e registra a retirada numa única transação
+    result = supabase.rpc('registrar_retirada_estoque', {
+        'p_item_id': data['item_id'],
+        'p_quantidade': data['quantidade'],
+        'p_retirado_por': data['retirado_por'],
+        'p_observacoes': data.get('observacoes', ''),
+        'p_recepcao_id': user.recepcao_id,
+        'p_created_by': user.username
+    }).execute()
+    resposta = result.data[0] if isinstance(result.data, list) else result.data
+    
+    status = resposta.get('status') if resposta else None
+    if status == 'item_nao_encontrado':
         return jsonify({'error': 'Item não encontrado'}), 404
-    
-    item = item_result.data[0]
-    if item['quantidade'] < data['quantidade']:
+    if status == 'quantidade_insuficiente':
         return jsonify({'error': 'Quantidade insuficiente em estoque'}), 400
+    if status == 'quantidade_invalida':
+        return jsonify({'error': 'Quantidade deve ser maior que zero'}), 400
     
-    # Registrar retirada
-    retirada_data = {
-        'item_id': data['item_id'],
-        'item_nome': item['nome'],
-        'quantidade': data['quantidade'],
-        'retirado_por': data['retirado_por'],
-        'observacoes': data.get('observacoes', ''),
-        'recepcao_id': user.recepcao_id,
-        'created_at': datetime.now().isoformat(),
-        'created_by': user.username
-    }
-    
-    # Atualizar quantidade no estoque
-    nova_quantidade = item['quantidade'] - data['quantidade']
-    supabase.table('estoque').update({'quantidade': nova_quantidade}).eq('id', data['item_id']).execute()
-    
-    # Inserir registro de retirada
-    result = supabase.table('retiradas_estoque').insert(retirada_data).execute()
-    
-    if result.data:
-        return jsonify({'message': 'Retirada registrada com sucesso', 'retirada': result.data[0]}), 201
+    if status == 'ok':
+        return jsonify({'message': 'Retirada registrada com sucesso', 'retirada': resposta['registro']}), 201
     
     return jsonify({'error': 'Erro ao registrar retirada'}), 500
 
@@ -95,6 +90,8 @@ def registrar_retirada():
 def get_retiradas():
     user = get_current_user()
     supabase = get_supabase()
+    pagina = ler_paginacao('retiradas_estoque')
     
-    result = supabase.table('retiradas_estoque').select('*').eq('recepcao_id', user.recepcao_id).order('created_at', desc=True).execute()
-    return jsonify({'retiradas': result.data}), 200
\ No newline at end of file
+    query = pagina.select(supabase.table('retiradas_estoque')).eq('recepcao_id', user.recepcao_id)
+    retiradas, next_cursor = pagina.executar(query)
+    return jsonify({'retiradas': retiradas, 'next_cursor': next_cursor}), 200
\ No newline at end of file
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from utils.permissions import require_recepcao, get_current_user
 from database import get_supabase
+from utils.pagination import ler_paginacao
+from utils.stats import invalida_dashboard
 from datetime import datetime
 
 lista_espera_bp = Blueprint('lista_espera', __name__)
@@ -9,18 +11,21 @@ lista_espera_bp = Blueprint('lista_espera', __name__)
 @require_recepcao(['1002'])
 def get_lista_espera():
     supabase = get_supabase()
-    result = supabase.table('lista_espera').select('*').order('data_solicitacao', desc=False).execute()
+    pagina = ler_paginacao('lista_espera', coluna='data_solicitacao', desc=False)
+    
+    lista_espera, next_cursor = pagina.executar(pagina.select(supabase.table('lista_espera')))
     
     # Calcular tempo de espera
-    for item in result.data:
+    for item in lista_espera:
         data_solicitacao = datetime.fromisoformat(item['data_solicitacao'])
         tempo_espera = datetime.now() - data_solicitacao
         item['tempo_espera_dias'] = tempo_espera.days
     
-    return jsonify({'lista_espera': result.data}), 200
+    return jsonify({'lista_espera': lista_espera, 'next_cursor': next_cursor}), 200
 
 @lista_espera_bp.route('/', methods=['POST'])
 @require_recepcao(['1002'])
+@invalida_dashboard
 def add_lista_espera():
     user = get_current_user()
     data = request.get_json()
@@ -52,6 +57,7 @@ def add_lista_espera():
 
 @lista_espera_bp.route('/<int:item_id>', methods=['PUT'])
 @require_recepcao(['1002'])
+@invalida_dashboard
 def update_lista_espera(item_id):
     user = get_current_user()
     data = request.get_json()
@@ -78,6 +84,7 @@ def update_lista_espera(item_id):
 
 @lista_espera_bp.route('/<int:item_id>', methods=['DELETE'])
 @require_recepcao(['1002'])
+@invalida_dashboard
 def delete_lista_espera(item_id):
     supabase = get_supabase()
     
@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from utils.permissions import require_recepcao, get_current_user
 from database import get_supabase
+from utils.pagination import ler_paginacao
+from utils.stats import invalida_dashboard
 from datetime import datetime, timedelta
 
 orcamentos_bp = Blueprint('orcamentos', __name__)
@@ -10,16 +12,18 @@ orcamentos_bp = Blueprint('orcamentos', __name__)
 def get_orcamentos():
     user = get_current_user()
     supabase = get_supabase()
+    pagina = ler_paginacao('orcamentos')
     
-    if user.role == 'admin':
-        result = supabase.table('orcamentos').select('*').order('created_at', desc=True).execute()
-    else:
-        result = supabase.table('orcamentos').select('*').eq('recepcao_id', user.recepcao_id).order('created_at', desc=True).execute()
+    query = pagina.select(supabase.table('orcamentos'))
+    if user.role != 'admin':
+        query = query.eq('recepcao_id', user.recepcao_id)
     
-    return jsonify({'orcamentos': result.data}), 200
+    orcamentos, next_cursor = pagina.executar(query)
+    return jsonify({'orcamentos': orcamentos, 'next_cursor': next_cursor}), 200
 
 @orcamentos_bp.route('/', methods=['POST'])
 @require_recepcao(['103', '808', '108', '203', '1009', '1108'])
+@invalida_dashboard
 def create_orcamento():
     user = get_current_user()
     data = request.get_json()
@@ -58,6 +62,7 @@ def create_orcamento():
 
 @orcamentos_bp.route('/<int:orcamento_id>/feedback', methods=['POST'])
 @require_recepcao(['103', '808', '108', '203', '1009', '1108'])
+@invalida_dashboard
 def add_feedback_orcamento(orcamento_id):
     user = get_current_user()
     data = request.get_json()
@@ -1,41 +1,46 @@
 from flask import Blueprint, request, jsonify
-from utils.permissions import require_auth, get_current_user
-from database import get_supabase
+from utils.permissions import require_auth, get_current_user, usuario_resolvido
+from database_async import get_supabase_async, coletar, rota_async
+from utils import stats as stats_db
 
 recepcao_bp = Blueprint('recepcao', __name__)
 
 @recepcao_bp.route('/dashboard', methods=['GET'])
 @require_auth
-def dashboard_recepcao():
-    user = get_current_user()
+@rota_async
+async def dashboard_recepcao():
+    # Resolvido por @require_auth na thread da requisição
+    user = usuario_resolvido()
     if not user:
         return jsonify({'error': 'Usuário não encontrado'}), 404
     
-    supabase = get_supabase()
+    supabase = get_supabase_async()
+    stats = await stats_db.dashboard_em_cache('recepcao.dashboard', user, lambda: calcular_dashboard(supabase, user))
+    
+    return jsonify({'stats': stats, 'user': user.to_dict()}), 200
+
+async def calcular_dashboard(supabase, user):
     stats = {}
     
-    if user.role == 'admin':
-        # Admin vê tudo
-        salas_result = supabase.table('salas').select('*').execute()
-        orcamentos_result = supabase.table('orcamentos').select('*').execute()
-    else:
-        # Recepção vê apenas seus dados
-        salas_result = supabase.table('salas').select('*').eq('recepcao_id', user.recepcao_id).execute()
-        orcamentos_result = supabase.table('orcamentos').select('*').eq('recepcao_id', user.recepcao_id).execute()
-    
-    stats['total_salas'] = len(salas_result.data)
-    stats['total_orcamentos'] = len(orcamentos_result.data)
+    # Admin vê tudo, recepção vê apenas seus dados
+    recepcao_id = None if user.role == 'admin' else user.recepcao_id
+    resultados = await coletar({
+        'salas': stats_db.resumo_salas(supabase, recepcao_id),
+        'orcamentos': stats_db.resumo_orcamentos(supabase, recepcao_id)
+    })
+    salas = resultados['salas']
+    orcamentos = resultados['orcamentos']
+    
+    stats['total_salas'] = salas['total']
+    stats['total_orcamentos'] = orcamentos['total']
     stats['recepcao_nome'] = user.recepcao_nome
     stats['recepcao_id'] = user.recepcao_id
     
     # Salas disponíveis/ocupadas
-    salas_disponiveis = len([s for s in salas_result.data if s.get('status') == 'disponivel'])
-    salas_ocupadas = len([s for s in salas_result.data if s.get('status') == 'ocupada'])
-    
-    stats['salas_disponiveis'] = salas_disponiveis
-    stats['salas_ocupadas'] = salas_ocupadas
+    stats['salas_disponiveis'] = salas['por_status'].get('disponivel', 0)
+    stats['salas_ocupadas'] = salas['por_status'].get('ocupada', 0)
     
-    return jsonify({'stats': stats, 'user': user.to_dict()}), 200
+    return stats
 
 @recepcao_bp.route('/permissions', methods=['GET'])
 @require_auth
@@ -1,6 +1,7 @@
 from flask import Blueprint, request, jsonify
 from utils.permissions import require_auth, get_current_user
 from database import get_supabase
+from utils.stats import invalida_dashboard, invalidar_dashboard
 from datetime import datetime
 
 salas_bp = Blueprint('salas', __name__)
@@ -25,6 +26,7 @@ def get_salas():
 
 @salas_bp.route('/', methods=['POST'])
 @require_auth
+@invalida_dashboard
 def create_sala():
     user = get_current_user()
     if not user:
@@ -58,6 +60,7 @@ def create_sala():
 
 @salas_bp.route('/<int:sala_id>', methods=['PUT'])
 @require_auth
+@invalida_dashboard
 def update_sala(sala_id):
     user = get_current_user()
     if not user:
@@ -92,6 +95,7 @@ def update_sala(sala_id):
 
 @salas_bp.route('/<int:sala_id>', methods=['DELETE'])
 @require_auth
+@invalida_dashboard
 def delete_sala(sala_id):
     user = get_current_user()
     if not user:
@@ -114,6 +118,7 @@ def delete_sala(sala_id):
 
 @salas_bp.route('/<int:sala_id>/reservar', methods=['POST'])
 @require_auth
+@invalida_dashboard
 def reservar_sala(sala_id):
     user = get_current_user()
     if not user:
@@ -151,6 +156,9 @@ def reservar_sala(sala_id):
         'ocupado_ate': data.get('data_fim')
     }).eq('id', sala_id).execute()
     
+    # A sala pode ser de outra recepção
+    invalidar_dashboard(sala['recepcao_id'])
+    
     # Inserir reserva
     result = supabase.table('reservas').insert(reserva_data).execute()
     
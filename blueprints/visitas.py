@@ -1,6 +1,8 @@
 from flask import Blueprint, request, jsonify
 from utils.permissions import require_recepcao, get_current_user
 from database import get_supabase
+from utils.pagination import ler_paginacao
+from utils.stats import invalida_dashboard
 from datetime import datetime
 
 visitas_bp = Blueprint('visitas', __name__)
@@ -10,12 +12,15 @@ visitas_bp = Blueprint('visitas', __name__)
 def get_visitas():
     user = get_current_user()
     supabase = get_supabase()
+    pagina = ler_paginacao('visitas_externas')
     
-    result = supabase.table('visitas_externas').select('*').eq('recepcao_id', user.recepcao_id).order('created_at', desc=True).execute()
-    return jsonify({'visitas': result.data}), 200
+    query = pagina.select(supabase.table('visitas_externas')).eq('recepcao_id', user.recepcao_id)
+    visitas, next_cursor = pagina.executar(query)
+    return jsonify({'visitas': visitas, 'next_cursor': next_cursor}), 200
 
 @visitas_bp.route('/', methods=['POST'])
 @require_recepcao(['108'])
+@invalida_dashboard
 def registrar_visita():
     user = get_current_user()
     data = request.get_json()
@@ -53,12 +58,15 @@ def registrar_visita():
 def get_pacientes():
     user = get_current_user()
     supabase = get_supabase()
+    pagina = ler_paginacao('entrada_saida_pacientes')
     
-    result = supabase.table('entrada_saida_pacientes').select('*').eq('recepcao_id', user.recepcao_id).order('created_at', desc=True).execute()
-    return jsonify({'pacientes': result.data}), 200
+    query = pagina.select(supabase.table('entrada_saida_pacientes')).eq('recepcao_id', user.recepcao_id)
+    pacientes, next_cursor = pagina.executar(query)
+    return jsonify({'pacientes': pacientes, 'next_cursor': next_cursor}), 200
 
 @visitas_bp.route('/pacientes/entrada', methods=['POST'])
 @require_recepcao(['108'])
+@invalida_dashboard
 def registrar_entrada_paciente():
     user = get_current_user()
     data = request.get_json()
@@ -93,6 +101,7 @@ def registrar_entrada_paciente():
 
 @visitas_bp.route('/pacientes/<int:paciente_id>/saida', methods=['PUT'])
 @require_recepcao(['108'])
+@invalida_dashboard
 def registrar_saida_paciente(paciente_id):
     user = get_current_user()
     data = request.get_json()
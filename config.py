@@ -15,6 +15,86 @@ class Config:
     # Database
     DATABASE_URL = os.environ.get('DATABASE_URL')
     
+    # Cliente PostgREST: 'simples' (padrão) ou 'oficial' (pacote supabase)
+    SUPABASE_CLIENT = os.environ.get('SUPABASE_CLIENT', 'simples')
+    
+    # Pool HTTP do cliente simplificado (PostgREST)
+    SUPABASE_POOL_CONNECTIONS = int(os.environ.get('SUPABASE_POOL_CONNECTIONS', 4))
+    SUPABASE_POOL_MAXSIZE = int(os.environ.get('SUPABASE_POOL_MAXSIZE', 20))
+    SUPABASE_CONNECT_TIMEOUT = float(os.environ.get('SUPABASE_CONNECT_TIMEOUT', 5))
+    SUPABASE_READ_TIMEOUT = float(os.environ.get('SUPABASE_READ_TIMEOUT', 30))
+    SUPABASE_KEEP_ALIVE = os.environ.get('SUPABASE_KEEP_ALIVE', 'true').lower() == 'true'
+    
+    # Prazo total por operação (todas as tentativas), novas tentativas só em GET/HEAD
+    SUPABASE_READ_DEADLINE = float(os.environ.get('SUPABASE_READ_DEADLINE', 8))
+    SUPABASE_WRITE_DEADLINE = float(os.environ.get('SUPABASE_WRITE_DEADLINE', 15))
+    SUPABASE_RETRIES = int(os.environ.get('SUPABASE_RETRIES', 2))
+    SUPABASE_RETRY_BACKOFF = float(os.environ.get('SUPABASE_RETRY_BACKOFF', 0.1))
+    SUPABASE_RETRY_BACKOFF_MAX = float(os.environ.get('SUPABASE_RETRY_BACKOFF_MAX', 2))
+    
+    # Circuit breaker
+    SUPABASE_BREAKER_WINDOW = float(os.environ.get('SUPABASE_BREAKER_WINDOW', 30))
+    SUPABASE_BREAKER_MIN_REQUESTS = int(os.environ.get('SUPABASE_BREAKER_MIN_REQUESTS', 10))
+    SUPABASE_BREAKER_THRESHOLD = float(os.environ.get('SUPABASE_BREAKER_THRESHOLD', 0.5))
+    SUPABASE_BREAKER_COOLDOWN = float(os.environ.get('SUPABASE_BREAKER_COOLDOWN', 15))
+    
+    # Intervalo (s) entre verificações de conexão feitas por /api/ready
+    READY_RECHECK_INTERVAL = int(os.environ.get('READY_RECHECK_INTERVAL', 30))
+    
+    # Cliente assíncrono (database_async.py): HTTP/2 e limites do pool do httpx
+    SUPABASE_HTTP2 = os.environ.get('SUPABASE_HTTP2', 'true').lower() == 'true'
+    SUPABASE_ASYNC_MAX_CONNECTIONS = int(os.environ.get('SUPABASE_ASYNC_MAX_CONNECTIONS', 100))
+    SUPABASE_ASYNC_MAX_KEEPALIVE = int(os.environ.get('SUPABASE_ASYNC_MAX_KEEPALIVE', 20))
+    
+    # Cache de usuários (autorização sem ida ao banco)
+    USER_CACHE_TTL = int(os.environ.get('USER_CACHE_TTL', 60))
+    USER_CACHE_MAXSIZE = int(os.environ.get('USER_CACHE_MAXSIZE', 512))
+    
+    USER_MISSING_CACHE_TTL = int(os.environ.get('USER_MISSING_CACHE_TTL', 30))
+    USER_MISSING_CACHE_MAXSIZE = int(os.environ.get('USER_MISSING_CACHE_MAXSIZE', 4096))
+    
+    # Cache de snapshots do dashboard, por (endpoint, recepção, role)
+    DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', 30))
+    DASHBOARD_CACHE_MAXSIZE = int(os.environ.get('DASHBOARD_CACHE_MAXSIZE', 256))
+    # Última resposta boa, servida quando o Supabase está indisponível
+    DASHBOARD_STALE_TTL = int(os.environ.get('DASHBOARD_STALE_TTL', 600))
+    
+    # Paginação das rotas de listagem
+    PAGINATION_DEFAULT_LIMIT = int(os.environ.get('PAGINATION_DEFAULT_LIMIT', 100))
+    PAGINATION_MAX_LIMIT = int(os.environ.get('PAGINATION_MAX_LIMIT', 500))
+    
+    # Intervalo (s) entre conferências da versão do usuário gravada no token
+    TOKEN_VERSION_TTL = int(os.environ.get('TOKEN_VERSION_TTL', 300))
+    
+    # Verificação de senha: threads dedicadas e fila máxima (acima dela, 429)
+    HASH_WORKERS = int(os.environ.get('HASH_WORKERS', os.cpu_count() or 2))
+    HASH_QUEUE_MAX = int(os.environ.get('HASH_QUEUE_MAX', 16))
+    
+    # Política de hash de senha (método do werkzeug, ex.: scrypt, scrypt:16384:8:1,
+    # pbkdf2:sha256:600000); hashes fora dela são refeitos após um login correto
+    HASH_METHOD = os.environ.get('HASH_METHOD', 'scrypt')
+    HASH_REHASH_ON_LOGIN = os.environ.get('HASH_REHASH_ON_LOGIN', 'true').lower() == 'true'
+    
+    # Limite de tentativas de login com senha errada por janela (s), por (usuário, IP) e por IP
+    LOGIN_MAX_TENTATIVAS_USUARIO = int(os.environ.get('LOGIN_MAX_TENTATIVAS_USUARIO', 5))
+    LOGIN_MAX_TENTATIVAS_IP = int(os.environ.get('LOGIN_MAX_TENTATIVAS_IP', 50))
+    LOGIN_JANELA = int(os.environ.get('LOGIN_JANELA', 300))
+    
+    # Logs estruturados (utils/logs.py)
+    LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO')
+    LOG_LEVELS = os.environ.get('LOG_LEVELS', '')
+    LOG_FORMAT = os.environ.get('LOG_FORMAT', 'json')
+    LOG_DEBUG_SAMPLE = float(os.environ.get('LOG_DEBUG_SAMPLE', 0.1))
+    LOG_QUEUE_MAX = int(os.environ.get('LOG_QUEUE_MAX', 10000))
+    
+    # /api/metrics exige 'Authorization: Bearer <token>'; vazio = rota desligada (404)
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN', '')
+    
+    # Orçamento de chamadas ao Supabase por requisição (utils/rastreio.py)
+    QUERY_BUDGET = int(os.environ.get('QUERY_BUDGET', 4))
+    QUERY_BUDGETS = os.environ.get('QUERY_BUDGETS', '')
+    QUERY_REPEAT_LIMIT = int(os.environ.get('QUERY_REPEAT_LIMIT', 2))
+    
     # JWT Configuration
     JWT_ACCESS_TOKEN_EXPIRES = False  # Token não expira para simplicidade
     
@@ -23,8 +103,8 @@ class Config:
     HOST = os.environ.get('HOST', '0.0.0.0')
     DEBUG = os.environ.get('FLASK_ENV') != 'production'
     
-    # CORS Settings for production
-    CORS_ORIGINS = os.environ.get('CORS_ORIGINS', 'https://reception-sync-production.up.railway.app').split(',')
+    # CORS: origens separadas por vírgula; sem a variável vale qualquer origem ('*'), como antes do create_app
+    CORS_ORIGINS = os.environ.get('CORS_ORIGINS', '*').split(',')
 
 class ProductionConfig(Config):
     DEBUG = False
@@ -32,7 +112,6 @@ class ProductionConfig(Config):
 
 class DevelopmentConfig(Config):
     DEBUG = True
-    CORS_ORIGINS = ['http://localhost:3000']
 
 class TestingConfig(Config):
     TESTING = True
@@ -6,110 +6,645 @@ Database simplificado para resolver problema de headers
 from dotenv import load_dotenv
 load_dotenv()
 
+import asyncio
+import logging
 import os
-import requests
+import random
+import threading
+import time
+from collections import deque
+from config import Config
+from utils.metricas import registrar_consulta
+from utils.rastreio import rastrear_consulta
+
+logger = logging.getLogger(__name__)
 
 SUPABASE_URL = os.environ.get('SUPABASE_URL')
 SUPABASE_KEY = os.environ.get('SUPABASE_KEY')
 _supabase_client = None
+_client_lock = threading.Lock()
+
+# Prontidão do banco (aquecimento em segundo plano, ver iniciar_aquecimento)
+_prontidao = {'status': 'iniciando', 'erro': None, 'latencia_ms': None, 'verificado_em': None, 'verificando': False}
+_prontidao_pid = None
+_prontidao_lock = threading.Lock()
+
+def quote_value(value):
+    """Escapa um valor para uso dentro de filtros or=()/and=() do PostgREST"""
+    value = str(value).replace('\\', '\\\\').replace('"', '\\"')
+    return f'"{value}"'
+
+class SupabaseError(Exception):
+    """Resposta de erro do PostgREST (status HTTP e corpo)"""
+    def __init__(self, status, corpo):
+        super().__init__(f"Erro {status}: {corpo}")
+        self.status = status
+        self.corpo = corpo
+
+class SupabaseIndisponivel(SupabaseError):
+    """Falha de rede, timeout ou 5xx transitório depois das novas tentativas"""
+
+class CircuitoAberto(SupabaseIndisponivel):
+    """Disjuntor aberto: a consulta nem foi enviada"""
+    def __init__(self, retry_after):
+        super().__init__(503, 'Supabase indisponível (circuito aberto)')
+        self.retry_after = retry_after
+
+# Só estes métodos são repetidos após falha; POST (insert, rpc) e PATCH não
+METODOS_IDEMPOTENTES = ('GET', 'HEAD')
+STATUS_TRANSITORIOS = (502, 503, 504)
+
+class Disjuntor:
+    """
+    Circuit breaker do processo para o PostgREST.
+    Abre quando, na janela de SUPABASE_BREAKER_WINDOW segundos, há pelo menos
+    SUPABASE_BREAKER_MIN_REQUESTS chamadas e a fração de falhas passa de
+    SUPABASE_BREAKER_THRESHOLD; fica aberto por SUPABASE_BREAKER_COOLDOWN
+    segundos e então deixa passar uma única chamada de teste (meio-aberto).
+    Respostas 4xx contam como sucesso: o serviço respondeu.
+    """
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._janela = deque()
+        self.estado = 'fechado'
+        self.reabrir_em = 0.0
+        self._sonda = False
+        self.contadores = {'sucessos': 0, 'falhas': 0, 'rejeitadas': 0, 'novas_tentativas': 0, 'aberturas': 0}
+    
+    def antes(self):
+        """Levanta CircuitoAberto se a chamada não deve ser enviada; True se ela é a sonda do meio-aberto"""
+        with self._lock:
+            if self.estado == 'fechado':
+                return False
+            agora = time.monotonic()
+            if self.estado == 'aberto' and agora >= self.reabrir_em:
+                self.estado = 'meio_aberto'
+                self._sonda = False
+            if self.estado == 'meio_aberto' and not self._sonda:
+                self._sonda = True
+                return True
+            self.contadores['rejeitadas'] += 1
+            raise CircuitoAberto(max(1, int(self.reabrir_em - agora) + 1))
+    
+    def registrar(self, sucesso):
+        with self._lock:
+            agora = time.monotonic()
+            self.contadores['sucessos' if sucesso else 'falhas'] += 1
+            if self.estado == 'meio_aberto':
+                self._sonda = False
+                if sucesso:
+                    self.estado = 'fechado'
+                    self._janela.clear()
+                    logger.info('Circuito do Supabase fechado')
+                else:
+                    self._abrir(agora)
+                return
+            
+            self._janela.append((agora, sucesso))
+            while self._janela and self._janela[0][0] < agora - Config.SUPABASE_BREAKER_WINDOW:
+                self._janela.popleft()
+            falhas = sum(1 for _, ok in self._janela if not ok)
+            if len(self._janela) >= Config.SUPABASE_BREAKER_MIN_REQUESTS and \
+                    falhas / len(self._janela) >= Config.SUPABASE_BREAKER_THRESHOLD:
+                self._abrir(agora)
+    
+    def _abrir(self, agora):
+        self.estado = 'aberto'
+        self.reabrir_em = agora + Config.SUPABASE_BREAKER_COOLDOWN
+        self.contadores['aberturas'] += 1
+        self._janela.clear()
+        logger.warning('Circuito do Supabase aberto', extra={'cooldown_s': Config.SUPABASE_BREAKER_COOLDOWN})
+    
+    def liberar_sonda(self):
+        """Sonda interrompida sem resultado (ex.: cancelada): a próxima chamada vira a sonda"""
+        with self._lock:
+            self._sonda = False
+    
+    def nova_tentativa(self):
+        with self._lock:
+            self.contadores['novas_tentativas'] += 1
+    
+    def stats(self):
+        with self._lock:
+            stats = dict(self.contadores)
+            stats['estado'] = self.estado
+            stats['janela'] = len(self._janela)
+            stats['falhas_janela'] = sum(1 for _, ok in self._janela if not ok)
+            if self.estado == 'aberto':
+                stats['reabre_em_s'] = round(max(self.reabrir_em - time.monotonic(), 0), 1)
+            return stats
+
+disjuntor = Disjuntor()
+
+def _backoff(tentativa):
+    """Espera antes da próxima tentativa: backoff exponencial com jitter completo"""
+    teto = min(Config.SUPABASE_RETRY_BACKOFF_MAX, Config.SUPABASE_RETRY_BACKOFF * (2 ** (tentativa - 1)))
+    return random.uniform(0, teto)
 
 class SimpleSupabaseClient:
-    def __init__(self, url, key):
+    def __init__(self, url, key, pool_connections=None, pool_maxsize=None,
+                 connect_timeout=None, read_timeout=None, keep_alive=None):
         self.url = url.rstrip('/')
         self.headers = {
             'apikey': key,
             'Authorization': f'Bearer {key}',
             'Content-Type': 'application/json'
         }
+        self.pool_connections = pool_connections or Config.SUPABASE_POOL_CONNECTIONS
+        self.pool_maxsize = pool_maxsize or Config.SUPABASE_POOL_MAXSIZE
+        self.timeout = (
+            connect_timeout or Config.SUPABASE_CONNECT_TIMEOUT,
+            read_timeout or Config.SUPABASE_READ_TIMEOUT
+        )
+        self.keep_alive = Config.SUPABASE_KEEP_ALIVE if keep_alive is None else keep_alive
+        if not self.keep_alive:
+            self.headers['Connection'] = 'close'
+        
+        self._lock = threading.Lock()
+        self._session = None
+        self._session_pid = None
+    
+    @property
+    def session(self):
+        # Uma sessão por worker: após fork (gunicorn) o filho não pode
+        # reaproveitar os sockets herdados do processo pai
+        pid = os.getpid()
+        if self._session is None or self._session_pid != pid:
+            with self._lock:
+                if self._session is None or self._session_pid != pid:
+                    self._session = self._create_session()
+                    self._session_pid = pid
+        return self._session
+    
+    def _create_session(self):
+        # requests é importado só na primeira sessão (boot mais rápido)
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        session.headers.update(self.headers)
+        return session
+    
+    def request(self, method, endpoint, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return self.session.request(method, endpoint, **kwargs)
+    
+    def timeout_restante(self, restante):
+        """Timeout (connect, read) de uma tentativa, limitado ao que resta do prazo"""
+        connect, read = self.timeout
+        return (min(connect, restante), min(read, restante))
+    
+    @property
+    def erros_de_rede(self):
+        import requests
+        return (requests.ConnectionError, requests.Timeout)
+    
+    def pool_stats(self):
+        """Contadores do pool: hits = requisições que reaproveitaram conexão"""
+        stats = {
+            'pid': self._session_pid,
+            'keep_alive': self.keep_alive,
+            'pool_connections': self.pool_connections,
+            'pool_maxsize': self.pool_maxsize,
+            'requests': 0,
+            'hits': 0,
+            'misses': 0
+        }
+        if self._session is None or self._session_pid != os.getpid():
+            return stats
+        
+        adapters = {id(a): a for a in self._session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in list(pools.keys()):
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                stats['requests'] += pool.num_requests
+                stats['misses'] += pool.num_connections
+        stats['hits'] = max(stats['requests'] - stats['misses'], 0)
+        return stats
+    
+    def close(self):
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+            self._session = None
+            self._session_pid = None
     
     def table(self, table_name):
-        return SimpleTable(self.url, self.headers, table_name)
+        return SimpleTable(self, table_name)
+    
+    def rpc(self, function_name, params=None):
+        """Chama uma função do Postgres exposta em /rest/v1/rpc/<nome>"""
+        return SimpleQuery(self, f"{self.url}/rest/v1/rpc/{function_name}", 'POST', params or {})
 
 class SimpleTable:
-    def __init__(self, url, headers, table_name):
-        self.endpoint = f"{url}/rest/v1/{table_name}"
-        self.headers = headers
+    def __init__(self, client, table_name):
+        self.client = client
+        self.endpoint = f"{client.url}/rest/v1/{table_name}"
+    
+    def select(self, *columns, count=None, head=False):
+        query = SimpleQuery(self.client, self.endpoint, 'HEAD' if head else 'GET')
+        query._set_param('select', ','.join(c.replace(' ', '') for c in columns) or '*')
+        if count:
+            # Contagem feita no Postgres, devolvida no header Content-Range
+            query.prefer.append(f'count={count}')
+        return query
     
-    def select(self, columns='*'):
-        return SimpleQuery(self.endpoint, self.headers, 'GET', columns)
+    def insert(self, data, returning='representation', count=None, upsert=False):
+        query = SimpleQuery(self.client, self.endpoint, 'POST', data)
+        query.prefer.append(f'return={returning}')
+        if count:
+            query.prefer.append(f'count={count}')
+        if upsert:
+            query.prefer.append('resolution=merge-duplicates')
+        return query
     
-    def insert(self, data):
-        return SimpleQuery(self.endpoint, self.headers, 'POST', data)
+    def upsert(self, data, on_conflict='', returning='representation', ignore_duplicates=False):
+        query = SimpleQuery(self.client, self.endpoint, 'POST', data)
+        query.prefer.append(f'return={returning}')
+        query.prefer.append('resolution=ignore-duplicates' if ignore_duplicates else 'resolution=merge-duplicates')
+        if on_conflict:
+            query._set_param('on_conflict', on_conflict)
+        return query
     
-    def update(self, data):
-        return SimpleQuery(self.endpoint, self.headers, 'PATCH', data)
+    def insert_many(self, rows, chunk_size=500, returning='minimal'):
+        """Insere muitas linhas em lotes (um POST com array JSON por lote)"""
+        return self._bulk(rows, chunk_size, lambda lote: self.insert(lote, returning=returning))
+    
+    def upsert_many(self, rows, on_conflict='', chunk_size=500, returning='minimal', ignore_duplicates=False):
+        """Upsert em lotes; on_conflict indica a coluna única (ex.: 'username')"""
+        return self._bulk(rows, chunk_size, lambda lote: self.upsert(
+            lote, on_conflict=on_conflict, returning=returning, ignore_duplicates=ignore_duplicates
+        ))
+    
+    def _bulk(self, rows, chunk_size, make_query):
+        rows = list(rows)
+        # columns= lista a união das chaves; sem missing=default o PostgREST grava
+        # NULL nas chaves ausentes de uma linha (inclusive em colunas NOT NULL)
+        columns = ','.join(sorted({key for row in rows for key in row}))
+        data = []
+        for start in range(0, len(rows), chunk_size):
+            query = make_query(rows[start:start + chunk_size])
+            query._set_param('columns', columns)
+            query.prefer.append('missing=default')
+            data.extend(query.execute().data)
+        return SimpleResult(data, count=len(rows))
+    
+    def update(self, data, returning='representation', count=None):
+        query = SimpleQuery(self.client, self.endpoint, 'PATCH', data)
+        query.prefer.append(f'return={returning}')
+        if count:
+            query.prefer.append(f'count={count}')
+        return query
+    
+    def delete(self, returning='representation', count=None):
+        query = SimpleQuery(self.client, self.endpoint, 'DELETE')
+        query.prefer.append(f'return={returning}')
+        if count:
+            query.prefer.append(f'count={count}')
+        return query
 
 class SimpleQuery:
-    def __init__(self, endpoint, headers, method, data=None):
+    def __init__(self, client, endpoint, method, data=None):
+        self.client = client
         self.endpoint = endpoint
-        self.headers = headers
         self.method = method
         self.data = data
-        self.params = {}
+        # Lista de pares: a mesma coluna pode aparecer em vários filtros
+        # (ex.: created_at=gte.X&created_at=lt.Y)
+        self.params = []
+        self.headers = {}
+        self.prefer = []
+        self._prazo = None
+    
+    def _set_param(self, key, value):
+        self.params = [(k, v) for k, v in self.params if k != key]
+        self.params.append((key, value))
+        return self
+    
+    def _get_param(self, key):
+        for k, v in self.params:
+            if k == key:
+                return v
+        return None
+    
+    def _filter(self, column, operator, value):
+        self.params.append((column, f'{operator}.{value}'))
+        return self
     
     def eq(self, column, value):
-        self.params[column] = f'eq.{value}'
+        return self._filter(column, 'eq', value)
+    
+    def neq(self, column, value):
+        return self._filter(column, 'neq', value)
+    
+    def gt(self, column, value):
+        return self._filter(column, 'gt', value)
+    
+    def gte(self, column, value):
+        return self._filter(column, 'gte', value)
+    
+    def lt(self, column, value):
+        return self._filter(column, 'lt', value)
+    
+    def lte(self, column, value):
+        return self._filter(column, 'lte', value)
+    
+    def like(self, column, pattern):
+        return self._filter(column, 'like', pattern)
+    
+    def ilike(self, column, pattern):
+        return self._filter(column, 'ilike', pattern)
+    
+    def is_(self, column, value):
+        # value: None, True, False ou 'null'/'true'/'false'
+        value = 'null' if value is None else str(value).lower()
+        return self._filter(column, 'is', value)
+    
+    def in_(self, column, values):
+        valores = ','.join(quote_value(v) for v in values)
+        return self._filter(column, 'in', f'({valores})')
+    
+    def not_(self, column, operator, value):
+        return self._filter(column, f'not.{operator}', value)
+    
+    def or_(self, filters):
+        self.params.append(('or', f'({filters})'))
         return self
     
     def limit(self, count):
-        self.params['limit'] = count
+        return self._set_param('limit', count)
+    
+    def offset(self, count):
+        return self._set_param('offset', count)
+    
+    def range(self, start, end):
+        """Paginação por offset via headers Range (linhas start..end, inclusive)"""
+        self.headers['Range-Unit'] = 'items'
+        self.headers['Range'] = f'{start}-{end}'
         return self
     
-    def order(self, column, desc=False):
+    def order(self, column, desc=False, nullsfirst=None):
+        # Chamadas sucessivas acumulam colunas: order=created_at.desc,id.desc
         order_str = f"{column}.desc" if desc else column
-        self.params['order'] = order_str
+        if nullsfirst is not None:
+            order_str += '.nullsfirst' if nullsfirst else '.nullslast'
+        anterior = self._get_param('order')
+        if anterior:
+            order_str = f"{anterior},{order_str}"
+        return self._set_param('order', order_str)
+    
+    def paginate(self, limit, after=None, column='created_at', desc=True):
+        """
+        Paginação keyset ordenada por (column, id), com NULLs de column no fim.
+        after = (valor de column, id) da última linha da página anterior.
+        """
+        if after is not None:
+            op = 'lt' if desc else 'gt'
+            valor, ultimo_id = after
+            if valor is None:
+                # Já na cauda de NULLs: só o id ainda ordena
+                self.is_(column, None)._filter('id', op, int(ultimo_id))
+            else:
+                valor = quote_value(valor)
+                self.or_(f'{column}.{op}.{valor},and({column}.eq.{valor},id.{op}.{int(ultimo_id)}),{column}.is.null')
+        return self.order(column, desc=desc, nullsfirst=False).order('id', desc=desc).limit(limit)
+    
+    def deadline(self, segundos):
+        """Prazo total da operação, somando todas as tentativas"""
+        self._prazo = segundos
         return self
     
-    def execute(self):
-        if self.method == 'GET':
-            if self.data != '*':
-                self.params['select'] = self.data
-            response = requests.get(self.endpoint, headers=self.headers, params=self.params, timeout=30)
-        elif self.method == 'POST':
-            response = requests.post(self.endpoint, headers=self.headers, json=self.data, timeout=30)
-        elif self.method == 'PATCH':
-            response = requests.patch(self.endpoint, headers=self.headers, json=self.data, params=self.params, timeout=30)
+    def _limite(self):
+        if self._prazo is None:
+            idempotente = self.method in METODOS_IDEMPOTENTES
+            self._prazo = Config.SUPABASE_READ_DEADLINE if idempotente else Config.SUPABASE_WRITE_DEADLINE
+        return time.monotonic() + self._prazo
+    
+    def _max_tentativas(self):
+        return 1 + Config.SUPABASE_RETRIES if self.method in METODOS_IDEMPOTENTES else 1
+    
+    def _falha(self, erro, tentativa, limite):
+        """
+        Registra a falha e decide: devolve a espera até a próxima tentativa
+        ou levanta o erro se não houver nova tentativa (ou prazo para ela)
+        """
+        disjuntor.registrar(sucesso=False)
+        espera = _backoff(tentativa)
+        if tentativa >= self._max_tentativas() or time.monotonic() + espera >= limite:
+            if isinstance(erro, SupabaseError):
+                raise SupabaseIndisponivel(erro.status, erro.corpo)
+            raise SupabaseIndisponivel(0, str(erro)) from erro
+        if disjuntor.estado == 'aberto':
+            # Sem espera: o antes() da próxima volta levanta CircuitoAberto
+            return 0
+        disjuntor.nova_tentativa()
+        return espera
+    
+    def _medir(self, response, inicio):
+        """Registra a tentativa nas métricas e no rastreio da requisição (response None = erro de rede/timeout)"""
+        tabela = self.endpoint.rsplit('/rest/v1/', 1)[-1]
+        segundos = time.perf_counter() - inicio
+        tamanho = len(response.content) if response is not None else 0
+        status = response.status_code if response is not None else 'rede'
+        registrar_consulta(tabela, self.method, status, tamanho, segundos)
+        rastrear_consulta(tabela, self.method, tamanho, segundos, pagina='Range' in self.headers)
+    
+    def _request_kwargs(self):
+        headers = dict(self.headers)
+        if self.prefer:
+            headers['Prefer'] = ','.join(self.prefer)
         
-        if response.status_code in [200, 201]:
+        kwargs = {'params': self.params, 'headers': headers}
+        if self.method in ('POST', 'PATCH'):
+            kwargs['json'] = self.data
+        return kwargs
+    
+    def _result(self, response):
+        if 200 <= response.status_code < 300:
             data = response.json() if response.content else []
-            return SimpleResult(data)
+            return SimpleResult(data, count=_parse_count(response.headers.get('Content-Range')))
         else:
-            raise Exception(f"Erro {response.status_code}: {response.text}")
+            raise SupabaseError(response.status_code, response.text)
+    
+    def execute(self):
+        limite = self._limite()
+        tentativa = 0
+        while True:
+            # A cada tentativa: se as falhas anteriores abriram o circuito, para aqui
+            sonda = disjuntor.antes()
+            tentativa += 1
+            kwargs = self._request_kwargs()
+            kwargs['timeout'] = self.client.timeout_restante(max(limite - time.monotonic(), 0.001))
+            inicio = time.perf_counter()
+            try:
+                response = self.client.request(self.method, self.endpoint, **kwargs)
+            except self.client.erros_de_rede as e:
+                self._medir(None, inicio)
+                erro = e
+            except Exception:
+                # Resposta truncada ou ilegível: falha sem nova tentativa
+                self._medir(None, inicio)
+                disjuntor.registrar(sucesso=False)
+                raise
+            except BaseException:
+                # Cancelada: sem veredito, mas a sonda do meio-aberto fica livre
+                if sonda:
+                    disjuntor.liberar_sonda()
+                raise
+            else:
+                self._medir(response, inicio)
+                if response.status_code not in STATUS_TRANSITORIOS:
+                    disjuntor.registrar(sucesso=True)
+                    return self._result(response)
+                erro = SupabaseError(response.status_code, response.text)
+            time.sleep(self._falha(erro, tentativa, limite))
+    
+    async def execute_async(self):
+        """Como execute(), para clientes com request_async (database_async.AsyncSupabaseClient)"""
+        limite = self._limite()
+        tentativa = 0
+        while True:
+            sonda = disjuntor.antes()
+            tentativa += 1
+            kwargs = self._request_kwargs()
+            kwargs['timeout'] = self.client.timeout_restante_async(max(limite - time.monotonic(), 0.001))
+            inicio = time.perf_counter()
+            try:
+                response = await self.client.request_async(self.method, self.endpoint, **kwargs)
+            except self.client.erros_de_rede_async as e:
+                self._medir(None, inicio)
+                erro = e
+            except Exception:
+                # Resposta truncada ou ilegível: falha sem nova tentativa
+                self._medir(None, inicio)
+                disjuntor.registrar(sucesso=False)
+                raise
+            except BaseException:
+                # Cancelada: sem veredito, mas a sonda do meio-aberto fica livre
+                if sonda:
+                    disjuntor.liberar_sonda()
+                raise
+            else:
+                self._medir(response, inicio)
+                if response.status_code not in STATUS_TRANSITORIOS:
+                    disjuntor.registrar(sucesso=True)
+                    return self._result(response)
+                erro = SupabaseError(response.status_code, response.text)
+            await asyncio.sleep(self._falha(erro, tentativa, limite))
+
+def _parse_count(content_range):
+    """Extrai o total de 'Content-Range: 0-24/3573' (ou '*/3573')"""
+    if not content_range or '/' not in content_range:
+        return None
+    total = content_range.rsplit('/', 1)[1]
+    return int(total) if total.isdigit() else None
 
 class SimpleResult:
-    def __init__(self, data):
+    def __init__(self, data, count=None):
         self.data = data if isinstance(data, list) else [data] if data else []
+        self.count = count
 
 def get_supabase():
     global _supabase_client
     if _supabase_client is None:
-        if not SUPABASE_URL or not SUPABASE_KEY:
-            raise ValueError("Credenciais do Supabase não configuradas")
-        
+        with _client_lock:
+            if _supabase_client is None:
+                _supabase_client = _create_client()
+    return _supabase_client
+
+def _create_client():
+    if not SUPABASE_URL or not SUPABASE_KEY:
+        raise ValueError("Credenciais do Supabase não configuradas")
+    
+    # O cliente simplificado cobre todo o PostgREST usado pelos blueprints;
+    # o oficial fica disponível com SUPABASE_CLIENT=oficial
+    if Config.SUPABASE_CLIENT == 'oficial':
         try:
             from supabase import create_client
-            _supabase_client = create_client(SUPABASE_URL, SUPABASE_KEY)
-            # Teste rápido
-            _supabase_client.table('usuarios').select('username').limit(1).execute()
-            print("✅ Cliente oficial funcionou")
-        except:
-            print("🔄 Usando cliente simplificado")
-            _supabase_client = SimpleSupabaseClient(SUPABASE_URL, SUPABASE_KEY)
-    
-    return _supabase_client
+            return create_client(SUPABASE_URL, SUPABASE_KEY)
+        except Exception as e:
+            logger.warning('Cliente oficial indisponível; usando cliente simplificado', extra={'erro': str(e)})
+    return SimpleSupabaseClient(SUPABASE_URL, SUPABASE_KEY)
+
+def _verificar_conexao():
+    """Cria o cliente e faz uma consulta mínima (abre a conexão do pool)"""
+    inicio = time.perf_counter()
+    try:
+        get_supabase().table('usuarios').select('id').limit(1).execute()
+        estado = {'status': 'pronto', 'erro': None}
+    except Exception as e:
+        estado = {'status': 'indisponivel', 'erro': str(e)}
+    estado['latencia_ms'] = round((time.perf_counter() - inicio) * 1000, 1)
+    estado['verificado_em'] = time.monotonic()
+    with _prontidao_lock:
+        _prontidao.update(estado)
+        _prontidao['verificando'] = False
+
+def iniciar_aquecimento():
+    """
+    Aquece o cliente numa thread de fundo (uma vez por processo), para que a
+    primeira requisição não pague criação do cliente, DNS e TLS
+    """
+    global _prontidao_pid
+    with _prontidao_lock:
+        if _prontidao['verificando'] and _prontidao_pid == os.getpid():
+            return
+        _prontidao['verificando'] = True
+        _prontidao_pid = os.getpid()
+    threading.Thread(target=_verificar_conexao, name='supabase-warmup', daemon=True).start()
+
+def estado_prontidao():
+    """
+    Estado da conexão com o Supabase, sem bloquear: devolve o último resultado
+    e, se ele tiver mais de READY_RECHECK_INTERVAL segundos, agenda nova verificação
+    """
+    with _prontidao_lock:
+        estado = dict(_prontidao)
+        outro_processo = _prontidao_pid != os.getpid()
+    vencido = estado['verificado_em'] is None or \
+        time.monotonic() - estado['verificado_em'] > Config.READY_RECHECK_INTERVAL
+    if outro_processo or (vencido and not estado['verificando']):
+        iniciar_aquecimento()
+    if outro_processo:
+        return {'status': 'iniciando', 'erro': None, 'latencia_ms': None, 'disjuntor': estado_disjuntor()}
+    estado.pop('verificado_em')
+    estado.pop('verificando')
+    estado['disjuntor'] = estado_disjuntor()
+    return estado
+
+def estado_disjuntor():
+    """Estado e contadores do circuit breaker do processo"""
+    return disjuntor.stats()
+
+def get_pool_stats():
+    """Estatísticas do pool HTTP do cliente atual (vazio se não inicializado)"""
+    if _supabase_client is None or not hasattr(_supabase_client, 'pool_stats'):
+        return {}
+    return _supabase_client.pool_stats()
 
 def test_database_connection():
     try:
         supabase = get_supabase()
-        result = supabase.table('usuarios').select('username').limit(1).execute()
+        supabase.table('usuarios').select('username').limit(1).execute()
         return True
-    except:
+    except Exception:
         return False
 
 def health_check():
     try:
         supabase = get_supabase()
         supabase.table('usuarios').select('username').limit(1).execute()
-        return {'status': 'healthy', 'database': 'connected'}
+        health = {'status': 'healthy', 'database': 'connected'}
+        if hasattr(supabase, 'pool_stats'):
+            health['pool'] = supabase.pool_stats()
+        health['disjuntor'] = estado_disjuntor()
+        return health
     except Exception as e:
-        return {'status': 'unhealthy', 'error': str(e)}
\ No newline at end of file
+        return {'status': 'unhealthy', 'error': str(e), 'disjuntor': estado_disjuntor()}
\ No newline at end of file
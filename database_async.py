@@ -0,0 +1,139 @@
+"""
+Caminho assíncrono para o PostgREST (httpx.AsyncClient, HTTP/2)
+
+Cada processo mantém um único event loop numa thread de fundo, com um
+único httpx.AsyncClient: o pool (e as conexões HTTP/2 multiplexadas) é
+compartilhado por todas as threads do worker. As rotas continuam síncronas
+para o Flask; @rota_async executa a corrotina da rota nesse loop e espera o
+resultado (no máximo o prazo de uma consulta), então uma rota pode aguardar
+várias consultas ao mesmo tempo (coletar) sem uma thread por consulta. É o
+único mecanismo de consultas em paralelo da API.
+
+As consultas usam o mesmo construtor do cliente síncrono:
+    supabase = get_supabase_async()
+    result = await supabase.table('salas').select('*').eq('recepcao_id', '103').execute_async()
+"""
+
+import asyncio
+import concurrent.futures
+import contextvars
+import importlib.util
+import os
+import threading
+from functools import wraps
+from config import Config
+from database import SimpleSupabaseClient, SupabaseIndisponivel, SUPABASE_URL, SUPABASE_KEY
+
+_loop = None
+_loop_pid = None
+_loop_lock = threading.Lock()
+_client = None
+_client_lock = threading.Lock()
+
+def _get_loop():
+    global _loop, _loop_pid
+    pid = os.getpid()
+    if _loop is None or _loop_pid != pid:
+        with _loop_lock:
+            if _loop is None or _loop_pid != pid:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=loop.run_forever, name='supabase-async', daemon=True).start()
+                _loop, _loop_pid = loop, pid
+    return _loop
+
+def _prazo_rota():
+    # As consultas de uma rota correm juntas: o prazo é o da consulta mais longa
+    # (deadline + tentativas), com folga para o agendamento no loop
+    return max(Config.SUPABASE_READ_DEADLINE, Config.SUPABASE_WRITE_DEADLINE) + 1
+
+def rodar(coro, timeout=None):
+    """
+    Executa a corrotina no loop do processo e espera o resultado (chamar fora do loop).
+    Passado o prazo (padrão: o de uma consulta), cancela a corrotina e levanta
+    SupabaseIndisponivel, para a thread da requisição nunca ficar presa.
+    """
+    loop = _get_loop()
+    contexto = contextvars.copy_context()
+    future = asyncio.run_coroutine_threadsafe(_no_contexto(coro, contexto), loop)
+    try:
+        return future.result(_prazo_rota() if timeout is None else timeout)
+    except concurrent.futures.TimeoutError:
+        future.cancel()
+        raise SupabaseIndisponivel(0, 'Prazo da rota assíncrona esgotado')
+
+def agendar(coro):
+    """Agenda a corrotina no loop do processo sem esperar (I/O adiável, fora da requisição)"""
+    return asyncio.run_coroutine_threadsafe(coro, _get_loop())
+
+async def _no_contexto(coro, contexto):
+    # A tarefa herda as contextvars da thread da requisição (request, g, current_app)
+    return await asyncio.get_running_loop().create_task(coro, context=contexto)
+
+async def coletar(tarefas):
+    """Recebe {nome: awaitable} e devolve {nome: resultado}, aguardando todos juntos"""
+    nomes = list(tarefas)
+    resultados = await asyncio.gather(*(tarefas[nome] for nome in nomes))
+    return dict(zip(nomes, resultados))
+
+def rota_async(f):
+    """
+    Permite 'async def' em rotas: a corrotina roda no loop compartilhado do processo.
+    Nada bloqueante dentro dela: o usuário vem de @require_auth (por fora,
+    síncrono) e é lido com usuario_resolvido().
+    """
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        return rodar(f(*args, **kwargs))
+    return decorated_function
+
+class AsyncSupabaseClient(SimpleSupabaseClient):
+    """SimpleSupabaseClient com request_async sobre httpx.AsyncClient (HTTP/2 quando h2 está instalado)"""
+
+    def __init__(self, url, key, max_connections=None, max_keepalive=None, http2=None, **kwargs):
+        super().__init__(url, key, **kwargs)
+        self.max_connections = max_connections or Config.SUPABASE_ASYNC_MAX_CONNECTIONS
+        self.max_keepalive = max_keepalive or Config.SUPABASE_ASYNC_MAX_KEEPALIVE
+        http2 = Config.SUPABASE_HTTP2 if http2 is None else http2
+        self.http2 = http2 and importlib.util.find_spec('h2') is not None
+        self._async_client = None
+        self._async_pid = None
+
+    def _create_async_client(self):
+        import httpx
+
+        connect, read = self.timeout
+        return httpx.AsyncClient(
+            headers=self.headers,
+            http2=self.http2,
+            timeout=httpx.Timeout(read, connect=connect),
+            limits=httpx.Limits(max_connections=self.max_connections,
+                                max_keepalive_connections=self.max_keepalive)
+        )
+
+    def timeout_restante_async(self, restante):
+        import httpx
+
+        connect, read = self.timeout_restante(restante)
+        return httpx.Timeout(read, connect=connect)
+
+    @property
+    def erros_de_rede_async(self):
+        import httpx
+        return (httpx.TransportError,)
+
+    async def request_async(self, method, endpoint, **kwargs):
+        # Criado dentro do loop do processo (o pool do httpx fica preso a ele)
+        if self._async_client is None or self._async_pid != os.getpid():
+            self._async_client = self._create_async_client()
+            self._async_pid = os.getpid()
+        return await self._async_client.request(method, endpoint, **kwargs)
+
+def get_supabase_async():
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                if not SUPABASE_URL or not SUPABASE_KEY:
+                    raise ValueError("Credenciais do Supabase não configuradas")
+                _client = AsyncSupabaseClient(SUPABASE_URL, SUPABASE_KEY)
+    return _client
@@ -6,6 +6,7 @@ Execute este script depois de configurar o Supabase
 
 from werkzeug.security import generate_password_hash
 from database import get_supabase
+from utils.hashing import Vazao, gerar_hashes, gravar_hashes
 
 def fix_user_passwords():
     """Corrige as senhas dos usuários no banco"""
@@ -48,32 +49,16 @@ def fix_user_passwords():
         except Exception as e:
             print(f"⚠️ Erro ao verificar/criar gerencia: {e}")
         
-        # Atualizar senhas de todos os usuários
-        for username, password in users_passwords.items():
-            try:
-                # Gerar hash da senha
-                password_hash = generate_password_hash(password)
-                
-                print(f"🔄 Atualizando senha para: {username}")
-                
-                # Verificar se usuário existe
-                user_check = supabase.table('usuarios').select('id, username').eq('username', username).execute()
-                
-                if user_check.data:
-                    # Atualizar senha
-                    result = supabase.table('usuarios').update({
-                        'password_hash': password_hash
-                    }).eq('username', username).execute()
-                    
-                    if result.data:
-                        print(f"✅ Senha atualizada para: {username}")
-                    else:
-                        print(f"❌ Erro ao atualizar senha para: {username}")
-                else:
-                    print(f"⚠️ Usuário não encontrado: {username}")
-                    
-            except Exception as e:
-                print(f"❌ Erro ao processar {username}: {e}")
+        # Hashes em paralelo, gravados em lotes à medida que ficam prontos
+        print(f"🔄 Atualizando senhas de {len(users_passwords)} usuários...")
+        vazao = Vazao()
+        atualizados, nao_encontrados = gravar_hashes(supabase, gerar_hashes(users_passwords.items(), vazao=vazao))
+        
+        for username in atualizados:
+            print(f"✅ Senha atualizada para: {username}")
+        for username in nao_encontrados:
+            print(f"⚠️ Usuário não encontrado: {username}")
+        print(f"⏱️ {vazao.relatorio()}")
         
         print("\n" + "=" * 50)
         print("🎉 Processo de correção de senhas concluído!")
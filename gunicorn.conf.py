@@ -0,0 +1,38 @@
+"""
+Configuração do gunicorn para produção
+Execute: gunicorn -c gunicorn.conf.py wsgi:application
+
+As rotas passam quase todo o tempo esperando o Supabase (I/O), então o
+padrão é gthread: poucos processos (um por núcleo) com várias threads cada.
+GUNICORN_WORKER_CLASS=gevent troca para greenlets (requer o pacote gevent);
+nesse modo o pool de hash de senha (utils/senhas.py) também vira greenlets
+e um login segura o worker inteiro durante o KDF, por isso não é o padrão.
+
+Reload gracioso: kill -HUP <pid do master> sobe novos workers e encerra os
+antigos depois que terminam as requisições em andamento (graceful_timeout).
+"""
+
+import multiprocessing
+import os
+
+bind = f"0.0.0.0:{os.environ.get('PORT', 8000)}"
+
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gthread')
+workers = int(os.environ.get('WEB_CONCURRENCY', max(2, multiprocessing.cpu_count())))
+threads = int(os.environ.get('GUNICORN_THREADS', 16))
+worker_connections = int(os.environ.get('GUNICORN_WORKER_CONNECTIONS', 200))  # só gevent
+
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 60))
+graceful_timeout = int(os.environ.get('GUNICORN_GRACEFUL_TIMEOUT', 30))
+keepalive = int(os.environ.get('GUNICORN_KEEPALIVE', 5))
+
+# Recicla workers aos poucos (com jitter para não reiniciarem todos juntos)
+max_requests = int(os.environ.get('GUNICORN_MAX_REQUESTS', 2000))
+max_requests_jitter = int(os.environ.get('GUNICORN_MAX_REQUESTS_JITTER', 200))
+
+# Sem preload: cada worker roda create_app() e aquece o próprio cliente do Supabase
+preload_app = False
+
+accesslog = os.environ.get('GUNICORN_ACCESSLOG', '-')
+errorlog = '-'
+loglevel = os.environ.get('GUNICORN_LOGLEVEL', 'info')
@@ -1,7 +1,8 @@
 # Salve como: hash_generator.py
 # Execute: python hash_generator.py
 
-from werkzeug.security import generate_password_hash
+import sys
+from utils.hashing import Vazao, escrever_sql, gerar_hashes
 
 # Definir senhas
 senhas = {
@@ -18,12 +19,8 @@ senhas = {
     'recepcao1108': '123456'
 }
 
-print("-- Comandos SQL gerados automaticamente")
-print("-- Cole no Supabase SQL Editor\n")
-
-for usuario, senha in senhas.items():
-    hash_senha = generate_password_hash(senha)
-    print(f"UPDATE usuarios SET password_hash = '{hash_senha}' WHERE username = '{usuario}';")
-
-print("\n-- Verificar:")
-print("SELECT username, LEFT(password_hash, 30) || '...' FROM usuarios;")
\ No newline at end of file
+if __name__ == '__main__':
+    # Hashes em paralelo; o SQL vai para a saída padrão e o resumo para stderr
+    vazao = Vazao()
+    escrever_sql(gerar_hashes(senhas.items(), vazao=vazao), sys.stdout)
+    print(f"-- {vazao.relatorio()}", file=sys.stderr)
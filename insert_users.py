@@ -5,7 +5,7 @@ Execute este script para criar os usuários necessários
 """
 
 from database import get_supabase
-from werkzeug.security import generate_password_hash
+from scripts.import_users import importar_usuarios
 import traceback
 
 def insert_initial_users():
@@ -117,44 +117,14 @@ def insert_initial_users():
         if existing_usernames:
             print(f"   Usuários: {', '.join(existing_usernames)}")
         
-        created_count = 0
-        skipped_count = 0
-        
-        for user_data in users_to_create:
-            username = user_data['username']
-            
-            # Verificar se usuário já existe
-            if username in existing_usernames:
-                print(f"⏭️ Usuário '{username}' já existe - pulando")
-                skipped_count += 1
-                continue
-            
-            try:
-                # Gerar hash da senha
-                password_hash = generate_password_hash(user_data['password'])
-                
-                # Preparar dados para inserção
-                insert_data = {
-                    'username': user_data['username'],
-                    'email': user_data['email'],
-                    'password_hash': password_hash,
-                    'role': user_data['role'],
-                    'recepcao_id': user_data['recepcao_id'],
-                    'recepcao_nome': user_data['recepcao_nome'],
-                    'ativo': True
-                }
-                
-                # Inserir no banco
-                result = supabase.table('usuarios').insert(insert_data).execute()
-                
-                if result.data:
-                    print(f"✅ Usuário '{username}' criado com sucesso")
-                    created_count += 1
-                else:
-                    print(f"❌ Erro ao criar usuário '{username}' - sem dados retornados")
-                    
-            except Exception as e:
-                print(f"❌ Erro ao criar usuário '{username}': {e}")
+        # Hashes gerados em paralelo e inserção em lote (um POST para todos)
+        criados, existentes = importar_usuarios(users_to_create)
+        for user_data in existentes:
+            print(f"⏭️ Usuário '{user_data['username']}' já existe - pulando")
+        for user_data in criados:
+            print(f"✅ Usuário '{user_data['username']}' criado com sucesso")
+        created_count = len(criados)
+        skipped_count = len(existentes)
         
         print("\n" + "=" * 50)
         print(f"📊 Resumo:")
@@ -1,10 +1,26 @@
-from database import get_supabase
-from werkzeug.security import generate_password_hash, check_password_hash
-import traceback
+from database import get_supabase, quote_value, SupabaseIndisponivel
+from database_async import get_supabase_async, agendar
+from config import Config
+from utils.cache import TTLCache
+from utils.senhas import HashSaturado, verificar_senha, gerar_hash, fora_da_politica, em_segundo_plano
+from werkzeug.security import check_password_hash
+import hashlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Cache de usuários por username/email, compartilhado pelo processo
+_user_cache = TTLCache(maxsize=Config.USER_CACHE_MAXSIZE, ttl=Config.USER_CACHE_TTL)
+
+# Versão atual de cada usuário, usada para revogar tokens antigos
+_version_cache = TTLCache(maxsize=Config.USER_CACHE_MAXSIZE, ttl=Config.TOKEN_VERSION_TTL)
+
+# Logins inexistentes (cache negativo), separado para não expulsar usuários reais
+_missing_cache = TTLCache(maxsize=Config.USER_MISSING_CACHE_MAXSIZE, ttl=Config.USER_MISSING_CACHE_TTL)
 
 class User:
     def __init__(self, id=None, username=None, email=None, password_hash=None, 
-                 role=None, recepcao_id=None, recepcao_nome=None, ativo=True):
+                 role=None, recepcao_id=None, recepcao_nome=None, ativo=True, senha_versao=None):
         self.id = id
         self.username = username
         self.email = email
@@ -13,13 +29,13 @@ class User:
         self.recepcao_id = recepcao_id
         self.recepcao_nome = recepcao_nome
         self.ativo = ativo
+        self.senha_versao = senha_versao
     
     @staticmethod
     def create_user(username, email, password, role, recepcao_id=None, recepcao_nome=None):
         try:
-            print(f"🔍 DEBUG: Criando usuário {username}")
             supabase = get_supabase()
-            password_hash = generate_password_hash(password)
+            password_hash = gerar_hash(password)
             
             data = {
                 'username': username,
@@ -32,93 +48,193 @@ class User:
             }
             
             result = supabase.table('usuarios').insert(data).execute()
-            print(f"✅ Usuário criado: {result.data}")
+            User.invalidate_cache(username, email)
+            logger.info('Usuário criado', extra={'usuario': username, 'role': role})
             return result.data[0] if result.data else None
             
-        except Exception as e:
-            print(f"💥 ERRO ao criar usuário: {str(e)}")
+        except Exception:
+            logger.exception('Erro ao criar usuário', extra={'usuario': username})
             return None
     
+    @staticmethod
+    def invalidate_cache(*identifiers):
+        """Remove do cache os usuários com esses usernames/emails"""
+        for identifier in identifiers:
+            if not identifier:
+                continue
+            user_data = _user_cache.get(identifier)
+            _user_cache.delete(identifier)
+            _version_cache.delete(identifier)
+            _missing_cache.delete(identifier)
+            if user_data:
+                for key in (user_data.get('username'), user_data.get('email')):
+                    _user_cache.delete(key)
+                    _version_cache.delete(key)
+    
+    @staticmethod
+    def clear_cache():
+        _user_cache.clear()
+        _version_cache.clear()
+        _missing_cache.clear()
+    
+    @staticmethod
+    def from_claims(username, claims):
+        """Monta o usuário a partir das claims do JWT, sem consultar o banco"""
+        return User(
+            id=claims.get('user_id'),
+            username=username,
+            email=claims.get('email'),
+            role=claims.get('role'),
+            recepcao_id=claims.get('recepcao_id'),
+            recepcao_nome=claims.get('recepcao_nome'),
+            ativo=True
+        )
+    
+    @staticmethod
+    def get_token_version(username):
+        """Versão atual do usuário; consulta o banco no máximo uma vez por TOKEN_VERSION_TTL"""
+        version = _version_cache.get(username)
+        if version is None:
+            user = User.find_by_username(username)
+            if not user:
+                return None
+            version = user.token_version
+            _version_cache.set(username, version)
+        return version
+    
+    @staticmethod
+    def _from_row(user_data):
+        return User(
+            id=user_data['id'],
+            username=user_data['username'],
+            email=user_data['email'],
+            password_hash=user_data['password_hash'],
+            role=user_data['role'],
+            recepcao_id=user_data['recepcao_id'],
+            recepcao_nome=user_data['recepcao_nome'],
+            ativo=user_data['ativo'],
+            senha_versao=user_data.get('senha_versao')
+        )
+    
     @staticmethod
     def find_by_username(login_input):
+        cached = _user_cache.get(login_input)
+        if cached is not None:
+            return User._from_row(cached)
+        
+        # Login inexistente consultado há pouco: não volta ao banco
+        if _missing_cache.get(login_input):
+            return None
+        
         try:
-            print(f"🔍 DEBUG: Buscando usuário com input '{login_input}' no banco")
+            logger.debug('Buscando usuário no banco', extra={'login': login_input})
             supabase = get_supabase()
             
-            # Primeiro, tentar buscar por username
-            print(f"🔍 Tentativa 1: Buscar por username = '{login_input}'")
-            result = supabase.table('usuarios').select('*').eq('username', login_input).eq('ativo', True).execute()
+            # Uma única consulta por username OU email
+            valor = quote_value(login_input)
+            result = supabase.table('usuarios').select('*') \
+                .or_(f'username.eq.{valor},email.eq.{valor}') \
+                .eq('ativo', True).limit(2).execute()
             
-            print(f"📊 Resultado busca por username: {len(result.data) if result.data else 0} registros")
-            
-            # Se não encontrou por username, tentar por email
-            if not result.data:
-                print(f"🔍 Tentativa 2: Buscar por email = '{login_input}'")
-                result = supabase.table('usuarios').select('*').eq('email', login_input).eq('ativo', True).execute()
-                print(f"📊 Resultado busca por email: {len(result.data) if result.data else 0} registros")
-            
-            # Se ainda não encontrou, mostrar todos os usuários para debug
             if not result.data:
-                print(f"🔍 DEBUG: Nenhum usuário encontrado. Listando todos os usuários:")
-                all_users = supabase.table('usuarios').select('username, email, ativo').execute()
-                for user in all_users.data:
-                    print(f"   👤 Username: '{user['username']}' | Email: '{user['email']}' | Ativo: {user['ativo']}")
-                print(f"❌ Usuário '{login_input}' não encontrado no banco")
+                logger.debug('Usuário não encontrado', extra={'login': login_input})
+                _missing_cache.set(login_input, True)
                 return None
             
-            if result.data:
-                user_data = result.data[0]
-                print(f"✅ Usuário encontrado: {user_data['username']}")
-                print(f"📧 Email: {user_data['email']}")
-                print(f"👥 Role: {user_data['role']}")
-                print(f"🏢 Recepcao: {user_data.get('recepcao_id', 'N/A')}")
-                print(f"🔐 Hash existe: {'Sim' if user_data.get('password_hash') else 'Não'}")
-                print(f"🔐 Hash preview: {user_data.get('password_hash', '')[:50]}...")
-                
-                return User(
-                    id=user_data['id'],
-                    username=user_data['username'],
-                    email=user_data['email'],
-                    password_hash=user_data['password_hash'],
-                    role=user_data['role'],
-                    recepcao_id=user_data['recepcao_id'],
-                    recepcao_nome=user_data['recepcao_nome'],
-                    ativo=user_data['ativo']
-                )
-            else:
-                print(f"❌ Usuário '{login_input}' não encontrado no banco")
-                return None
-                
-        except Exception as e:
-            print(f"💥 ERRO ao buscar usuário: {str(e)}")
-            print(f"📋 Traceback: {traceback.format_exc()}")
+            # Se houver colisão, o match por username tem prioridade
+            user_data = next((u for u in result.data if u['username'] == login_input), result.data[0])
+            _user_cache.set(user_data['username'], user_data)
+            if user_data.get('email'):
+                _user_cache.set(user_data['email'], user_data)
+            
+            return User._from_row(user_data)
+        
+        except SupabaseIndisponivel:
+            # Banco fora do ar não é "usuário inexistente"
+            raise
+        except Exception:
+            logger.exception('Erro ao buscar usuário', extra={'login': login_input})
             return None
     
     def check_password(self, password):
         try:
-            print(f"🔐 DEBUG: Verificando senha para {self.username}")
-            print(f"🔐 Password recebida: '{password}' (length: {len(password)})")
-            print(f"🔐 Hash salvo: {self.password_hash[:50]}...")
-            
             # Verificar se hash existe
             if not self.password_hash:
-                print("❌ Hash de senha não existe!")
+                logger.warning('Usuário sem hash de senha', extra={'usuario': self.username})
                 return False
             
-            # Verificar formato do hash
+            # Verificar formato do hash (só o método, nunca o hash)
             if not (self.password_hash.startswith('pbkdf2:') or self.password_hash.startswith('scrypt:')):
-                print(f"⚠️ Hash não está no formato conhecido! Formato atual: {self.password_hash[:20]}...")
-                
-            # Tentar verificar senha
-            result = check_password_hash(self.password_hash, password)
-            print(f"🔐 Resultado check_password_hash: {result}")
+                logger.warning('Hash em formato desconhecido', extra={
+                    'usuario': self.username, 'metodo': self.password_hash.split('$', 1)[0][:20]
+                })
             
+            # Verificar senha no pool de hash (levanta HashSaturado se estiver cheio)
+            result = verificar_senha(self.password_hash, password)
             return result
             
-        except Exception as e:
-            print(f"💥 ERRO ao verificar senha: {str(e)}")
-            print(f"📋 Traceback: {traceback.format_exc()}")
+        except HashSaturado:
+            raise
+        except Exception:
+            logger.exception('Erro ao verificar senha', extra={'usuario': self.username})
+            return False
+    
+    def atualizar_hash_se_necessario(self, password):
+        """
+        Depois de um login correto, refaz em segundo plano um hash fora de
+        HASH_METHOD. A troca não muda senha_versao, então o token continua válido.
+        """
+        # Checado aqui: hash já na política não ocupa vaga do pool de hash
+        if not Config.HASH_REHASH_ON_LOGIN or not self.password_hash or not fora_da_politica(self.password_hash):
+            return False
+        future = em_segundo_plano(gerar_hash, password)
+        if future is None:
             return False
+        # Só o KDF usa o pool de hash; a gravação (rede) vai para o loop assíncrono
+        username, email, hash_atual = self.username, self.email, self.password_hash
+        future.add_done_callback(
+            lambda f: User._gravar_hash_novo(username, email, hash_atual, f)
+        )
+        return True
+    
+    @staticmethod
+    def _gravar_hash_novo(username, email, hash_atual, future):
+        if future.exception() is not None:
+            logger.error('Erro ao gerar novo hash', exc_info=future.exception(), extra={'usuario': username})
+            return
+        agendar(User._refazer_hash(username, email, hash_atual, future.result()))
+    
+    @staticmethod
+    async def _refazer_hash(username, email, hash_atual, hash_novo):
+        try:
+            result = await get_supabase_async().rpc('atualizar_hash_senha', {
+                'p_username': username,
+                'p_hash_atual': hash_atual,
+                'p_hash_novo': hash_novo
+            }).execute_async()
+            if result.data:
+                User.invalidate_cache(username, email)
+        except Exception:
+            logger.exception('Erro ao atualizar hash', extra={'usuario': username})
+    
+    @property
+    def token_version(self):
+        """Muda sempre que senha, role, recepção ou status do usuário mudam"""
+        # senha_versao não muda quando só os parâmetros do hash são atualizados;
+        # sem a coluna (migration não aplicada) o próprio hash faz esse papel
+        senha = self.senha_versao if self.senha_versao is not None else self.password_hash
+        base = f"{senha}|{self.role}|{self.recepcao_id}|{self.ativo}"
+        return hashlib.sha256(base.encode()).hexdigest()[:16]
+    
+    def token_claims(self):
+        return {
+            'user_id': self.id,
+            'email': self.email,
+            'role': self.role,
+            'recepcao_id': self.recepcao_id,
+            'recepcao_nome': self.recepcao_nome,
+            'ver': self.token_version
+        }
     
     def to_dict(self):
         return {
@@ -134,22 +250,20 @@ class User:
 # Função auxiliar para testar conexão com banco
 def test_database_connection():
     try:
-        print("🔍 DEBUG: Testando conexão com banco...")
         supabase = get_supabase()
         result = supabase.table('usuarios').select('username').limit(1).execute()
-        print(f"✅ Conexão OK. Usuarios encontrados: {len(result.data)}")
+        logger.info('Conexão OK', extra={'usuarios': len(result.data)})
         return True
-    except Exception as e:
-        print(f"💥 ERRO na conexão: {str(e)}")
+    except Exception:
+        logger.exception('Erro na conexão com o banco')
         return False
 
 # Função para testar hash específico
 def test_password_hash(stored_hash, password):
     try:
-        print(f"🧪 TESTE: Hash '{stored_hash[:50]}...' com senha '{password}'")
         result = check_password_hash(stored_hash, password)
-        print(f"🧪 Resultado: {result}")
+        logger.info('Teste de hash', extra={'metodo': stored_hash.split('$', 1)[0], 'resultado': result})
         return result
-    except Exception as e:
-        print(f"💥 ERRO no teste de hash: {str(e)}")
+    except Exception:
+        logger.exception('Erro no teste de hash')
         return False
\ No newline at end of file
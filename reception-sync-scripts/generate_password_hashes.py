@@ -4,7 +4,11 @@ Gerador de hashes de senha para o sistema Reception Sync
 Execute este script para gerar os hashes corretos
 """
 
-from werkzeug.security import generate_password_hash
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import hashing
 
 def gerar_hashes():
     # Definir senhas padrão
@@ -25,36 +29,23 @@ def gerar_hashes():
     print("🔐 Gerando hashes de senha...")
     print("=" * 60)
     
-    # Gerar SQL UPDATE statements
-    sql_statements = []
+    # Hashes gerados em paralelo; o arquivo e a listagem usam os mesmos pares
+    vazao = hashing.Vazao()
+    gerados = list(hashing.gerar_hashes(usuarios_senhas.items(), vazao=vazao))
+    
+    with open('update_passwords.sql', 'w') as f:
+        hashing.escrever_sql(gerados, f)
     
-    for username, senha in usuarios_senhas.items():
-        password_hash = generate_password_hash(senha)
-        
+    for username, password_hash in gerados:
         print(f"Usuário: {username}")
-        print(f"Senha: {senha}")
         print(f"Hash: {password_hash}")
-        
-        # Gerar SQL UPDATE
-        sql = f"UPDATE usuarios SET password_hash = '{password_hash}' WHERE username = '{username}';"
-        sql_statements.append(sql)
-        
         print("-" * 60)
     
-    # Salvar SQL em arquivo
-    with open('update_passwords.sql', 'w') as f:
-        f.write("-- Atualização de senhas dos usuários\n")
-        f.write("-- Execute este arquivo no Supabase SQL Editor\n\n")
-        for sql in sql_statements:
-            f.write(sql + "\n")
-        
-        f.write("\n-- Verificar atualizações\n")
-        f.write("SELECT username, email, role, LEFT(password_hash, 20) || '...' as hash_preview FROM usuarios ORDER BY username;\n")
-    
+    print(vazao.relatorio())
     print("\n✅ Arquivo 'update_passwords.sql' criado!")
     print("📁 Execute este arquivo no editor SQL do Supabase")
     
-    return sql_statements
+    return gerados
 
 if __name__ == "__main__":
     gerar_hashes()
\ No newline at end of file
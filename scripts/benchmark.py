@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Benchmark da API sem Supabase
+Execute: python scripts/benchmark.py --latencia 20 -c 16 -d 10
+
+Sobe o PostgREST em memória (scripts/fake_postgrest.py) com as 15 tabelas
+das migrations semeadas em volumes realistas, aponta o app Flask de verdade
+para ele (servidor threaded do werkzeug, na mesma máquina) e mede cada
+cenário com scripts/load_test.py:
+
+    login       POST /api/auth/login (hash de senha incluso)
+    dashboard   GET /api/dashboard/stats como admin (--dashboard-ttl 0 sem cache)
+    listas      GET de salas, anamneses e orçamentos como recepcao808
+    escrita     POST /api/anamneses/ e PUT /api/salas/<id> como recepcao808
+
+O PostgREST falso e o app dividem o mesmo processo (e o GIL): os números
+servem para comparar versões do código entre si, não com o Supabase real.
+Use --latencia para simular a ida e volta até o banco.
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+from datetime import date
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from fake_postgrest import BancoEmMemoria, iniciar
+from gerar_dados import ADMINS, PROFISSIONAIS, SENHA, TERAPIAS, gerar, volumes as calcular_volumes
+from load_test import executar
+
+CENARIOS = ('login', 'dashboard', 'listas', 'escrita')
+
+def semear(banco, escala=1, seed=42):
+    """Preenche o banco em memória com scripts/gerar_dados.py; devolve {tabela: linhas}"""
+    volumes = calcular_volumes(escala)
+    refs = {tabela: (1, quantidade) for tabela, quantidade in volumes.items()}
+    for tabela, quantidade in volumes.items():
+        banco.carregar(tabela, gerar(tabela, quantidade, seed, refs=refs))
+    return volumes
+
+def _ambiente(url_banco, dashboard_ttl=None):
+    # Config lê o ambiente na importação: tem que vir antes de semear/importar o app
+    os.environ['SUPABASE_URL'] = url_banco
+    os.environ['SUPABASE_KEY'] = 'benchmark'
+    os.environ['JWT_SECRET_KEY'] = os.environ.get('JWT_SECRET_KEY') or 'benchmark-' * 4
+    # Sem uma linha de log por requisição (o werkzeug loga cada uma em INFO)
+    os.environ['LOG_LEVEL'] = os.environ.get('LOG_LEVEL') or 'WARNING'
+    os.environ['LOG_LEVELS'] = os.environ.get('LOG_LEVELS') or 'werkzeug=WARNING'
+    if dashboard_ttl is not None:
+        os.environ['DASHBOARD_CACHE_TTL'] = str(dashboard_ttl)
+
+def _subir_app():
+    from werkzeug.serving import make_server
+    from app import create_app
+
+    app = create_app('production')
+    servidor = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=servidor.serve_forever, name='benchmark-app', daemon=True).start()
+    return app, servidor, f'http://127.0.0.1:{servidor.server_port}'
+
+def _token(app, banco, username):
+    from flask_jwt_extended import create_access_token
+    from models.user import User
+
+    linha = next(u for u in banco.tabelas['usuarios'] if u['username'] == username)
+    user = User._from_row(linha)
+    with app.app_context():
+        return create_access_token(identity=user.username, additional_claims=user.token_claims())
+
+def _cenarios(app, banco):
+    recepcao = _token(app, banco, 'recepcao808')
+    sala = next(s['id'] for s in banco.tabelas['salas'] if s['recepcao_id'] == '808')
+    anamnese = {
+        'nome_pais': 'Maria Souza', 'nome_paciente': 'Pedro Souza', 'data_anamnese': date.today().isoformat(),
+        'profissional': PROFISSIONAIS[0], 'motivo_consulta': TERAPIAS[0]
+    }
+    return {
+        'login': (None, [('POST', '/api/auth/login', {'username': 'recepcao808', 'password': SENHA})]),
+        'dashboard': (_token(app, banco, ADMINS[0]), ['/api/dashboard/stats']),
+        'listas': (recepcao, ['/api/salas/', '/api/anamneses/', '/api/orcamentos/']),
+        'escrita': (recepcao, [
+            ('POST', '/api/anamneses/', anamnese),
+            ('PUT', f'/api/salas/{sala}', {'status': 'ocupada', 'ocupado_por': 'Benchmark'}),
+        ]),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark da API contra um PostgREST em memória')
+    parser.add_argument('--cenarios', nargs='+', choices=CENARIOS, default=list(CENARIOS))
+    parser.add_argument('--latencia', type=float, default=20, help='ms por chamada ao PostgREST')
+    parser.add_argument('--jitter', type=float, default=5, help='ms aleatórios somados à latência')
+    parser.add_argument('--escala', type=float, default=1, help='multiplica o volume semeado')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('-c', '--concorrencia', type=int, default=16)
+    parser.add_argument('-d', '--duracao', type=float, default=10, help='segundos por cenário')
+    parser.add_argument('--dashboard-ttl', type=int, help='DASHBOARD_CACHE_TTL (0 recalcula a cada requisição)')
+    parser.add_argument('--json', action='store_true', help='resultado em JSON')
+    args = parser.parse_args()
+
+    banco = BancoEmMemoria()
+    servidor_banco, url_banco = iniciar(banco, 0, args.latencia / 1000, args.jitter / 1000)
+    _ambiente(url_banco, args.dashboard_ttl)
+    volumes = semear(banco, args.escala, args.seed)
+    app, servidor_app, base = _subir_app()
+    if not args.json:
+        print(f"{sum(volumes.values())} linhas em {len(volumes)} tabelas; "
+              f"latência {args.latencia:.0f}±{args.jitter:.0f} ms; {args.concorrencia} conexões x {args.duracao:.0f} s")
+
+    cenarios = _cenarios(app, banco)
+    resultados = {}
+    for nome in args.cenarios:
+        token, caminhos = cenarios[nome]
+        resultados[nome] = executar(base, caminhos, token, args.concorrencia, args.duracao)
+
+    servidor_app.shutdown()
+    servidor_banco.shutdown()
+
+    if args.json:
+        print(json.dumps({'volumes': volumes, 'resultados': resultados}, indent=2))
+        return
+    print(f"{'cenário':<10} {'req/s':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'erros':>6}")
+    for nome, r in resultados.items():
+        print(f"{nome:<10} {r['req_s']:>8.1f} {r['p50'] * 1000:>6.0f}ms {r['p95'] * 1000:>6.0f}ms "
+              f"{r['p99'] * 1000:>6.0f}ms {r['erros']:>6}")
+
+if __name__ == '__main__':
+    main()
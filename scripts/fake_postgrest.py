@@ -0,0 +1,503 @@
+#!/usr/bin/env python3
+"""
+PostgREST em memória para testes de carga e benchmarks offline
+Execute: python scripts/fake_postgrest.py --porta 54321 --latencia 20
+
+Implementa o subconjunto que o SimpleQuery (database.py) usa:
+- select=colunas, filtros eq/neq/gt/gte/lt/lte/like/ilike/is/in (e not.*),
+  or=(...) com and(...) aninhado, order=col.desc.nullslast, limit, offset
+  e o header Range
+- Prefer: count=exact (Content-Range), return=representation|minimal,
+  resolution=merge-duplicates|ignore-duplicates com on_conflict e columns=
+  (chave ausente vira NULL, ou o default da coluna com missing=default)
+- GET/HEAD, POST (insert/upsert em lote), PATCH e DELETE
+- as views dashboard_* e as funções rpc das migrations
+
+Cada resposta espera 'latencia' segundos (mais um jitter aleatório), para
+simular a ida e volta até o Supabase.
+"""
+
+import argparse
+import json
+import random
+import re
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qsl
+
+PARAMETROS_RESERVADOS = {'select', 'order', 'limit', 'offset', 'on_conflict', 'columns'}
+
+# Colunas únicas além do id (para on_conflict e erro 409)
+UNICAS = {'usuarios': ('username', 'email')}
+
+class ErroPostgrest(Exception):
+    def __init__(self, status, mensagem, codigo=''):
+        super().__init__(mensagem)
+        self.status = status
+        self.mensagem = mensagem
+        self.codigo = codigo
+
+def _agora():
+    return datetime.now().isoformat(timespec='seconds')
+
+# Filtros ----------------------------------------------------------------------
+
+def _dividir(texto, separador=','):
+    """Divide respeitando aspas e parênteses: 'a.eq.1,and(b.eq.2,c.eq.3)'"""
+    partes, atual, nivel, aspas, escape = [], [], 0, False, False
+    for c in texto:
+        if escape:
+            atual.append(c)
+            escape = False
+        elif c == '\\' and aspas:
+            atual.append(c)
+            escape = True
+        elif c == '"':
+            aspas = not aspas
+            atual.append(c)
+        elif not aspas and c == '(':
+            nivel += 1
+            atual.append(c)
+        elif not aspas and c == ')':
+            nivel -= 1
+            atual.append(c)
+        elif not aspas and nivel == 0 and c == separador:
+            partes.append(''.join(atual))
+            atual = []
+        else:
+            atual.append(c)
+    partes.append(''.join(atual))
+    return [p for p in partes if p]
+
+def _desaspar(valor):
+    if len(valor) >= 2 and valor[0] == '"' and valor[-1] == '"':
+        return re.sub(r'\\(.)', r'\1', valor[1:-1])
+    return valor
+
+def _converter(valor_linha, texto):
+    """Converte o valor do filtro para o tipo da coluna na linha"""
+    if isinstance(valor_linha, bool):
+        return texto.lower() == 'true'
+    if isinstance(valor_linha, (int, float)):
+        try:
+            return float(texto)
+        except ValueError:
+            return texto
+    return texto
+
+def _padrao_like(padrao, ignorar_caixa):
+    regex = ''.join('.*' if c in '*%' else '.' if c == '_' else re.escape(c) for c in padrao)
+    return re.compile(f'^{regex}$', re.DOTALL | (re.IGNORECASE if ignorar_caixa else 0))
+
+def _comparar(valor, operador, texto):
+    if operador == 'is':
+        alvo = {'null': None, 'true': True, 'false': False}.get(texto.lower(), texto)
+        return valor is alvo if alvo is None or isinstance(alvo, bool) else valor == alvo
+    if operador == 'in':
+        opcoes = [_desaspar(v) for v in _dividir(texto.strip('()'))]
+        return valor is not None and any(_converter(valor, o) == _comparavel(valor) for o in opcoes)
+    if valor is None:
+        return False
+    if operador in ('like', 'ilike'):
+        return bool(_padrao_like(texto, operador == 'ilike').match(str(valor)))
+
+    alvo = _converter(valor, texto)
+    atual = _comparavel(valor)
+    if type(alvo) is not type(atual):
+        atual, alvo = str(valor), texto
+    if operador == 'eq':
+        return atual == alvo
+    if operador == 'neq':
+        return atual != alvo
+    if operador == 'gt':
+        return atual > alvo
+    if operador == 'gte':
+        return atual >= alvo
+    if operador == 'lt':
+        return atual < alvo
+    if operador == 'lte':
+        return atual <= alvo
+    raise ErroPostgrest(400, f'operador desconhecido: {operador}', 'PGRST100')
+
+def _comparavel(valor):
+    if isinstance(valor, bool):
+        return valor
+    if isinstance(valor, (int, float)):
+        return float(valor)
+    return valor
+
+def _condicao(coluna, expressao):
+    """'not.eq.x' / 'eq.x' -> função(linha) -> bool"""
+    negar = expressao.startswith('not.')
+    if negar:
+        expressao = expressao[4:]
+    operador, _, texto = expressao.partition('.')
+    texto = _desaspar(texto)
+
+    def testar(linha):
+        resultado = _comparar(linha.get(coluna), operador, texto)
+        return not resultado if negar else resultado
+    return testar
+
+def _logica(expressao, combinar):
+    """Conteúdo de or=(...) / and(...): lista de condições combinadas com any/all"""
+    condicoes = []
+    for item in _dividir(expressao):
+        for nome, funcao in (('and(', all), ('or(', any)):
+            if item.startswith(nome):
+                condicoes.append(_logica(item[len(nome):-1], funcao))
+                break
+        else:
+            coluna, _, resto = item.partition('.')
+            condicoes.append(_condicao(coluna, resto))
+    return lambda linha: combinar(c(linha) for c in condicoes)
+
+def montar_filtro(parametros):
+    condicoes = []
+    for chave, valor in parametros:
+        if chave in PARAMETROS_RESERVADOS:
+            continue
+        if chave in ('or', 'and'):
+            condicoes.append(_logica(valor[1:-1], any if chave == 'or' else all))
+        else:
+            condicoes.append(_condicao(chave, valor))
+    return lambda linha: all(c(linha) for c in condicoes)
+
+def ordenar(linhas, ordem):
+    # Ordenação estável aplicada da última coluna para a primeira
+    for termo in reversed(ordem.split(',')):
+        partes = termo.split('.')
+        coluna, desc = partes[0], 'desc' in partes[1:]
+        nulos_primeiro = 'nullsfirst' in partes[1:] or (desc and 'nullslast' not in partes[1:])
+        presentes = [l for l in linhas if l.get(coluna) is not None]
+        nulos = [l for l in linhas if l.get(coluna) is None]
+        presentes.sort(key=lambda l: _comparavel(l[coluna]), reverse=desc)
+        linhas = nulos + presentes if nulos_primeiro else presentes + nulos
+    return linhas
+
+def projetar(linhas, select):
+    if not select or select == '*':
+        return [dict(l) for l in linhas]
+    colunas = [c for c in select.split(',') if c]
+    return [{c: l.get(c) for c in colunas} for l in linhas]
+
+# Banco ------------------------------------------------------------------------
+
+class BancoEmMemoria:
+    """Tabelas como listas de dicts, com id serial e as views/rpcs das migrations"""
+
+    def __init__(self):
+        self.tabelas = {}
+        self._proximo_id = {}
+        self._lock = threading.RLock()
+        self.views = {
+            'dashboard_salas_status': lambda: self._agrupar('salas', ('recepcao_id', 'status')),
+            'dashboard_orcamentos_status': lambda: self._agrupar('orcamentos', ('recepcao_id', 'status')),
+            'dashboard_orcamentos_mes': lambda: self._agrupar('orcamentos', ('recepcao_id', 'mes'), mes='created_at'),
+            'dashboard_anamneses_mes': lambda: self._agrupar(
+                'anamneses', ('recepcao_id', 'mes'), mes='data_registro', somar='quantidade'),
+        }
+        self.rpcs = {
+            'registrar_retirada_estoque': self._retirada_estoque,
+            'registrar_distribuicao_brindes': self._distribuicao_brindes,
+            'atualizar_hash_senha': self._atualizar_hash_senha,
+            'estatisticas_anamneses': self._estatisticas_anamneses,
+        }
+
+    def criar_tabela(self, nome):
+        with self._lock:
+            self.tabelas.setdefault(nome, [])
+            self._proximo_id.setdefault(nome, 1)
+
+    def carregar(self, nome, linhas):
+        """Insere linhas já prontas (semente); ids ausentes são gerados"""
+        self.criar_tabela(nome)
+        with self._lock:
+            for linha in linhas:
+                self._novo_registro(nome, linha)
+
+    def _novo_registro(self, tabela, dados):
+        linha = dict(dados)
+        if linha.get('id') is None:
+            linha['id'] = self._proximo_id[tabela]
+        self._proximo_id[tabela] = max(self._proximo_id[tabela], int(linha['id']) + 1)
+        linha.setdefault('created_at', _agora())
+        if tabela == 'usuarios':
+            linha.setdefault('ativo', True)
+            linha.setdefault('senha_versao', 1)
+        self.tabelas[tabela].append(linha)
+        return linha
+
+    def _linhas(self, tabela):
+        if tabela in self.views:
+            return self.views[tabela]()
+        if tabela not in self.tabelas:
+            raise ErroPostgrest(404, f'relation "public.{tabela}" does not exist', '42P01')
+        return self.tabelas[tabela]
+
+    def _agrupar(self, tabela, chaves, mes=None, somar=None):
+        grupos = {}
+        for linha in self.tabelas.get(tabela, []):
+            valores = dict(linha)
+            if mes:
+                valores['mes'] = str(linha.get(mes) or '')[:7] or None
+            chave = tuple(valores.get(c) for c in chaves)
+            grupos[chave] = grupos.get(chave, 0) + (int(linha.get(somar) or 0) if somar else 1)
+        return [dict(zip(chaves, chave), total=total) for chave, total in grupos.items()]
+
+    def selecionar(self, tabela, parametros):
+        filtro = montar_filtro(parametros)
+        with self._lock:
+            linhas = [l for l in self._linhas(tabela) if filtro(l)]
+        ordem = dict(parametros).get('order')
+        return ordenar(linhas, ordem) if ordem else linhas
+
+    def inserir(self, tabela, registros, colunas=None, on_conflict=None, resolucao=None, ausentes_default=False):
+        if tabela not in self.tabelas:
+            raise ErroPostgrest(404, f'relation "public.{tabela}" does not exist', '42P01')
+        criados = []
+        with self._lock:
+            for dados in registros:
+                if colunas:
+                    # Como no PostgREST: chave fora da linha é NULL, salvo com Prefer: missing=default
+                    dados = {c: dados.get(c) for c in colunas if c in dados or not ausentes_default}
+                existente = self._conflito(tabela, dados, on_conflict)
+                if existente is not None:
+                    if resolucao == 'ignore-duplicates':
+                        continue
+                    if resolucao == 'merge-duplicates':
+                        existente.update({k: v for k, v in dados.items() if k != 'id'})
+                        criados.append(dict(existente))
+                        continue
+                    raise ErroPostgrest(409, 'duplicate key value violates unique constraint', '23505')
+                criados.append(dict(self._novo_registro(tabela, dados)))
+        return criados
+
+    def _conflito(self, tabela, dados, on_conflict):
+        colunas = [on_conflict] if on_conflict else ['id', *UNICAS.get(tabela, ())]
+        for coluna in colunas:
+            valor = dados.get(coluna)
+            if valor is None:
+                continue
+            for linha in self.tabelas[tabela]:
+                if linha.get(coluna) == valor:
+                    return linha
+        return None
+
+    def atualizar(self, tabela, parametros, dados):
+        filtro = montar_filtro(parametros)
+        with self._lock:
+            linhas = [l for l in self._linhas(tabela) if filtro(l)]
+            for linha in linhas:
+                # Trigger usuarios_senha_versao (20251018140000_rehash_senha.sql)
+                if tabela == 'usuarios' and 'password_hash' in dados and dados['password_hash'] != linha.get('password_hash'):
+                    linha['senha_versao'] = (linha.get('senha_versao') or 1) + 1
+                linha.update({k: (_agora() if v == 'now()' else v) for k, v in dados.items()})
+            return [dict(l) for l in linhas]
+
+    def remover(self, tabela, parametros):
+        with self._lock:
+            filtro = montar_filtro(parametros)
+            removidas = [l for l in self._linhas(tabela) if filtro(l)]
+            self.tabelas[tabela] = [l for l in self.tabelas[tabela] if not filtro(l)]
+            return removidas
+
+    def chamar(self, funcao, parametros):
+        if funcao not in self.rpcs:
+            raise ErroPostgrest(404, f'function public.{funcao} does not exist', 'PGRST202')
+        with self._lock:
+            return self.rpcs[funcao](**parametros)
+
+    def _baixa(self, tabela_saldo, item_id, quantidade):
+        if quantidade is None or quantidade <= 0:
+            return None, 'quantidade_invalida'
+        item = next((l for l in self.tabelas.get(tabela_saldo, []) if l['id'] == item_id), None)
+        if item is None:
+            return None, 'item_nao_encontrado'
+        if item['quantidade'] < quantidade:
+            return None, 'quantidade_insuficiente'
+        item['quantidade'] -= quantidade
+        return item, 'ok'
+
+    def _retirada_estoque(self, p_item_id, p_quantidade, p_retirado_por, p_observacoes, p_recepcao_id, p_created_by):
+        item, status = self._baixa('estoque', p_item_id, p_quantidade)
+        if item is None:
+            return {'status': status}
+        registro = self._novo_registro('retiradas_estoque', {
+            'item_id': p_item_id, 'item_nome': item['nome'], 'quantidade': p_quantidade,
+            'retirado_por': p_retirado_por, 'observacoes': p_observacoes,
+            'recepcao_id': p_recepcao_id, 'created_by': p_created_by
+        })
+        return {'status': 'ok', 'registro': dict(registro)}
+
+    def _distribuicao_brindes(self, p_item_id, p_quantidade, p_recepcao_origem, p_recepcao_destino,
+                              p_observacoes, p_created_by):
+        item, status = self._baixa('estoque_brindes', p_item_id, p_quantidade)
+        if item is None:
+            return {'status': status}
+        registro = self._novo_registro('distribuicao_brindes', {
+            'item_id': p_item_id, 'item_nome': item['nome'], 'quantidade': p_quantidade,
+            'recepcao_origem': p_recepcao_origem, 'recepcao_destino': p_recepcao_destino,
+            'observacoes': p_observacoes, 'created_by': p_created_by
+        })
+        return {'status': 'ok', 'registro': dict(registro)}
+
+    def _atualizar_hash_senha(self, p_username, p_hash_atual, p_hash_novo):
+        for linha in self.tabelas.get('usuarios', []):
+            if linha['username'] == p_username and linha['password_hash'] == p_hash_atual:
+                linha['password_hash'] = p_hash_novo
+                return True
+        return False
+
+    def _estatisticas_anamneses(self, p_recepcao_id=None, p_hoje=None):
+        hoje = p_hoje or _agora()[:10]
+        proximo = f"{int(hoje[:4]) + 1}-01" if hoje[5:7] == '12' else f"{hoje[:5]}{int(hoje[5:7]) + 1:02d}"
+        linhas = [l for l in self.tabelas.get('anamneses', [])
+                  if p_recepcao_id is None or l.get('recepcao_id') == p_recepcao_id]
+
+        def contar(chave, padrao=None):
+            totais = {}
+            for l in linhas:
+                valor = l.get(chave) or padrao
+                if valor is not None:
+                    valor = valor[:7] if chave == 'data_anamnese' else valor
+                    totais[valor] = totais.get(valor, 0) + 1
+            return totais
+
+        por_status, por_mes = contar('status'), contar('data_anamnese')
+        return {
+            'total_anamneses': len(linhas),
+            'agendadas': por_status.get('agendada', 0),
+            'realizadas': por_status.get('realizada', 0),
+            'canceladas': por_status.get('cancelada', 0),
+            'este_mes': por_mes.get(hoje[:7], 0),
+            'proximo_mes': por_mes.get(proximo, 0),
+            'por_profissional': contar('profissional', 'Não informado'),
+            'por_tipo': contar('tipo_anamnese', 'Não informado'),
+            'por_mes': por_mes,
+        }
+
+# Servidor HTTP ----------------------------------------------------------------
+
+def _prefer(headers):
+    valores = {}
+    for item in (headers.get('Prefer') or '').split(','):
+        chave, _, valor = item.strip().partition('=')
+        if chave:
+            valores[chave] = valor
+    return valores
+
+def criar_handler(banco, latencia=0.0, jitter=0.0):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def log_message(self, *args):
+            pass
+
+        def _responder(self, status, corpo=None, headers=None):
+            dados = b'' if corpo is None or self.command == 'HEAD' else json.dumps(corpo, default=str).encode()
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            for chave, valor in (headers or {}).items():
+                self.send_header(chave, valor)
+            self.send_header('Content-Length', str(len(dados)))
+            self.end_headers()
+            self.wfile.write(dados)
+
+        def _tratar(self):
+            if latencia or jitter:
+                time.sleep(latencia + random.uniform(0, jitter))
+            url = urlsplit(self.path)
+            if not url.path.startswith('/rest/v1/'):
+                return self._responder(404, {'message': 'not found'})
+            recurso = url.path[len('/rest/v1/'):]
+            parametros = parse_qsl(url.query, keep_blank_values=True)
+            prefer = _prefer(self.headers)
+            tamanho = int(self.headers.get('Content-Length') or 0)
+            corpo = json.loads(self.rfile.read(tamanho)) if tamanho else None
+            try:
+                if recurso.startswith('rpc/'):
+                    return self._responder(200, banco.chamar(recurso[4:], corpo or {}))
+                if self.command in ('GET', 'HEAD'):
+                    return self._ler(recurso, parametros, prefer)
+                return self._escrever(recurso, parametros, prefer, corpo)
+            except ErroPostgrest as e:
+                return self._responder(e.status, {'message': e.mensagem, 'code': e.codigo})
+            except (TypeError, ValueError, KeyError) as e:
+                return self._responder(400, {'message': str(e), 'code': 'PGRST102'})
+
+        def _ler(self, recurso, parametros, prefer):
+            linhas = banco.selecionar(recurso, parametros)
+            total = len(linhas)
+            opcoes = dict(parametros)
+            inicio = int(opcoes.get('offset', 0))
+            fim = inicio + int(opcoes['limit']) if 'limit' in opcoes else total
+            intervalo = self.headers.get('Range')
+            if intervalo:
+                de, _, ate = intervalo.partition('-')
+                inicio = max(inicio, int(de))
+                fim = min(fim, int(ate) + 1) if ate else fim
+            pagina = projetar(linhas[inicio:fim], opcoes.get('select'))
+            faixa = f'{inicio}-{inicio + len(pagina) - 1}' if pagina else '*'
+            contagem = str(total) if prefer.get('count') else '*'
+            return self._responder(200, pagina, {'Content-Range': f'{faixa}/{contagem}'})
+
+        def _escrever(self, recurso, parametros, prefer, corpo):
+            opcoes = dict(parametros)
+            if self.command == 'POST':
+                registros = corpo if isinstance(corpo, list) else [corpo]
+                colunas = opcoes['columns'].split(',') if opcoes.get('columns') else None
+                linhas = banco.inserir(recurso, registros, colunas, opcoes.get('on_conflict'), prefer.get('resolution'),
+                                       ausentes_default=prefer.get('missing') == 'default')
+                status = 201
+            elif self.command == 'PATCH':
+                linhas = banco.atualizar(recurso, parametros, corpo or {})
+                status = 200
+            elif self.command == 'DELETE':
+                linhas = banco.remover(recurso, parametros)
+                status = 200
+            else:
+                return self._responder(405, {'message': 'method not allowed'})
+
+            headers = {'Content-Range': f'*/{len(linhas)}'}
+            if prefer.get('return') == 'representation':
+                return self._responder(status, projetar(linhas, opcoes.get('select')), headers)
+            return self._responder(201 if status == 201 else 204, None, headers)
+
+        do_GET = do_HEAD = do_POST = do_PATCH = do_DELETE = _tratar
+
+    return Handler
+
+class ServidorPostgrest(ThreadingHTTPServer):
+    daemon_threads = True
+
+def iniciar(banco, porta=0, latencia=0.0, jitter=0.0):
+    """Sobe o servidor numa thread; devolve (servidor, url base)"""
+    servidor = ServidorPostgrest(('127.0.0.1', porta), criar_handler(banco, latencia, jitter))
+    threading.Thread(target=servidor.serve_forever, name='fake-postgrest', daemon=True).start()
+    return servidor, f'http://127.0.0.1:{servidor.server_port}'
+
+def main():
+    parser = argparse.ArgumentParser(description='PostgREST em memória')
+    parser.add_argument('--porta', type=int, default=54321)
+    parser.add_argument('--latencia', type=float, default=20, help='ms por requisição')
+    parser.add_argument('--jitter', type=float, default=0, help='ms aleatórios somados à latência')
+    parser.add_argument('--escala', type=float, default=1, help='multiplica o volume semeado')
+    parser.add_argument('--seed', type=int, default=42)
+    args = parser.parse_args()
+
+    from benchmark import semear, SENHA
+    banco = BancoEmMemoria()
+    volumes = semear(banco, args.escala, args.seed)
+    servidor, url = iniciar(banco, args.porta, args.latencia / 1000, args.jitter / 1000)
+    print(f"PostgREST falso em {url}: {sum(volumes.values())} linhas em {len(volumes)} tabelas")
+    print(f"Usuários recepcao<id> e admin, senha '{SENHA}'")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        servidor.shutdown()
+
+if __name__ == '__main__':
+    main()
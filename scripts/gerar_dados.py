@@ -0,0 +1,452 @@
+#!/usr/bin/env python3
+"""
+Gerador de dados sintéticos no formato das migrations
+Execute: python scripts/gerar_dados.py csv dados/ --escala 100 --anos 5
+         python scripts/gerar_dados.py supabase --escala 10 --tabelas anamneses orcamentos
+
+Gera linhas válidas para as 15 tabelas de supabase/migrations (NOT NULL,
+CHECKs e chaves estrangeiras respeitados), concentradas nas recepções que
+usam cada módulo (103, 108, 808, 1002, ...) e espalhadas por --anos de
+histórico até --ate, com mais registros nos meses recentes.
+
+- Determinístico: a mesma --seed e --ate geram os mesmos dados (menos o
+  salt do password_hash, igual para todos os usuários gerados), e cada
+  tabela tem seu próprio sorteio (gerar uma tabela não muda as outras).
+- Streaming: as linhas saem de geradores, memória constante para milhões
+  de linhas por tabela.
+
+Saídas:
+    csv       um <tabela>.csv por tabela (--gzip para .csv.gz) e carregar.sql
+              com \\copy e setval das sequências, para um banco vazio:
+              cd dados && psql "$DATABASE_URL" -f carregar.sql
+    supabase  inserts em lotes (insert_many) no SUPABASE_URL configurado; os
+              ids vêm das sequências e as referências apontam para os ids
+              existentes das tabelas pai
+
+anamneses também leva as colunas que a API grava e as migrations não
+declaram (nome_pais, nome_paciente, motivo_consulta, ...); --so-migrations as omite.
+"""
+
+import argparse
+import bisect
+import csv
+import gzip
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, datetime, timedelta
+from itertools import accumulate, islice
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SENHA = '123456'
+
+ADMINS = ('admpodd', 'admpdg', 'admaba')
+# Peso de cada recepção nas tabelas compartilhadas
+RECEPCOES = {'103': 0.3, '108': 0.25, '808': 0.2, '1002': 0.15, '203': 0.04, '1009': 0.03, '1108': 0.03}
+# Recepções que lançam orçamentos (blueprints/orcamentos.py)
+RECEPCOES_ORCAMENTO = ('103', '808', '108', '203', '1009', '1108')
+
+# Colunas de cada tabela, na ordem das migrations (a primeira cria quase
+# todas; log_atividades vem da terceira, senha_versao do rehash e
+# data_anamnese/status de estatisticas_anamneses)
+COLUNAS = {
+    'usuarios': ('id', 'username', 'email', 'password_hash', 'role', 'recepcao_id', 'recepcao_nome', 'ativo',
+                 'created_at', 'updated_at', 'senha_versao'),
+    'salas': ('id', 'nome', 'capacidade', 'recepcao_id', 'recepcao_nome', 'status', 'ocupado_por', 'ocupado_ate',
+              'created_at', 'created_by', 'updated_at', 'updated_by'),
+    'estoque': ('id', 'nome', 'quantidade', 'unidade', 'descricao', 'recepcao_id', 'created_at', 'created_by',
+                'updated_at'),
+    'estoque_brindes': ('id', 'nome', 'quantidade', 'descricao', 'created_at', 'updated_at'),
+    'reservas': ('id', 'sala_id', 'usuario_id', 'usuario_nome', 'recepcao_id', 'data_inicio', 'data_fim',
+                 'observacoes', 'status', 'created_at'),
+    'orcamentos': ('id', 'nome_pais', 'nome_paciente', 'terapias_solicitadas', 'valor', 'observacoes', 'status',
+                   'recepcao_id', 'recepcao_nome', 'data_alerta', 'alerta_enviado', 'feedback', 'data_feedback',
+                   'feedback_by', 'created_at', 'created_by'),
+    'retiradas_estoque': ('id', 'item_id', 'item_nome', 'quantidade', 'retirado_por', 'observacoes', 'recepcao_id',
+                          'created_at', 'created_by'),
+    'brindes': ('id', 'item_nome', 'quantidade', 'data_evento', 'observacoes', 'recepcao_id', 'recepcao_nome',
+                'status', 'created_at', 'created_by'),
+    'distribuicao_brindes': ('id', 'item_id', 'item_nome', 'quantidade', 'recepcao_origem', 'recepcao_destino',
+                             'observacoes', 'created_at', 'created_by'),
+    'brindes_visitantes': ('id', 'visitante_nome', 'item_nome', 'quantidade', 'observacoes', 'recepcao_id',
+                           'created_at', 'created_by'),
+    'lista_espera': ('id', 'especialidade', 'solicitante', 'terapeuta_preferencia', 'data_solicitacao',
+                     'observacoes', 'status', 'created_at', 'created_by', 'updated_at', 'updated_by'),
+    'visitas_externas': ('id', 'visitante_nome', 'empresa', 'data_visita', 'hora_entrada', 'hora_saida',
+                         'tipo_visita', 'agendamento', 'observacoes', 'recepcao_id', 'created_at', 'created_by'),
+    'entrada_saida_pacientes': ('id', 'paciente_nome', 'responsavel', 'hora_entrada', 'hora_saida',
+                                'tipo_atendimento', 'profissional', 'observacoes', 'observacoes_saida', 'status',
+                                'recepcao_id', 'data_registro', 'created_at', 'created_by', 'updated_at',
+                                'updated_by'),
+    'anamneses': ('id', 'paciente_nome', 'responsavel', 'quantidade', 'tipo_anamnese', 'profissional',
+                  'observacoes', 'recepcao_id', 'data_registro', 'created_at', 'created_by', 'data_anamnese',
+                  'status'),
+    'log_atividades': ('id', 'usuario_id', 'usuario_nome', 'acao', 'tabela_afetada', 'registro_id', 'detalhes',
+                       'ip_address', 'user_agent', 'created_at'),
+}
+
+# Colunas que blueprints/anamnese.py grava e as migrations não declaram
+COLUNAS_API = {
+    'anamneses': ('nome_pais', 'nome_paciente', 'idade_paciente', 'motivo_consulta', 'contato_responsavel',
+                  'recepcao_nome', 'updated_at', 'updated_by'),
+}
+
+# Tabela pai de cada chave estrangeira; COLUNAS já está em ordem de carga
+REFERENCIAS = {
+    'reservas': {'sala_id': 'salas', 'usuario_id': 'usuarios'},
+    'retiradas_estoque': {'item_id': 'estoque'},
+    'distribuicao_brindes': {'item_id': 'estoque_brindes'},
+    'log_atividades': {'usuario_id': 'usuarios'},
+}
+
+# Linhas por tabela com --escala 1 (--escala 100 passa de um milhão em várias)
+VOLUMES = {
+    'usuarios': len(ADMINS) + len(RECEPCOES),
+    'salas': 60,
+    'estoque': 200,
+    'estoque_brindes': 80,
+    'reservas': 3000,
+    'orcamentos': 8000,
+    'retiradas_estoque': 5000,
+    'brindes': 600,
+    'distribuicao_brindes': 1500,
+    'brindes_visitantes': 2000,
+    'lista_espera': 1500,
+    'visitas_externas': 6000,
+    'entrada_saida_pacientes': 20000,
+    'anamneses': 5000,
+    'log_atividades': 20000,
+}
+
+# Tabelas de cadastro não crescem com o histórico
+FIXAS = ('usuarios', 'salas', 'estoque', 'estoque_brindes')
+
+NOMES = ('Ana', 'Bruno', 'Carla', 'Diego', 'Elisa', 'Felipe', 'Gabriela', 'Heitor', 'Isabela', 'João',
+         'Larissa', 'Marcos', 'Natália', 'Otávio', 'Paula', 'Rafael', 'Sofia', 'Tiago', 'Vitória', 'Yuri')
+SOBRENOMES = ('Silva', 'Santos', 'Oliveira', 'Souza', 'Lima', 'Pereira', 'Costa', 'Almeida', 'Ribeiro', 'Gomes')
+NOMES_COMPLETOS = tuple(f'{n} {s1} {s2}' for n in NOMES for s1 in SOBRENOMES for s2 in SOBRENOMES)
+PROFISSIONAIS = ('Dra. Marina', 'Dr. Paulo', 'Dra. Renata', 'Dr. Caio', 'Dra. Lívia', 'Dr. André')
+TERAPIAS = ('Fonoaudiologia', 'Psicologia', 'Terapia Ocupacional', 'Fisioterapia', 'Psicopedagogia', 'ABA')
+MATERIAIS = ('Papel A4', 'Caneta azul', 'Copo descartável', 'Álcool 70%', 'Lenço de papel', 'Grampeador',
+             'Envelope', 'Fita adesiva', 'Sabonete líquido', 'Papel toalha')
+BRINDES = ('Caneca', 'Chaveiro', 'Caderno', 'Squeeze', 'Ecobag', 'Boné', 'Agenda', 'Lápis de cor')
+ACOES = ('login', 'criar', 'atualizar', 'remover', 'trocar_senha')
+NAVEGADORES = ('Mozilla/5.0 (Windows NT 10.0; Win64; x64) Chrome/126.0',
+               'Mozilla/5.0 (Macintosh; Intel Mac OS X 14_5) Safari/605.1.15',
+               'Mozilla/5.0 (Linux; Android 14) Chrome/126.0 Mobile')
+
+def _hash_senha():
+    # Um hash só, dentro da política atual, para todos os usuários gerados
+    from utils.senhas import gerar_hash
+    return gerar_hash(SENHA)
+
+class Sorteio:
+    """random.Random com os atalhos usados pelos geradores"""
+
+    def __init__(self, semente, inicio, fim):
+        self.r = random.Random(semente)
+        self.inicio = inicio
+        self.segundos = (fim - inicio).total_seconds()
+        self._recepcoes = {}
+
+    def nome(self):
+        return self.r.choice(NOMES_COMPLETOS)
+
+    def recepcao(self, entre=tuple(RECEPCOES)):
+        # Escolha ponderada por RECEPCOES entre as recepções indicadas
+        if entre not in self._recepcoes:
+            self._recepcoes[entre] = (entre, list(accumulate(RECEPCOES[r] for r in entre)))
+        opcoes, acumulado = self._recepcoes[entre]
+        return opcoes[bisect.bisect(acumulado, self.r.random() * acumulado[-1])]
+
+    def momento(self, i, n):
+        """Instante da i-ésima de n linhas: cresce com i, mais denso perto do fim"""
+        fracao = min(1.0, (i + self.r.random()) / n) ** 0.7
+        instante = self.inicio + timedelta(seconds=fracao * self.segundos)
+        # Horário comercial
+        return instante.replace(hour=7 + instante.hour % 12)
+
+    def hora(self, minima=7, maxima=18):
+        return f'{self.r.randint(minima, maxima):02d}:{self.r.choice((0, 15, 30, 45)):02d}:00'
+
+    def referencia(self, faixa):
+        return self.r.randint(*faixa) if faixa else None
+
+def _texto(valor):
+    return valor.isoformat(timespec='seconds') if isinstance(valor, datetime) else valor.isoformat()
+
+def _linha(tabela, s, i, n, refs, hash_senha):
+    """Valores de uma linha (todas as colunas conhecidas, inclusive COLUNAS_API)"""
+    r = s.r
+    criado = s.momento(i, n)
+    em = _texto(criado)
+
+    if tabela == 'usuarios':
+        if i < len(ADMINS):
+            username, role, recepcao = ADMINS[i], 'admin', None
+        elif i < VOLUMES['usuarios']:
+            recepcao = list(RECEPCOES)[i - len(ADMINS)]
+            username, role = f'recepcao{recepcao}', 'recepcao'
+        else:
+            recepcao = s.recepcao()
+            username, role = f'usuario{i}', 'recepcao'
+        return {'username': username, 'email': f'{username}@incentivar.com', 'password_hash': hash_senha,
+                'role': role, 'recepcao_id': recepcao, 'recepcao_nome': f'Recepção {recepcao}' if recepcao else None,
+                'ativo': True, 'created_at': em, 'updated_at': em, 'senha_versao': 1}
+
+    if tabela == 'salas':
+        recepcao = s.recepcao()
+        status = r.choice(('disponivel', 'disponivel', 'ocupada', 'reservada'))
+        return {'nome': f'Sala {i + 1}', 'capacidade': r.randint(1, 12), 'recepcao_id': recepcao,
+                'recepcao_nome': f'Recepção {recepcao}', 'status': status,
+                'ocupado_por': s.nome() if status == 'ocupada' else None,
+                'ocupado_ate': _texto(criado + timedelta(hours=1)) if status == 'ocupada' else None,
+                'created_at': em, 'created_by': f'recepcao{recepcao}', 'updated_at': em,
+                'updated_by': f'recepcao{recepcao}'}
+
+    if tabela == 'estoque':
+        return {'nome': f'{r.choice(MATERIAIS)} {i + 1}', 'quantidade': r.randint(0, 500),
+                'unidade': r.choice(('un', 'cx', 'pct')), 'descricao': None, 'recepcao_id': '103',
+                'created_at': em, 'created_by': 'recepcao103', 'updated_at': em}
+
+    if tabela == 'estoque_brindes':
+        return {'nome': f'{r.choice(BRINDES)} {i + 1}', 'quantidade': r.randint(0, 1000), 'descricao': None,
+                'created_at': em, 'updated_at': em}
+
+    if tabela == 'reservas':
+        inicio = criado + timedelta(days=r.randint(0, 14))
+        recepcao = s.recepcao()
+        return {'sala_id': s.referencia(refs.get('salas')), 'usuario_id': s.referencia(refs.get('usuarios')),
+                'usuario_nome': s.nome(), 'recepcao_id': recepcao, 'data_inicio': _texto(inicio),
+                'data_fim': _texto(inicio + timedelta(minutes=r.choice((30, 45, 60, 90)))), 'observacoes': None,
+                'status': r.choice(('ativa', 'finalizada', 'finalizada', 'cancelada')), 'created_at': em}
+
+    if tabela == 'orcamentos':
+        recepcao = s.recepcao(RECEPCOES_ORCAMENTO)
+        status = r.choice(('pendente', 'respondido', 'aprovado', 'rejeitado'))
+        respondido = status != 'pendente'
+        return {'nome_pais': s.nome(), 'nome_paciente': s.nome(),
+                'terapias_solicitadas': ', '.join(r.sample(TERAPIAS, r.randint(1, 3))),
+                'valor': round(r.uniform(150, 4000), 2), 'observacoes': None, 'status': status,
+                'recepcao_id': recepcao, 'recepcao_nome': f'Recepção {recepcao}',
+                'data_alerta': _texto(criado + timedelta(hours=24)), 'alerta_enviado': respondido or r.random() < 0.5,
+                'feedback': r.choice(('Família vai pensar', 'Aguardando convênio', 'Fechado')) if respondido else None,
+                'data_feedback': _texto(criado + timedelta(days=r.randint(1, 10))) if respondido else None,
+                'feedback_by': f'recepcao{recepcao}' if respondido else None,
+                'created_at': em, 'created_by': f'recepcao{recepcao}'}
+
+    if tabela == 'retiradas_estoque':
+        return {'item_id': s.referencia(refs.get('estoque')), 'item_nome': r.choice(MATERIAIS),
+                'quantidade': r.randint(1, 10), 'retirado_por': s.nome(), 'observacoes': None,
+                'recepcao_id': '103', 'created_at': em, 'created_by': 'recepcao103'}
+
+    if tabela == 'brindes':
+        recepcao = s.recepcao()
+        return {'item_nome': r.choice(BRINDES), 'quantidade': r.randint(1, 50),
+                'data_evento': _texto(criado.date() + timedelta(days=r.randint(0, 30))), 'observacoes': None,
+                'recepcao_id': recepcao, 'recepcao_nome': f'Recepção {recepcao}',
+                'status': r.choice(('pendente', 'aprovado', 'entregue', 'entregue')), 'created_at': em,
+                'created_by': f'recepcao{recepcao}'}
+
+    if tabela == 'distribuicao_brindes':
+        return {'item_id': s.referencia(refs.get('estoque_brindes')), 'item_nome': r.choice(BRINDES),
+                'quantidade': r.randint(1, 30), 'recepcao_origem': '1002',
+                'recepcao_destino': s.recepcao(('103', '108', '808', '203', '1009', '1108')), 'observacoes': None,
+                'created_at': em, 'created_by': 'recepcao1002'}
+
+    if tabela == 'brindes_visitantes':
+        return {'visitante_nome': s.nome(), 'item_nome': r.choice(BRINDES), 'quantidade': 1, 'observacoes': None,
+                'recepcao_id': '108', 'created_at': em, 'created_by': 'recepcao108'}
+
+    if tabela == 'lista_espera':
+        status = 'aguardando' if criado > s.inicio + timedelta(seconds=s.segundos * 0.9) else r.choice(
+            ('atendido', 'atendido', 'cancelado'))
+        return {'especialidade': r.choice(TERAPIAS), 'solicitante': s.nome(),
+                'terapeuta_preferencia': r.choice(PROFISSIONAIS + (None,)), 'data_solicitacao': _texto(criado.date()),
+                'observacoes': None, 'status': status, 'created_at': em, 'created_by': 'recepcao1002',
+                'updated_at': em, 'updated_by': 'recepcao1002'}
+
+    if tabela == 'visitas_externas':
+        return {'visitante_nome': s.nome(), 'empresa': r.choice(('Escola', 'Convênio', 'Fornecedor', None)),
+                'data_visita': _texto(criado.date()), 'hora_entrada': s.hora(7, 12), 'hora_saida': s.hora(13, 18),
+                'tipo_visita': r.choice(('reuniao', 'visita', 'entrega')), 'agendamento': r.random() < 0.5,
+                'observacoes': None, 'recepcao_id': '108', 'created_at': em, 'created_by': 'recepcao108'}
+
+    if tabela == 'entrada_saida_pacientes':
+        finalizado = i < n - 20 or r.random() < 0.5
+        return {'paciente_nome': s.nome(), 'responsavel': s.nome(), 'hora_entrada': s.hora(7, 12),
+                'hora_saida': s.hora(13, 18) if finalizado else None, 'tipo_atendimento': r.choice(TERAPIAS),
+                'profissional': r.choice(PROFISSIONAIS), 'observacoes': None, 'observacoes_saida': None,
+                'status': 'finalizado' if finalizado else 'presente', 'recepcao_id': '108',
+                'data_registro': _texto(criado.date()), 'created_at': em, 'created_by': 'recepcao108',
+                'updated_at': em, 'updated_by': 'recepcao108'}
+
+    if tabela == 'anamneses':
+        recepcao = '808' if r.random() < 0.8 else '108'
+        paciente = s.nome()
+        return {'paciente_nome': paciente, 'responsavel': s.nome(), 'quantidade': 1,
+                'tipo_anamnese': r.choice(('Inicial', 'Inicial', 'Retorno', 'Reavaliação')),
+                'profissional': r.choice(PROFISSIONAIS), 'observacoes': None, 'recepcao_id': recepcao,
+                'data_registro': _texto(criado.date()), 'created_at': em, 'created_by': f'recepcao{recepcao}',
+                'nome_pais': s.nome(), 'nome_paciente': paciente, 'data_anamnese': _texto(criado.date()),
+                'idade_paciente': str(r.randint(2, 17)), 'motivo_consulta': r.choice(TERAPIAS),
+                'contato_responsavel': f'(11) 9{r.randint(1000, 9999)}-{r.randint(1000, 9999)}',
+                'recepcao_nome': f'Recepção {recepcao}',
+                'status': r.choice(('agendada', 'realizada', 'realizada', 'cancelada')),
+                'updated_at': em, 'updated_by': f'recepcao{recepcao}'}
+
+    if tabela == 'log_atividades':
+        afetada = r.choice(tuple(COLUNAS))
+        return {'usuario_id': s.referencia(refs.get('usuarios')), 'usuario_nome': f'recepcao{s.recepcao()}',
+                'acao': r.choice(ACOES), 'tabela_afetada': afetada, 'registro_id': r.randint(1, 100000),
+                'detalhes': {'origem': 'api', 'tabela': afetada}, 'ip_address': f'10.0.{r.randint(0, 255)}.{r.randint(1, 254)}',
+                'user_agent': r.choice(NAVEGADORES), 'created_at': em}
+
+    raise ValueError(f'Tabela sem gerador: {tabela}')
+
+def colunas(tabela, colunas_api=True, com_id=True):
+    nomes = COLUNAS[tabela] + (COLUNAS_API.get(tabela, ()) if colunas_api else ())
+    return nomes if com_id else tuple(c for c in nomes if c != 'id')
+
+def gerar(tabela, quantidade, seed=42, ate=None, anos=3, refs=None, com_id=True, colunas_api=True, hash_senha=None):
+    """
+    Gera `quantidade` linhas (dicts) de `tabela`, em ordem de created_at.
+
+    refs: {tabela pai: (primeiro id, último id)} para as chaves estrangeiras;
+    por padrão 1..VOLUMES da tabela pai. Com com_id os ids vão de 1 a quantidade.
+    """
+    fim = datetime.combine(ate or date.today(), datetime.min.time()) + timedelta(days=1)
+    s = Sorteio(f'{seed}:{tabela}', fim - timedelta(days=int(365 * anos)), fim)
+    if refs is None:
+        refs = {pai: (1, VOLUMES[pai]) for pai in REFERENCIAS.get(tabela, {}).values()}
+    if tabela == 'usuarios' and hash_senha is None:
+        hash_senha = _hash_senha()
+    nomes = colunas(tabela, colunas_api, com_id)
+    for i in range(quantidade):
+        linha = _linha(tabela, s, i, quantidade, refs, hash_senha)
+        linha['id'] = i + 1
+        yield {c: linha[c] for c in nomes}
+
+def volumes(escala=1, linhas=None, tabelas=None):
+    """Linhas por tabela: VOLUMES * escala (tabelas de cadastro crescem mais devagar)"""
+    resultado = {}
+    for tabela, base in VOLUMES.items():
+        if tabelas and tabela not in tabelas:
+            continue
+        if tabela in FIXAS:
+            resultado[tabela] = max(base, int(base * escala ** 0.5))
+        else:
+            resultado[tabela] = max(1, int(base * escala))
+    resultado.update(linhas or {})
+    return resultado
+
+def _csv(valor):
+    if valor is None:
+        return None
+    if isinstance(valor, bool):
+        return 'true' if valor else 'false'
+    if isinstance(valor, dict):
+        return json.dumps(valor, ensure_ascii=False)
+    return valor
+
+def escrever_csv(pasta, quantidades, seed=42, ate=None, anos=3, colunas_api=True, comprimir=False):
+    """Um CSV por tabela (NULL = campo vazio) e carregar.sql com \\copy e setval"""
+    os.makedirs(pasta, exist_ok=True)
+    refs = {pai: (1, quantidades.get(pai, VOLUMES[pai])) for pai in VOLUMES}
+    comandos = ['\\set ON_ERROR_STOP on', 'BEGIN;']
+    for tabela, quantidade in quantidades.items():
+        nomes = colunas(tabela, colunas_api)
+        arquivo = f'{tabela}.csv.gz' if comprimir else f'{tabela}.csv'
+        abrir = gzip.open if comprimir else open
+        inicio = time.perf_counter()
+        with abrir(os.path.join(pasta, arquivo), 'wt', encoding='utf-8', newline='') as saida:
+            escritor = csv.writer(saida)
+            escritor.writerow(nomes)
+            for linha in gerar(tabela, quantidade, seed, ate, anos, refs, colunas_api=colunas_api):
+                escritor.writerow([_csv(linha[c]) for c in nomes])
+        _progresso(tabela, quantidade, inicio)
+
+        origem = f"PROGRAM 'gzip -dc {arquivo}'" if comprimir else f"'{arquivo}'"
+        comandos.append(f"\\copy public.{tabela} ({', '.join(nomes)}) FROM {origem} WITH (FORMAT csv, HEADER true)")
+        comandos.append(f"SELECT setval(pg_get_serial_sequence('public.{tabela}', 'id'), "
+                        f"(SELECT max(id) FROM public.{tabela}));")
+    comandos.append('COMMIT;')
+    with open(os.path.join(pasta, 'carregar.sql'), 'w', encoding='utf-8') as saida:
+        saida.write('\n'.join(comandos) + '\n')
+
+def _faixa_ids(supabase, tabela):
+    primeiro = supabase.table(tabela).select('id').order('id').limit(1).execute().data
+    ultimo = supabase.table(tabela).select('id').order('id', desc=True).limit(1).execute().data
+    return (primeiro[0]['id'], ultimo[0]['id']) if primeiro else None
+
+def inserir_supabase(quantidades, seed=42, ate=None, anos=3, colunas_api=True, lote=1000):
+    """Insere em lotes pelo PostgREST; ids vêm das sequências do banco"""
+    from database import get_supabase
+
+    supabase = get_supabase()
+    hash_senha = _hash_senha()
+    faixas = {}
+    for tabela, quantidade in quantidades.items():
+        refs = {}
+        for pai in REFERENCIAS.get(tabela, {}).values():
+            if pai not in faixas:
+                faixas[pai] = _faixa_ids(supabase, pai)
+            refs[pai] = faixas[pai]
+
+        inicio = time.perf_counter()
+        linhas = gerar(tabela, quantidade, seed, ate, anos, refs, com_id=False, colunas_api=colunas_api,
+                       hash_senha=hash_senha)
+        while True:
+            bloco = list(islice(linhas, lote))
+            if not bloco:
+                break
+            if tabela == 'usuarios':
+                # Usuários já cadastrados (admins e recepcao<id>) ficam como estão
+                supabase.table(tabela).upsert_many(bloco, on_conflict='username', chunk_size=lote,
+                                                   ignore_duplicates=True)
+            else:
+                supabase.table(tabela).insert_many(bloco, chunk_size=lote)
+        faixas.pop(tabela, None)
+        _progresso(tabela, quantidade, inicio)
+
+def _progresso(tabela, quantidade, inicio):
+    segundos = time.perf_counter() - inicio
+    print(f'{tabela:<24} {quantidade:>10} linhas  {segundos:6.1f} s  ({quantidade / max(segundos, 1e-9):,.0f}/s)')
+
+def _linhas_por_tabela(itens):
+    linhas = {}
+    for item in itens or []:
+        tabela, quantidade = item.split('=', 1)
+        if tabela not in COLUNAS:
+            raise SystemExit(f'Tabela desconhecida: {tabela}')
+        linhas[tabela] = int(quantidade)
+    return linhas
+
+def main():
+    parser = argparse.ArgumentParser(description='Dados sintéticos no formato das migrations')
+    parser.add_argument('saida', choices=('csv', 'supabase'))
+    parser.add_argument('pasta', nargs='?', default='dados', help='pasta dos CSV (saída csv)')
+    parser.add_argument('--escala', type=float, default=1, help='multiplica VOLUMES')
+    parser.add_argument('--linhas', nargs='+', metavar='TABELA=N', help='quantidade exata por tabela')
+    parser.add_argument('--tabelas', nargs='+', choices=tuple(COLUNAS), help='só estas tabelas')
+    parser.add_argument('--anos', type=float, default=3, help='anos de histórico')
+    parser.add_argument('--ate', type=date.fromisoformat, default=date.today(), help='último dia (YYYY-MM-DD)')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--so-migrations', action='store_true', help='sem as colunas extras de anamneses')
+    parser.add_argument('--gzip', action='store_true', help='CSV comprimidos')
+    parser.add_argument('--lote', type=int, default=1000, help='linhas por insert (saída supabase)')
+    args = parser.parse_args()
+
+    quantidades = volumes(args.escala, _linhas_por_tabela(args.linhas), args.tabelas)
+    print(f'{sum(quantidades.values()):,} linhas em {len(quantidades)} tabelas, '
+          f'{args.anos:g} anos até {args.ate}, seed {args.seed}')
+    if args.saida == 'csv':
+        escrever_csv(args.pasta, quantidades, args.seed, args.ate, args.anos, not args.so_migrations, args.gzip)
+        print(f'Carregar: cd {args.pasta} && psql "$DATABASE_URL" -f carregar.sql')
+    else:
+        inserir_supabase(quantidades, args.seed, args.ate, args.anos, not args.so_migrations, args.lote)
+
+if __name__ == '__main__':
+    main()
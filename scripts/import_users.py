@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Importação de usuários em massa
+Execute: python scripts/import_users.py usuarios.csv [--atualizar] [--workers N]
+
+O arquivo pode ser CSV (com cabeçalho) ou JSON (lista de objetos) com as
+colunas username, email, password, role, recepcao_id e recepcao_nome.
+Os hashes são gerados em paralelo (um processo por núcleo) e os usuários
+vão para o banco em lotes via upsert com on_conflict=username.
+"""
+
+import argparse
+import csv
+import json
+import os
+import sys
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from database import get_supabase
+from utils.hashing import Vazao, gerar_hashes, usuarios_existentes
+
+CAMPOS = ('username', 'email', 'role', 'recepcao_id', 'recepcao_nome')
+
+def ler_arquivo(caminho):
+    with open(caminho, encoding='utf-8') as arquivo:
+        if caminho.endswith('.json'):
+            return json.load(arquivo)
+        return list(csv.DictReader(arquivo))
+
+def importar_usuarios(usuarios, atualizar=False, workers=None, chunk_size=500, vazao=None):
+    """
+    Cria os usuários que ainda não existem; com atualizar=True também
+    sobrescreve os existentes (inclusive a senha).
+    Devolve (criados_ou_atualizados, ignorados).
+    """
+    supabase = get_supabase()
+    usuarios = [u for u in usuarios if u.get('username')]
+
+    if not atualizar:
+        existentes = {row['username'] for row in usuarios_existentes(supabase, [u['username'] for u in usuarios])}
+        ignorados = [u for u in usuarios if u['username'] in existentes]
+        usuarios = [u for u in usuarios if u['username'] not in existentes]
+    else:
+        ignorados = []
+
+    hashes = gerar_hashes(((u['username'], u['password']) for u in usuarios), workers, vazao)
+
+    linhas = []
+    for user_data, (_, password_hash) in zip(usuarios, hashes):
+        linha = {campo: user_data.get(campo) or None for campo in CAMPOS}
+        linha['password_hash'] = password_hash
+        linha['ativo'] = True
+        linhas.append(linha)
+
+    if linhas:
+        supabase.table('usuarios').upsert_many(
+            linhas, on_conflict='username', chunk_size=chunk_size, ignore_duplicates=not atualizar
+        )
+    return usuarios, ignorados
+
+def main():
+    parser = argparse.ArgumentParser(description='Importa usuários em massa')
+    parser.add_argument('arquivo', help='CSV ou JSON com os usuários')
+    parser.add_argument('--atualizar', action='store_true', help='sobrescreve usuários existentes')
+    parser.add_argument('--workers', type=int, default=None, help='processos para gerar os hashes')
+    parser.add_argument('--chunk-size', type=int, default=500, help='usuários por requisição')
+    args = parser.parse_args()
+
+    usuarios = ler_arquivo(args.arquivo)
+    print(f"Importando {len(usuarios)} usuários...")
+
+    vazao = Vazao()
+    importados, ignorados = importar_usuarios(
+        usuarios, atualizar=args.atualizar, workers=args.workers, chunk_size=args.chunk_size, vazao=vazao
+    )
+
+    print(f"✓ {len(importados)} importados, {len(ignorados)} já existiam")
+    print(vazao.relatorio())
+
+if __name__ == '__main__':
+    main()
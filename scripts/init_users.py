@@ -8,7 +8,7 @@ import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from models.user import User
+from scripts.import_users import importar_usuarios
 
 def init_users():
     users_data = [
@@ -29,31 +29,14 @@ def init_users():
     
     print("Inicializando usuários...")
     
-    for user_data in users_data:
-        try:
-            # Verificar se usuário já existe
-            existing_user = User.find_by_username(user_data['username'])
-            if existing_user:
-                print(f"✓ Usuário {user_data['username']} já existe")
-                continue
-            
-            # Criar usuário
-            user = User.create_user(
-                username=user_data['username'],
-                email=user_data['email'],
-                password=user_data['password'],
-                role=user_data['role'],
-                recepcao_id=user_data.get('recepcao_id'),
-                recepcao_nome=user_data.get('recepcao_nome')
-            )
-            
-            if user:
-                print(f"✓ Usuário {user_data['username']} criado com sucesso")
-            else:
-                print(f"✗ Erro ao criar usuário {user_data['username']}")
-                
-        except Exception as e:
-            print(f"✗ Erro ao criar usuário {user_data['username']}: {str(e)}")
+    try:
+        criados, existentes = importar_usuarios(users_data)
+        for user_data in existentes:
+            print(f"✓ Usuário {user_data['username']} já existe")
+        for user_data in criados:
+            print(f"✓ Usuário {user_data['username']} criado com sucesso")
+    except Exception as e:
+        print(f"✗ Erro ao criar usuários: {str(e)}")
     
     print("\nInicialização concluída!")
     print("\nCredenciais de acesso:")
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Teste de carga simples (só biblioteca padrão)
+Execute: python scripts/load_test.py http://localhost:8000 /api/salas/ --token <JWT> -c 32 -d 20
+
+Abre -c conexões concorrentes por -d segundos, alternando entre os caminhos
+informados, e mostra requisições/s, erros e latência p50/p95/p99.
+
+Usado também por scripts/benchmark.py, que passa entradas
+(metodo, caminho, corpo) para medir escritas.
+"""
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from urllib.parse import urlsplit
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+def _preparar(entrada):
+    """'caminho' vira GET sem corpo; (metodo, caminho, corpo) manda corpo JSON"""
+    if isinstance(entrada, str):
+        return 'GET', entrada, None
+    metodo, caminho, corpo = entrada
+    return metodo, caminho, json.dumps(corpo).encode() if corpo is not None else None
+
+def _cliente(base, caminhos, headers, fim, latencias, erros, lock):
+    url = urlsplit(base)
+    requisicoes = [_preparar(entrada) for entrada in caminhos]
+    headers_json = dict(headers, **{'Content-Type': 'application/json'})
+    conexao_cls = http.client.HTTPSConnection if url.scheme == 'https' else http.client.HTTPConnection
+    conexao = conexao_cls(url.netloc, timeout=30)
+    locais, falhas, i = [], 0, 0
+    while time.perf_counter() < fim:
+        metodo, caminho, corpo = requisicoes[i % len(requisicoes)]
+        i += 1
+        inicio = time.perf_counter()
+        try:
+            conexao.request(metodo, caminho, body=corpo, headers=headers_json if corpo is not None else headers)
+            resposta = conexao.getresponse()
+            resposta.read()
+            if resposta.status >= 400:
+                falhas += 1
+        except (OSError, http.client.HTTPException):
+            falhas += 1
+            conexao.close()
+            conexao = conexao_cls(url.netloc, timeout=30)
+        locais.append(time.perf_counter() - inicio)
+    conexao.close()
+    with lock:
+        latencias.extend(locais)
+        erros.append(falhas)
+
+def executar(base, caminhos, token=None, concorrencia=16, duracao=10):
+    headers = {'Authorization': f'Bearer {token}'} if token else {}
+    latencias, erros, lock = [], [], threading.Lock()
+    inicio = time.perf_counter()
+    fim = inicio + duracao
+    threads = [
+        threading.Thread(target=_cliente, args=(base, caminhos, headers, fim, latencias, erros, lock))
+        for _ in range(concorrencia)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = time.perf_counter() - inicio
+
+    latencias.sort()
+    return {
+        'requisicoes': len(latencias),
+        'erros': sum(erros),
+        'req_s': len(latencias) / total,
+        'p50': _percentil(latencias, 0.50),
+        'p95': _percentil(latencias, 0.95),
+        'p99': _percentil(latencias, 0.99)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Teste de carga da API')
+    parser.add_argument('base', help='URL base, ex.: http://localhost:8000')
+    parser.add_argument('caminhos', nargs='+', help='caminhos GET, ex.: /api/salas/')
+    parser.add_argument('--token', help='JWT para o header Authorization')
+    parser.add_argument('-c', '--concorrencia', type=int, default=16)
+    parser.add_argument('-d', '--duracao', type=float, default=10)
+    args = parser.parse_args()
+
+    r = executar(args.base, args.caminhos, args.token, args.concorrencia, args.duracao)
+    print(f"{r['requisicoes']} requisições, {r['erros']} erros")
+    print(f"{r['req_s']:.1f} req/s | p50 {r['p50'] * 1000:.0f} ms | "
+          f"p95 {r['p95'] * 1000:.0f} ms | p99 {r['p99'] * 1000:.0f} ms")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,23 @@
+// Rotas de listagem da API devolvem uma página por vez e um next_cursor
+// (utils/pagination.py); a próxima página só é pedida no "Carregar mais"
+
+export interface Pagina<T> {
+  itens: T[]
+  nextCursor: string | null
+}
+
+export async function buscarPagina<T>(
+  url: string,
+  chave: string,
+  token: string | null,
+  cursor?: string | null
+): Promise<Pagina<T> | null> {
+  const endereco = cursor ? `${url}?${new URLSearchParams({ cursor })}` : url
+  const response = await fetch(endereco, {
+    headers: { 'Authorization': `Bearer ${token}` }
+  })
+  if (!response.ok) return null
+
+  const data = await response.json()
+  return { itens: data[chave], nextCursor: data.next_cursor }
+}
@@ -8,6 +8,7 @@ import { Badge } from '../components/ui/badge'
 import { toast } from 'sonner'
 import { Gift, Plus, ArrowLeft, User, Calendar, Package, Send, Truck } from 'lucide-react'
 import { Link } from 'react-router-dom'
+import { buscarPagina } from '../lib/paginacao'
 // import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '../components/ui/select'
 import { Select, SelectContent, SelectItem, SelectTrigger, SelectValue } from '@radix-ui/react-select'
 
@@ -42,6 +43,7 @@ interface Distribuicao {
 const BrindesPage = () => {
   const { user } = useAuth()
   const [brindes, setBrindes] = useState<Brinde[]>([])
+  const [brindesCursor, setBrindesCursor] = useState<string | null>(null)
   const [estoque, setEstoque] = useState<EstoqueBrinde[]>([])
   const [distribuicoes, setDistribuicoes] = useState<Distribuicao[]>([])
   const [loading, setLoading] = useState(true)
@@ -97,12 +99,10 @@ const BrindesPage = () => {
       
       // Buscar brindes/entregas
       if (activeTab === 'entregas') {
-        const response = await fetch('/api/brindes/', {
-          headers: { 'Authorization': `Bearer ${token}` }
-        })
-        if (response.ok) {
-          const data = await response.json()
-          setBrindes(data.brindes)
+        const pagina = await buscarPagina<Brinde>('/api/brindes/', 'brindes', token)
+        if (pagina) {
+          setBrindes(pagina.itens)
+          setBrindesCursor(pagina.nextCursor)
         }
       }
 
@@ -135,6 +135,19 @@ const BrindesPage = () => {
     }
   }
 
+  const carregarMaisBrindes = async () => {
+    try {
+      const token = localStorage.getItem('token')
+      const pagina = await buscarPagina<Brinde>('/api/brindes/', 'brindes', token, brindesCursor)
+      if (pagina) {
+        setBrindes((atuais) => [...atuais, ...pagina.itens])
+        setBrindesCursor(pagina.nextCursor)
+      }
+    } catch (error) {
+      toast.error('Erro ao carregar brindes')
+    }
+  }
+
   const handleSubmitEntrega = async (e: React.FormEvent) => {
     e.preventDefault()
     
@@ -619,6 +632,14 @@ const BrindesPage = () => {
           </div>
         )}
 
+        {activeTab === 'entregas' && brindesCursor && (
+          <div className="flex justify-center mt-6">
+            <Button variant="outline" onClick={carregarMaisBrindes}>
+              Carregar mais
+            </Button>
+          </div>
+        )}
+
         {activeTab === 'estoque' && isRecepcaoCentral() && (
           <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-4 gap-6">
             {estoque.map((item) => (
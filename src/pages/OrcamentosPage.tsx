@@ -9,6 +9,7 @@ import { Badge } from '../components/ui/badge'
 import { toast } from 'sonner'
 import { FileText, Plus, ArrowLeft, AlertCircle, DollarSign, Calendar, Clock, CheckCircle, XCircle, User, Building } from 'lucide-react'
 import { Link } from 'react-router-dom'
+import { buscarPagina } from '../lib/paginacao'
 
 interface Orcamento {
   id: number
@@ -30,6 +31,7 @@ interface Orcamento {
 const OrcamentosPage = () => {
   const { user } = useAuth()
   const [orcamentos, setOrcamentos] = useState<Orcamento[]>([])
+  const [nextCursor, setNextCursor] = useState<string | null>(null)
   const [alertas, setAlertas] = useState<Orcamento[]>([])
   const [loading, setLoading] = useState(true)
   const [showForm, setShowForm] = useState(false)
@@ -52,18 +54,14 @@ const OrcamentosPage = () => {
     fetchAlertas()
   }, [])
 
-  const fetchOrcamentos = async () => {
+  // Sem cursor recarrega a primeira página; com cursor acrescenta a próxima
+  const fetchOrcamentos = async (cursor?: string | null) => {
     try {
       const token = localStorage.getItem('token')
-      const response = await fetch('/api/orcamentos/', {
-        headers: {
-          'Authorization': `Bearer ${token}`
-        }
-      })
-
-      if (response.ok) {
-        const data = await response.json()
-        setOrcamentos(data.orcamentos)
+      const pagina = await buscarPagina<Orcamento>('/api/orcamentos/', 'orcamentos', token, cursor)
+      if (pagina) {
+        setOrcamentos((atuais) => cursor ? [...atuais, ...pagina.itens] : pagina.itens)
+        setNextCursor(pagina.nextCursor)
       }
     } catch (error) {
       toast.error('Erro ao carregar orçamentos')
@@ -565,6 +563,14 @@ const OrcamentosPage = () => {
           })}
         </div>
 
+        {nextCursor && (
+          <div className="flex justify-center mt-6">
+            <Button variant="outline" onClick={() => fetchOrcamentos(nextCursor)}>
+              Carregar mais
+            </Button>
+          </div>
+        )}
+
         {orcamentos.length === 0 && (
           <Card className="shadow-xl">
             <CardContent className="text-center py-16">
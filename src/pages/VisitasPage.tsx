@@ -6,6 +6,7 @@ import { Label } from '../components/ui/label'
 import { Badge } from '../components/ui/badge'
 import { toast } from 'sonner'
 import { Users, Plus } from 'lucide-react'
+import { buscarPagina } from '../lib/paginacao'
 
 interface Visita {
   id: number
@@ -33,6 +34,8 @@ interface Paciente {
 const VisitasPage = () => {
   const [visitas, setVisitas] = useState<Visita[]>([])
   const [pacientes, setPacientes] = useState<Paciente[]>([])
+  const [visitasCursor, setVisitasCursor] = useState<string | null>(null)
+  const [pacientesCursor, setPacientesCursor] = useState<string | null>(null)
   const [loading, setLoading] = useState(true)
   const [activeTab, setActiveTab] = useState<'visitas' | 'pacientes'>('visitas')
   const [showForm, setShowForm] = useState(false)
@@ -54,22 +57,18 @@ const VisitasPage = () => {
     try {
       const token = localStorage.getItem('token')
       
-      // Buscar visitas
-      const visitasResponse = await fetch('/api/visitas/', {
-        headers: { 'Authorization': `Bearer ${token}` }
-      })
-      if (visitasResponse.ok) {
-        const visitasData = await visitasResponse.json()
-        setVisitas(visitasData.visitas)
+      // Buscar visitas (primeira página)
+      const visitas = await buscarPagina<Visita>('/api/visitas/', 'visitas', token)
+      if (visitas) {
+        setVisitas(visitas.itens)
+        setVisitasCursor(visitas.nextCursor)
       }
 
-      // Buscar pacientes
-      const pacientesResponse = await fetch('/api/visitas/pacientes', {
-        headers: { 'Authorization': `Bearer ${token}` }
-      })
-      if (pacientesResponse.ok) {
-        const pacientesData = await pacientesResponse.json()
-        setPacientes(pacientesData.pacientes)
+      // Buscar pacientes (primeira página)
+      const pacientes = await buscarPagina<Paciente>('/api/visitas/pacientes', 'pacientes', token)
+      if (pacientes) {
+        setPacientes(pacientes.itens)
+        setPacientesCursor(pacientes.nextCursor)
       }
     } catch (error) {
       toast.error('Erro ao carregar dados')
@@ -78,6 +77,32 @@ const VisitasPage = () => {
     }
   }
 
+  const carregarMaisVisitas = async () => {
+    try {
+      const token = localStorage.getItem('token')
+      const pagina = await buscarPagina<Visita>('/api/visitas/', 'visitas', token, visitasCursor)
+      if (pagina) {
+        setVisitas((atuais) => [...atuais, ...pagina.itens])
+        setVisitasCursor(pagina.nextCursor)
+      }
+    } catch (error) {
+      toast.error('Erro ao carregar visitas')
+    }
+  }
+
+  const carregarMaisPacientes = async () => {
+    try {
+      const token = localStorage.getItem('token')
+      const pagina = await buscarPagina<Paciente>('/api/visitas/pacientes', 'pacientes', token, pacientesCursor)
+      if (pagina) {
+        setPacientes((atuais) => [...atuais, ...pagina.itens])
+        setPacientesCursor(pagina.nextCursor)
+      }
+    } catch (error) {
+      toast.error('Erro ao carregar pacientes')
+    }
+  }
+
   const handleSubmitVisita = async (e: React.FormEvent) => {
     e.preventDefault()
     
@@ -273,6 +298,14 @@ const VisitasPage = () => {
           </div>
         )}
 
+        {activeTab === 'visitas' && visitasCursor && (
+          <div className="flex justify-center mt-6">
+            <Button variant="outline" onClick={carregarMaisVisitas}>
+              Carregar mais
+            </Button>
+          </div>
+        )}
+
         {activeTab === 'pacientes' && (
           <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
             {pacientes.map((paciente) => (
@@ -316,6 +349,14 @@ const VisitasPage = () => {
           </div>
         )}
 
+        {activeTab === 'pacientes' && pacientesCursor && (
+          <div className="flex justify-center mt-6">
+            <Button variant="outline" onClick={carregarMaisPacientes}>
+              Carregar mais
+            </Button>
+          </div>
+        )}
+
         {((activeTab === 'visitas' && visitas.length === 0) || (activeTab === 'pacientes' && pacientes.length === 0)) && (
           <Card>
             <CardContent className="text-center py-8">
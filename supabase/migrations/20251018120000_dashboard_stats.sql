@@ -0,0 +1,43 @@
+-- Agregações do dashboard calculadas no Postgres
+-- O backend lê poucas linhas já agrupadas em vez de baixar as tabelas inteiras
+
+-- Salas por recepção e status
+CREATE OR REPLACE VIEW public.dashboard_salas_status AS
+SELECT
+    recepcao_id,
+    status,
+    COUNT(*) as total
+FROM public.salas
+GROUP BY recepcao_id, status;
+
+-- Orçamentos por recepção e status
+CREATE OR REPLACE VIEW public.dashboard_orcamentos_status AS
+SELECT
+    recepcao_id,
+    status,
+    COUNT(*) as total
+FROM public.orcamentos
+GROUP BY recepcao_id, status;
+
+-- Orçamentos por recepção e mês (YYYY-MM)
+CREATE OR REPLACE VIEW public.dashboard_orcamentos_mes AS
+SELECT
+    recepcao_id,
+    to_char(created_at, 'YYYY-MM') as mes,
+    COUNT(*) as total
+FROM public.orcamentos
+GROUP BY recepcao_id, to_char(created_at, 'YYYY-MM');
+
+-- Quantidade de anamneses por recepção e mês (YYYY-MM)
+CREATE OR REPLACE VIEW public.dashboard_anamneses_mes AS
+SELECT
+    recepcao_id,
+    to_char(data_registro, 'YYYY-MM') as mes,
+    SUM(quantidade) as total
+FROM public.anamneses
+GROUP BY recepcao_id, to_char(data_registro, 'YYYY-MM');
+
+-- Índices usados pelas contagens com filtro
+CREATE INDEX IF NOT EXISTS idx_retiradas_estoque_recepcao_created ON public.retiradas_estoque(recepcao_id, created_at);
+CREATE INDEX IF NOT EXISTS idx_entrada_saida_recepcao_status ON public.entrada_saida_pacientes(recepcao_id, status);
+CREATE INDEX IF NOT EXISTS idx_anamneses_recepcao_data ON public.anamneses(recepcao_id, data_registro);
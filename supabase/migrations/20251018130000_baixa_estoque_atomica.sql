@@ -0,0 +1,85 @@
+-- Baixa de estoque atômica (uma ida ao banco, sem condição de corrida)
+-- Chamadas via PostgREST: POST /rest/v1/rpc/<função>
+-- Retornam {"status": "ok", "registro": {...}} ou um status de erro:
+--   quantidade_invalida | item_nao_encontrado | quantidade_insuficiente
+
+-- Retirada do estoque da recepção (estoque -> retiradas_estoque)
+CREATE OR REPLACE FUNCTION public.registrar_retirada_estoque(
+    p_item_id INTEGER,
+    p_quantidade INTEGER,
+    p_retirado_por VARCHAR,
+    p_observacoes TEXT,
+    p_recepcao_id VARCHAR,
+    p_created_by VARCHAR
+) RETURNS JSON AS $$
+DECLARE
+    v_nome VARCHAR;
+    v_retirada public.retiradas_estoque;
+BEGIN
+    IF p_quantidade IS NULL OR p_quantidade <= 0 THEN
+        RETURN json_build_object('status', 'quantidade_invalida');
+    END IF;
+
+    -- O WHERE garante que o saldo nunca fica negativo, mesmo com retiradas simultâneas
+    UPDATE public.estoque
+       SET quantidade = quantidade - p_quantidade
+     WHERE id = p_item_id
+       AND quantidade >= p_quantidade
+    RETURNING nome INTO v_nome;
+
+    IF NOT FOUND THEN
+        IF EXISTS (SELECT 1 FROM public.estoque WHERE id = p_item_id) THEN
+            RETURN json_build_object('status', 'quantidade_insuficiente');
+        END IF;
+        RETURN json_build_object('status', 'item_nao_encontrado');
+    END IF;
+
+    INSERT INTO public.retiradas_estoque
+        (item_id, item_nome, quantidade, retirado_por, observacoes, recepcao_id, created_by, created_at)
+    VALUES
+        (p_item_id, v_nome, p_quantidade, p_retirado_por, p_observacoes, p_recepcao_id, p_created_by, now())
+    RETURNING * INTO v_retirada;
+
+    RETURN json_build_object('status', 'ok', 'registro', row_to_json(v_retirada));
+END;
+$$ LANGUAGE plpgsql;
+
+-- Distribuição de brindes da 1002 para outra recepção (estoque_brindes -> distribuicao_brindes)
+CREATE OR REPLACE FUNCTION public.registrar_distribuicao_brindes(
+    p_item_id INTEGER,
+    p_quantidade INTEGER,
+    p_recepcao_origem VARCHAR,
+    p_recepcao_destino VARCHAR,
+    p_observacoes TEXT,
+    p_created_by VARCHAR
+) RETURNS JSON AS $$
+DECLARE
+    v_nome VARCHAR;
+    v_distribuicao public.distribuicao_brindes;
+BEGIN
+    IF p_quantidade IS NULL OR p_quantidade <= 0 THEN
+        RETURN json_build_object('status', 'quantidade_invalida');
+    END IF;
+
+    UPDATE public.estoque_brindes
+       SET quantidade = quantidade - p_quantidade
+     WHERE id = p_item_id
+       AND quantidade >= p_quantidade
+    RETURNING nome INTO v_nome;
+
+    IF NOT FOUND THEN
+        IF EXISTS (SELECT 1 FROM public.estoque_brindes WHERE id = p_item_id) THEN
+            RETURN json_build_object('status', 'quantidade_insuficiente');
+        END IF;
+        RETURN json_build_object('status', 'item_nao_encontrado');
+    END IF;
+
+    INSERT INTO public.distribuicao_brindes
+        (item_id, item_nome, quantidade, recepcao_origem, recepcao_destino, observacoes, created_by, created_at)
+    VALUES
+        (p_item_id, v_nome, p_quantidade, p_recepcao_origem, p_recepcao_destino, p_observacoes, p_created_by, now())
+    RETURNING * INTO v_distribuicao;
+
+    RETURN json_build_object('status', 'ok', 'registro', row_to_json(v_distribuicao));
+END;
+$$ LANGUAGE plpgsql;
@@ -0,0 +1,44 @@
+-- Versão da senha usada para revogar tokens (em vez do próprio hash)
+-- Troca de senha incrementa senha_versao; a atualização transparente dos
+-- parâmetros do hash (atualizar_hash_senha) não, para não derrubar sessões.
+
+ALTER TABLE public.usuarios ADD COLUMN IF NOT EXISTS senha_versao INTEGER NOT NULL DEFAULT 1;
+
+CREATE OR REPLACE FUNCTION public.incrementar_senha_versao()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.password_hash IS DISTINCT FROM OLD.password_hash
+       AND coalesce(current_setting('app.rehash_senha', true), '') <> 'on' THEN
+        NEW.senha_versao = OLD.senha_versao + 1;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS usuarios_senha_versao ON public.usuarios;
+CREATE TRIGGER usuarios_senha_versao
+    BEFORE UPDATE OF password_hash ON public.usuarios
+    FOR EACH ROW EXECUTE FUNCTION public.incrementar_senha_versao();
+
+-- Troca o hash só se ainda for o mesmo que foi verificado no login
+-- Chamada via PostgREST: POST /rest/v1/rpc/atualizar_hash_senha
+CREATE OR REPLACE FUNCTION public.atualizar_hash_senha(
+    p_username VARCHAR,
+    p_hash_atual VARCHAR,
+    p_hash_novo VARCHAR
+) RETURNS BOOLEAN AS $$
+DECLARE
+    v_linhas INTEGER;
+BEGIN
+    PERFORM set_config('app.rehash_senha', 'on', true);
+
+    UPDATE public.usuarios
+       SET password_hash = p_hash_novo
+     WHERE username = p_username
+       AND password_hash = p_hash_atual;
+    GET DIAGNOSTICS v_linhas = ROW_COUNT;
+
+    PERFORM set_config('app.rehash_senha', 'off', true);
+    RETURN v_linhas > 0;
+END;
+$$ LANGUAGE plpgsql;
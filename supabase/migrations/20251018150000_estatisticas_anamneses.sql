@@ -0,0 +1,41 @@
+-- Estatísticas de anamneses calculadas no Postgres (GET /api/anamneses/estatisticas)
+-- Chamada via PostgREST: POST /rest/v1/rpc/estatisticas_anamneses
+-- Devolve um único objeto JSON em vez de todas as linhas da tabela
+
+-- Colunas gravadas pela API (blueprints/anamnese.py) que as migrations não declaravam
+ALTER TABLE public.anamneses ADD COLUMN IF NOT EXISTS data_anamnese DATE;
+ALTER TABLE public.anamneses ADD COLUMN IF NOT EXISTS status VARCHAR(20) DEFAULT 'agendada';
+
+-- p_recepcao_id NULL = todas as recepções (admin); p_hoje vem do backend
+CREATE OR REPLACE FUNCTION public.estatisticas_anamneses(
+    p_recepcao_id VARCHAR DEFAULT NULL,
+    p_hoje DATE DEFAULT CURRENT_DATE
+) RETURNS JSON AS $$
+    WITH base AS (
+        SELECT status,
+               data_anamnese::date AS data,
+               COALESCE(profissional, 'Não informado') AS profissional,
+               COALESCE(tipo_anamnese, 'Não informado') AS tipo
+          FROM public.anamneses
+         WHERE p_recepcao_id IS NULL OR recepcao_id = p_recepcao_id
+    )
+    SELECT json_build_object(
+        'total_anamneses', (SELECT COUNT(*) FROM base),
+        'agendadas', (SELECT COUNT(*) FROM base WHERE status = 'agendada'),
+        'realizadas', (SELECT COUNT(*) FROM base WHERE status = 'realizada'),
+        'canceladas', (SELECT COUNT(*) FROM base WHERE status = 'cancelada'),
+        'este_mes', (SELECT COUNT(*) FROM base WHERE date_trunc('month', data) = date_trunc('month', p_hoje)),
+        'proximo_mes', (SELECT COUNT(*) FROM base
+                         WHERE date_trunc('month', data) = date_trunc('month', p_hoje) + INTERVAL '1 month'),
+        'por_profissional', COALESCE((SELECT json_object_agg(profissional, total)
+                                        FROM (SELECT profissional, COUNT(*) AS total FROM base GROUP BY profissional) p),
+                                     '{}'::json),
+        'por_tipo', COALESCE((SELECT json_object_agg(tipo, total)
+                                FROM (SELECT tipo, COUNT(*) AS total FROM base GROUP BY tipo) t), '{}'::json),
+        'por_mes', COALESCE((SELECT json_object_agg(mes, total)
+                               FROM (SELECT to_char(data, 'YYYY-MM') AS mes, COUNT(*) AS total
+                                       FROM base WHERE data IS NOT NULL GROUP BY 1) m), '{}'::json)
+    );
+$$ LANGUAGE sql STABLE;
+
+CREATE INDEX IF NOT EXISTS idx_anamneses_recepcao_data_anamnese ON public.anamneses(recepcao_id, data_anamnese);
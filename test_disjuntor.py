@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Teste do disjuntor: a sonda do meio-aberto nunca fica presa
+Execute: python test_disjuntor.py  (ou pytest test_disjuntor.py)
+
+1. Sonda que levanta um erro que não é de rede (corpo truncado) conta como
+   falha: o circuito reabre e, depois do cooldown, aceita uma nova sonda
+2. O mesmo no caminho assíncrono (httpx.DecodingError)
+3. Sonda cancelada libera a vaga sem mudar o estado
+4. Falhas que abrem o circuito no meio das novas tentativas encerram o laço
+"""
+
+import asyncio
+import time
+
+import httpx
+import requests
+
+from config import Config
+from database import CircuitoAberto, SimpleQuery, disjuntor
+
+class ClienteQuebrado:
+    """Cliente cujo request levanta `erro` (ou responde 200 vazio quando erro é None)"""
+
+    erros_de_rede = (requests.ConnectionError, requests.Timeout)
+    erros_de_rede_async = httpx.TransportError
+
+    def __init__(self, erro=None):
+        self.erro = erro
+        self.chamadas = 0
+
+    def timeout_restante(self, restante):
+        return restante
+
+    def timeout_restante_async(self, restante):
+        return restante
+
+    def _responder(self):
+        self.chamadas += 1
+        if self.erro is not None:
+            raise self.erro
+        return httpx.Response(200, content=b'[]')
+
+    def request(self, method, url, **kwargs):
+        return self._responder()
+
+    async def request_async(self, method, url, **kwargs):
+        if isinstance(self.erro, asyncio.CancelledError):
+            raise self.erro
+        return self._responder()
+
+def _meio_aberto():
+    """Disjuntor do processo zerado, aberto e com o cooldown já vencido"""
+    disjuntor.__init__()
+    disjuntor.estado = 'aberto'
+    disjuntor.reabrir_em = time.monotonic() - 1
+    return disjuntor
+
+def _consulta(cliente):
+    return SimpleQuery(cliente, 'http://supabase/rest/v1/salas', 'GET')
+
+def _rejeitada(cliente):
+    try:
+        _consulta(cliente).execute()
+    except CircuitoAberto:
+        return True
+    return False
+
+def test_sonda_com_erro_que_nao_e_de_rede():
+    _meio_aberto()
+    try:
+        _consulta(ClienteQuebrado(requests.exceptions.ChunkedEncodingError('corpo truncado'))).execute()
+    except requests.exceptions.ChunkedEncodingError:
+        pass
+    assert disjuntor.estado == 'aberto'
+    assert _rejeitada(ClienteQuebrado())
+
+    disjuntor.reabrir_em = time.monotonic() - 1
+    _consulta(ClienteQuebrado()).execute()
+    assert disjuntor.estado == 'fechado'
+
+def test_sonda_async_com_erro_de_decodificacao():
+    _meio_aberto()
+    try:
+        asyncio.run(_consulta(ClienteQuebrado(httpx.DecodingError('gzip inválido'))).execute_async())
+    except httpx.DecodingError:
+        pass
+    assert disjuntor.estado == 'aberto'
+
+    disjuntor.reabrir_em = time.monotonic() - 1
+    asyncio.run(_consulta(ClienteQuebrado()).execute_async())
+    assert disjuntor.estado == 'fechado'
+
+def test_sonda_cancelada_libera_a_vaga():
+    _meio_aberto()
+    try:
+        asyncio.run(_consulta(ClienteQuebrado(asyncio.CancelledError())).execute_async())
+    except asyncio.CancelledError:
+        pass
+    assert disjuntor.estado == 'meio_aberto'
+    _consulta(ClienteQuebrado()).execute()
+    assert disjuntor.estado == 'fechado'
+
+def test_circuito_aberto_interrompe_novas_tentativas():
+    disjuntor.__init__()
+    cliente = ClienteQuebrado(requests.ConnectionError('recusada'))
+    original = (Config.SUPABASE_BREAKER_MIN_REQUESTS, Config.SUPABASE_RETRIES, Config.SUPABASE_RETRY_BACKOFF)
+    Config.SUPABASE_BREAKER_MIN_REQUESTS, Config.SUPABASE_RETRIES, Config.SUPABASE_RETRY_BACKOFF = 1, 5, 0.001
+    try:
+        try:
+            _consulta(cliente).execute()
+        except CircuitoAberto:
+            pass
+    finally:
+        Config.SUPABASE_BREAKER_MIN_REQUESTS, Config.SUPABASE_RETRIES, Config.SUPABASE_RETRY_BACKOFF = original
+        disjuntor.__init__()
+    assert cliente.chamadas == 1
+
+if __name__ == '__main__':
+    print("🔌 TESTE DO DISJUNTOR")
+    print("=" * 40)
+    for teste in (test_sonda_com_erro_que_nao_e_de_rede, test_sonda_async_com_erro_de_decodificacao,
+                  test_sonda_cancelada_libera_a_vaga, test_circuito_aberto_interrompe_novas_tentativas):
+        try:
+            teste()
+            print(f"✅ {teste.__name__}")
+        except Exception as e:
+            print(f"❌ {teste.__name__}: {e}")
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Teste dos logs: nada no caminho do login escreve direto em stdout
+Execute: python test_logs.py  (ou pytest test_logs.py)
+
+1. Os módulos do login não têm print() (só logging, que vai para a fila)
+2. Com a saída lenta, registrar 200 eventos não espera a escrita
+3. A saída é JSON por linha, com os campos de extra=
+"""
+
+import ast
+import json
+import os
+import subprocess
+import sys
+
+RAIZ = os.path.dirname(os.path.abspath(__file__))
+
+CAMINHO_DO_LOGIN = [
+    'blueprints/auth.py', 'blueprints/anamnese.py', 'models/user.py',
+    'utils/permissions.py', 'utils/senhas.py', 'database.py'
+]
+
+# Processo novo: configurar_logs() roda uma vez por processo
+MEDICAO = """
+import json, logging, sys, time
+
+class SaidaLenta:
+    def __init__(self):
+        self.linhas = []
+    def write(self, texto):
+        time.sleep(0.01)
+        self.linhas.append(texto)
+    def flush(self):
+        pass
+
+from utils.logs import configurar_logs, estatisticas_logs, _encerrar
+saida = SaidaLenta()
+configurar_logs(saida)
+logger = logging.getLogger('blueprints.auth')
+
+inicio = time.perf_counter()
+for i in range(200):
+    logger.info('Login ok', extra={'usuario': f'user{i}'})
+gasto = time.perf_counter() - inicio
+_encerrar()
+
+linhas = [json.loads(l) for l in ''.join(saida.linhas).splitlines() if l.strip()]
+print(json.dumps({'gasto': gasto, 'linhas': len(linhas), 'primeira': linhas[0],
+                  'descartados': estatisticas_logs()['descartados']}))
+"""
+
+def prints_no_login():
+    encontrados = []
+    for caminho in CAMINHO_DO_LOGIN:
+        with open(os.path.join(RAIZ, caminho), encoding='utf-8') as f:
+            arvore = ast.parse(f.read())
+        for no in ast.walk(arvore):
+            if isinstance(no, ast.Call) and getattr(no.func, 'id', None) == 'print':
+                encontrados.append(f"{caminho}:{no.lineno}")
+    return encontrados
+
+def medir_logs():
+    saida = subprocess.run(
+        [sys.executable, '-c', MEDICAO], cwd=RAIZ, capture_output=True, text=True, check=True,
+        env={**os.environ, 'LOG_FORMAT': 'json', 'LOG_QUEUE_MAX': '1000'}
+    ).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+def test_sem_print_no_login():
+    assert prints_no_login() == []
+
+def test_logs_nao_bloqueiam():
+    medicao = medir_logs()
+    # 200 escritas de 10 ms levariam 2 s se fossem feitas na thread que registra
+    assert medicao['gasto'] < 0.5, medicao['gasto']
+    assert medicao['linhas'] == 200 and medicao['descartados'] == 0
+    assert medicao['primeira']['usuario'] == 'user0'
+    assert medicao['primeira']['level'] == 'INFO'
+
+if __name__ == '__main__':
+    prints = prints_no_login()
+    medicao = medir_logs()
+    print("📝 TESTE DE LOGS")
+    print("=" * 40)
+    print(f"{'✅' if not prints else '❌'} print() no caminho do login: {', '.join(prints) or 'nenhum'}")
+    print(f"{'✅' if medicao['gasto'] < 0.5 else '❌'} 200 eventos com saída lenta: {medicao['gasto'] * 1000:.1f} ms na thread da requisição")
+    print(f"{'✅' if medicao['linhas'] == 200 else '❌'} {medicao['linhas']} linhas JSON escritas, {medicao['descartados']} descartadas")
+    print(f"   exemplo: {json.dumps(medicao['primeira'], ensure_ascii=False)}")
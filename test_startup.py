@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Teste do tempo de boot: import + create_app() em um processo Python novo
+Execute: python test_startup.py  (ou pytest test_startup.py)
+
+O limite vem de STARTUP_BUDGET (segundos, padrão 1.5); o health check da
+Railway só passa depois disso, então o valor deve continuar bem abaixo do
+healthcheckTimeout do railway.toml.
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+STARTUP_BUDGET = float(os.environ.get('STARTUP_BUDGET', 1.5))
+
+# Mede dentro do processo filho para não contar o boot do próprio interpretador
+MEDICAO = """
+import json, sys, time
+inicio = time.perf_counter()
+from app import create_app
+app = create_app('testing')
+criado = time.perf_counter()
+app.test_client().get('/api/health')
+fim = time.perf_counter()
+print(json.dumps({
+    'create_app': criado - inicio,
+    'primeiro_health': fim - criado,
+    'modulos_pesados': [m for m in ('requests', 'supabase') if m in sys.modules]
+}))
+"""
+
+def medir_startup():
+    raiz = os.path.dirname(os.path.abspath(__file__))
+    saida = subprocess.run(
+        [sys.executable, '-c', MEDICAO], cwd=raiz, capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(saida.strip().splitlines()[-1])
+
+def test_startup_budget():
+    medicao = medir_startup()
+    total = medicao['create_app'] + medicao['primeiro_health']
+    assert total < STARTUP_BUDGET, f"Boot levou {total:.3f}s (limite {STARTUP_BUDGET}s)"
+    # O health check não pode depender do cliente HTTP nem do pacote supabase
+    assert medicao['modulos_pesados'] == [], medicao['modulos_pesados']
+
+if __name__ == '__main__':
+    medicao = medir_startup()
+    total = medicao['create_app'] + medicao['primeiro_health']
+    print("⏱️ TESTE DE BOOT")
+    print("=" * 40)
+    print(f"create_app():      {medicao['create_app'] * 1000:.0f} ms")
+    print(f"primeiro /health:  {medicao['primeiro_health'] * 1000:.0f} ms")
+    print(f"módulos pesados:   {', '.join(medicao['modulos_pesados']) or 'nenhum'}")
+    print(f"{'✅' if total < STARTUP_BUDGET else '❌'} Total {total * 1000:.0f} ms (limite {STARTUP_BUDGET * 1000:.0f} ms)")
@@ -0,0 +1,116 @@
+"""
+Geração de hashes de senha em paralelo para os scripts de carga e rotação
+
+gerar_hash (scrypt/pbkdf2, conforme HASH_METHOD) é caro de propósito, então rotacionar
+todas as contas em série deixa os outros núcleos parados. Aqui os hashes vão
+para um ProcessPoolExecutor e voltam em ordem, à medida que ficam prontos,
+para serem gravados num arquivo .sql ou no banco em lotes.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from utils.senhas import gerar_hash
+
+class Vazao:
+    """Mede hashes/s no total e por núcleo"""
+    def __init__(self, workers=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.total = 0
+        self.inicio = time.perf_counter()
+
+    def registrar(self):
+        self.total += 1
+
+    def relatorio(self):
+        duracao = max(time.perf_counter() - self.inicio, 1e-9)
+        por_segundo = self.total / duracao
+        return (f"{self.total} hashes em {duracao:.1f}s - {por_segundo:.1f} hashes/s "
+                f"({por_segundo / self.workers:.1f}/s por núcleo, {self.workers} processos)")
+
+def _hash_par(par):
+    chave, senha = par
+    return chave, gerar_hash(senha)
+
+def gerar_hashes(pares, workers=None, vazao=None):
+    """
+    Recebe pares (username, senha) e gera (username, hash) na mesma ordem.
+    Com menos de dois pares o hash é feito no próprio processo.
+    """
+    pares = list(pares)
+    workers = workers or os.cpu_count() or 1
+    if vazao:
+        vazao.workers = workers
+    if len(pares) < 2 or workers == 1:
+        resultados = map(_hash_par, pares)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        chunksize = max(1, len(pares) // (workers * 4))
+        resultados = executor.map(_hash_par, pares, chunksize=chunksize)
+    try:
+        for par in resultados:
+            if vazao:
+                vazao.registrar()
+            yield par
+    finally:
+        if executor:
+            executor.shutdown(cancel_futures=True)
+
+def _sql_texto(valor):
+    return "'" + str(valor).replace("'", "''") + "'"
+
+def escrever_sql(pares, destino):
+    """Escreve um UPDATE por par (username, hash) no arquivo aberto destino"""
+    total = 0
+    destino.write("-- Atualização de senhas dos usuários\n")
+    destino.write("-- Execute este arquivo no Supabase SQL Editor\n\n")
+    for username, password_hash in pares:
+        destino.write(f"UPDATE usuarios SET password_hash = {_sql_texto(password_hash)} "
+                      f"WHERE username = {_sql_texto(username)};\n")
+        total += 1
+    destino.write("\n-- Verificar atualizações\n")
+    destino.write("SELECT username, email, role, LEFT(password_hash, 20) || '...' as hash_preview "
+                  "FROM usuarios ORDER BY username;\n")
+    return total
+
+def usuarios_existentes(supabase, usernames, colunas='username', lote=200):
+    """Linhas de usuarios para os usernames informados (consulta em lotes com in.())"""
+    linhas = []
+    for inicio in range(0, len(usernames), lote):
+        result = supabase.table('usuarios').select(colunas).in_('username', usernames[inicio:inicio + lote]).execute()
+        linhas.extend(result.data)
+    return linhas
+
+def gravar_hashes(supabase, pares, chunk_size=500):
+    """
+    Grava os hashes no banco em lotes de chunk_size via upsert(on_conflict=username).
+    Só atualiza usuários existentes; devolve (atualizados, não encontrados).
+    """
+    atualizados, nao_encontrados = [], []
+
+    def gravar(lote):
+        # O upsert precisa das colunas NOT NULL, então elas vêm da linha atual
+        existentes = {
+            row['username']: row
+            for row in usuarios_existentes(supabase, [username for username, _ in lote], 'username,email,role')
+        }
+        linhas = []
+        for username, password_hash in lote:
+            if username in existentes:
+                linhas.append({**existentes[username], 'password_hash': password_hash})
+                atualizados.append(username)
+            else:
+                nao_encontrados.append(username)
+        if linhas:
+            supabase.table('usuarios').upsert_many(linhas, on_conflict='username', chunk_size=chunk_size)
+
+    lote = []
+    for par in pares:
+        lote.append(par)
+        if len(lote) >= chunk_size:
+            gravar(lote)
+            lote = []
+    if lote:
+        gravar(lote)
+    return atualizados, nao_encontrados
@@ -0,0 +1,145 @@
+"""
+Logs estruturados (JSON, uma linha por evento) sem escrita na thread da requisição
+
+configurar_logs() troca os handlers do logger raiz por um QueueHandler: a
+requisição só enfileira o registro (put_nowait em fila limitada) e uma
+thread de fundo (QueueListener) formata e escreve em stdout. Com a fila
+cheia o registro é descartado e contado, nunca bloqueia.
+
+Os módulos usam logging.getLogger(__name__) e passam campos com extra=:
+    logger.info('Login ok', extra={'usuario': user.username})
+
+Variáveis:
+    LOG_LEVEL         nível padrão (INFO)
+    LOG_LEVELS        níveis por módulo, ex.: "models.user=DEBUG,blueprints=WARNING"
+    LOG_FORMAT        json (padrão) ou texto
+    LOG_DEBUG_SAMPLE  fração dos registros DEBUG que são mantidos (0.1)
+    LOG_QUEUE_MAX     tamanho da fila (10000)
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import queue
+import random
+import sys
+import threading
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener
+from config import Config
+
+_ATRIBUTOS_PADRAO = set(logging.makeLogRecord({}).__dict__) | {'message', 'asctime', 'taskName'}
+
+# Clientes HTTP registram cada requisição em INFO; LOG_LEVELS sobrescreve
+_NIVEIS_PADRAO = {'httpx': 'WARNING', 'httpcore': 'WARNING', 'urllib3': 'WARNING', 'hpack': 'WARNING'}
+
+_lock = threading.Lock()
+_pid = None
+_listener = None
+_handler = None
+
+class FormatoJSON(logging.Formatter):
+    """Uma linha JSON por registro; campos de extra= entram no objeto"""
+
+    def format(self, record):
+        dados = {
+            'timestamp': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+            'thread': record.threadName
+        }
+        for chave, valor in record.__dict__.items():
+            if chave not in _ATRIBUTOS_PADRAO and not chave.startswith('_'):
+                dados[chave] = valor
+        if record.exc_info:
+            dados['exc'] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            dados['exc'] = record.exc_text
+        return json.dumps(dados, ensure_ascii=False, default=str)
+
+class AmostraDebug(logging.Filter):
+    """Mantém só uma fração dos registros DEBUG (os demais níveis passam sempre)"""
+
+    def __init__(self, fracao):
+        super().__init__()
+        self.fracao = fracao
+
+    def filter(self, record):
+        return record.levelno > logging.DEBUG or random.random() < self.fracao
+
+class FilaSemBloqueio(QueueHandler):
+    """QueueHandler que descarta (e conta) em vez de bloquear ou escrever em stderr"""
+
+    def __init__(self, fila):
+        super().__init__(fila)
+        self.descartados = 0
+
+    def prepare(self, record):
+        # Resolve a mensagem agora (os args podem mudar depois); o traceback
+        # é formatado na thread do listener
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.descartados += 1
+
+def _niveis_por_modulo(texto):
+    niveis = {}
+    for item in texto.split(','):
+        if '=' in item:
+            nome, nivel = item.split('=', 1)
+            niveis[nome.strip()] = nivel.strip().upper()
+    return niveis
+
+def configurar_logs(stream=None):
+    """Instala o handler com fila no logger raiz (uma vez por processo)"""
+    global _pid, _listener, _handler
+    with _lock:
+        if _pid == os.getpid():
+            return
+
+        saida = logging.StreamHandler(stream or sys.stdout)
+        if Config.LOG_FORMAT == 'texto':
+            saida.setFormatter(logging.Formatter('%(asctime)s %(levelname)s %(name)s: %(message)s'))
+        else:
+            saida.setFormatter(FormatoJSON())
+
+        _handler = FilaSemBloqueio(queue.Queue(maxsize=Config.LOG_QUEUE_MAX))
+        _handler.addFilter(AmostraDebug(Config.LOG_DEBUG_SAMPLE))
+        # Depois de um fork a thread do listener antigo não existe neste processo
+        _listener = QueueListener(_handler.queue, saida, respect_handler_level=False)
+        _listener.start()
+
+        raiz = logging.getLogger()
+        for handler in list(raiz.handlers):
+            raiz.removeHandler(handler)
+        raiz.addHandler(_handler)
+        raiz.setLevel(Config.LOG_LEVEL.upper())
+        niveis = dict(_NIVEIS_PADRAO, **_niveis_por_modulo(Config.LOG_LEVELS))
+        for nome, nivel in niveis.items():
+            logging.getLogger(nome).setLevel(nivel)
+
+        if _pid is None:
+            atexit.register(_encerrar)
+        _pid = os.getpid()
+
+def _encerrar():
+    # Escreve o que ainda está na fila antes de sair
+    global _listener
+    if _listener is not None and _pid == os.getpid():
+        _listener.stop()
+        _listener = None
+
+def estatisticas_logs():
+    """Tamanho atual da fila e registros descartados por fila cheia"""
+    if _handler is None:
+        return {'fila': 0, 'descartados': 0}
+    return {'fila': _handler.queue.qsize(), 'descartados': _handler.descartados}
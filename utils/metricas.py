@@ -0,0 +1,189 @@
+"""
+Métricas no formato texto do Prometheus, servidas em /api/metrics
+
+Sem dependências: contadores e histogramas em memória, por processo (com
+gunicorn cada worker responde com os próprios números; o Prometheus soma
+as séries por instância).
+
+    supabase_query_duration_seconds{endpoint,table,method,status}  cada chamada HTTP ao PostgREST
+    supabase_response_bytes_total{endpoint,table,method}           bytes recebidos
+    http_request_duration_seconds{endpoint,method,status}          cada requisição da API
+
+'endpoint' nas métricas do Supabase é a rota Flask que fez a consulta
+(ex.: dashboard.get_admin_stats), então dá para ver em que tabela cada
+rota gasta seu tempo. Também são expostos o disjuntor, o pool HTTP, o
+pool de hash de senha e a fila de logs.
+"""
+
+import hmac
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+from flask import g, request, Response
+from config import Config
+
+LIMITES = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+# Rota Flask em atendimento; copiada para o loop assíncrono (rota_async)
+endpoint_atual = ContextVar('endpoint_atual', default='')
+
+# Toda métrica criada entra aqui e sai em /api/metrics
+REGISTRO = []
+
+class Contador:
+    def __init__(self, nome, ajuda, rotulos):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = rotulos
+        self._valores = {}
+        self._lock = threading.Lock()
+        REGISTRO.append(self)
+
+    def inc(self, valores, quantidade=1):
+        with self._lock:
+            self._valores[valores] = self._valores.get(valores, 0) + quantidade
+
+    def linhas(self):
+        yield f"# HELP {self.nome} {self.ajuda}"
+        yield f"# TYPE {self.nome} counter"
+        with self._lock:
+            itens = sorted(self._valores.items())
+        for valores, total in itens:
+            yield f"{self.nome}{_rotulos(self.rotulos, valores)} {total}"
+
+class Histograma:
+    def __init__(self, nome, ajuda, rotulos, limites=LIMITES):
+        self.nome = nome
+        self.ajuda = ajuda
+        self.rotulos = rotulos
+        self.limites = limites
+        self._series = {}
+        self._lock = threading.Lock()
+        REGISTRO.append(self)
+
+    def observar(self, valores, segundos):
+        # Um balde por faixa; os acumulados são calculados só na exposição
+        indice = bisect_left(self.limites, segundos)
+        with self._lock:
+            serie = self._series.get(valores)
+            if serie is None:
+                serie = self._series[valores] = [[0] * (len(self.limites) + 1), 0.0]
+            serie[0][indice] += 1
+            serie[1] += segundos
+
+    def linhas(self):
+        yield f"# HELP {self.nome} {self.ajuda}"
+        yield f"# TYPE {self.nome} histogram"
+        with self._lock:
+            itens = sorted((valores, list(baldes), soma) for valores, (baldes, soma) in self._series.items())
+        for valores, baldes, soma in itens:
+            acumulado = 0
+            for limite, quantidade in zip(self.limites + ('+Inf',), baldes):
+                acumulado += quantidade
+                rotulos = _rotulos(self.rotulos + ('le',), valores + (str(limite),))
+                yield f"{self.nome}_bucket{rotulos} {acumulado}"
+            yield f"{self.nome}_sum{_rotulos(self.rotulos, valores)} {soma:.6f}"
+            yield f"{self.nome}_count{_rotulos(self.rotulos, valores)} {acumulado}"
+
+def _escapar(valor):
+    return str(valor).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _rotulos(nomes, valores):
+    if not nomes:
+        return ''
+    return '{' + ','.join(f'{nome}="{_escapar(valor)}"' for nome, valor in zip(nomes, valores)) + '}'
+
+def _gauge(nome, ajuda, amostras):
+    """amostras: lista de (dict de rótulos, valor)"""
+    yield f"# HELP {nome} {ajuda}"
+    yield f"# TYPE {nome} gauge"
+    for rotulos, valor in amostras:
+        yield f"{nome}{_rotulos(tuple(rotulos), tuple(rotulos.values()))} {valor}"
+
+consultas = Histograma(
+    'supabase_query_duration_seconds', 'Duração das chamadas HTTP ao PostgREST',
+    ('endpoint', 'table', 'method', 'status')
+)
+bytes_recebidos = Contador(
+    'supabase_response_bytes_total', 'Bytes recebidos do PostgREST',
+    ('endpoint', 'table', 'method')
+)
+requisicoes = Histograma(
+    'http_request_duration_seconds', 'Duração das requisições da API',
+    ('endpoint', 'method', 'status')
+)
+
+def registrar_consulta(tabela, metodo, status, tamanho, segundos):
+    """Chamado por SimpleQuery a cada tentativa (status 'rede' para erro de conexão/timeout)"""
+    endpoint = endpoint_atual.get()
+    consultas.observar((endpoint, tabela, metodo, str(status)), segundos)
+    if tamanho:
+        bytes_recebidos.inc((endpoint, tabela, metodo), tamanho)
+
+def _coletores():
+    # Importados aqui: database/senhas puxam o cliente e o pool de hash
+    from database import estado_disjuntor, get_pool_stats
+    from utils.senhas import estatisticas_hash
+    from utils.logs import estatisticas_logs
+
+    disjuntor = estado_disjuntor()
+    yield from _gauge('supabase_breaker_open', 'Disjuntor do Supabase (1 no estado indicado)', [
+        ({'state': estado}, int(disjuntor['estado'] == estado)) for estado in ('fechado', 'aberto', 'meio_aberto')
+    ])
+    yield from _gauge('supabase_breaker_events', 'Contadores do disjuntor desde o início do processo', [
+        ({'event': evento}, disjuntor[evento])
+        for evento in ('sucessos', 'falhas', 'rejeitadas', 'novas_tentativas', 'aberturas')
+    ])
+    yield from _gauge('supabase_pool', 'Pool HTTP do cliente síncrono', [
+        ({'stat': chave}, valor) for chave, valor in sorted(get_pool_stats().items())
+        if chave != 'pid' and isinstance(valor, (int, float)) and not isinstance(valor, bool)
+    ])
+    yield from _gauge('password_hash', 'Pool de verificação de senha (utils/senhas.py)', [
+        ({'stat': chave}, valor) for chave, valor in sorted(estatisticas_hash().items())
+        if isinstance(valor, (int, float))
+    ])
+    yield from _gauge('log_queue', 'Fila de logs (utils/logs.py)', [
+        ({'stat': chave}, valor) for chave, valor in sorted(estatisticas_logs().items())
+    ])
+
+def renderizar():
+    linhas = []
+    for metrica in REGISTRO:
+        linhas.extend(metrica.linhas())
+    linhas.extend(_coletores())
+    return '\n'.join(linhas) + '\n'
+
+def instalar_metricas(app):
+    """Mede cada requisição e registra /api/metrics (404 sem METRICS_TOKEN, exige Bearer)"""
+
+    @app.before_request
+    def _inicio_requisicao():
+        g._metricas_inicio = time.perf_counter()
+        g._metricas_token = endpoint_atual.set(request.endpoint or '')
+
+    @app.after_request
+    def _fim_requisicao(response):
+        inicio = g.pop('_metricas_inicio', None)
+        if inicio is not None:
+            requisicoes.observar(
+                (request.endpoint or 'nao_encontrado', request.method, str(response.status_code)),
+                time.perf_counter() - inicio
+            )
+        return response
+
+    @app.teardown_request
+    def _limpar_endpoint(exc):
+        token = g.pop('_metricas_token', None)
+        if token is not None:
+            endpoint_atual.reset(token)
+
+    @app.route('/api/metrics')
+    def metrics():
+        # Fechado por padrão: sem token configurado a rota não existe
+        if not Config.METRICS_TOKEN:
+            return Response('not found\n', status=404, mimetype='text/plain')
+        recebido = request.headers.get('Authorization', '')
+        if not hmac.compare_digest(recebido.encode(), f"Bearer {Config.METRICS_TOKEN}".encode()):
+            return Response('unauthorized\n', status=401, mimetype='text/plain')
+        return Response(renderizar(), mimetype='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,114 @@
+"""
+Paginação keyset e projeção de colunas para as rotas de listagem
+
+Parâmetros aceitos na query string:
+    limit   quantidade de itens (padrão PAGINATION_DEFAULT_LIMIT, máximo PAGINATION_MAX_LIMIT)
+    cursor  valor de next_cursor devolvido pela página anterior
+    fields  colunas separadas por vírgula (ex.: fields=id,nome_paciente,status),
+            só as de COLUNAS[tabela]; qualquer outra responde 400
+"""
+
+import base64
+import json
+import re
+from flask import request, jsonify, abort, make_response
+from config import Config
+
+_COLUNA_VALIDA = re.compile(r'^[a-z_][a-z0-9_]*$')
+
+# Colunas que fields= pode pedir em cada tabela listada (migrations + o que as rotas gravam)
+COLUNAS = {
+    'anamneses': frozenset((
+        'id', 'paciente_nome', 'responsavel', 'quantidade', 'tipo_anamnese', 'profissional', 'observacoes',
+        'recepcao_id', 'data_registro', 'created_at', 'created_by', 'data_anamnese', 'status', 'nome_pais',
+        'nome_paciente', 'idade_paciente', 'motivo_consulta', 'contato_responsavel', 'recepcao_nome',
+        'updated_at', 'updated_by')),
+    'orcamentos': frozenset((
+        'id', 'nome_pais', 'nome_paciente', 'terapias_solicitadas', 'valor', 'observacoes', 'status',
+        'recepcao_id', 'recepcao_nome', 'data_alerta', 'alerta_enviado', 'feedback', 'data_feedback',
+        'feedback_by', 'created_at', 'created_by')),
+    'brindes': frozenset((
+        'id', 'item_nome', 'quantidade', 'data_evento', 'observacoes', 'recepcao_id', 'recepcao_nome', 'status',
+        'created_at', 'created_by')),
+    'brindes_visitantes': frozenset((
+        'id', 'visitante_nome', 'item_nome', 'quantidade', 'observacoes', 'recepcao_id', 'created_at',
+        'created_by')),
+    'retiradas_estoque': frozenset((
+        'id', 'item_id', 'item_nome', 'quantidade', 'retirado_por', 'observacoes', 'recepcao_id', 'created_at',
+        'created_by')),
+    'lista_espera': frozenset((
+        'id', 'especialidade', 'solicitante', 'terapeuta_preferencia', 'data_solicitacao', 'observacoes',
+        'status', 'created_at', 'created_by', 'updated_at', 'updated_by')),
+    'visitas_externas': frozenset((
+        'id', 'visitante_nome', 'empresa', 'data_visita', 'hora_entrada', 'hora_saida', 'tipo_visita',
+        'agendamento', 'observacoes', 'recepcao_id', 'created_at', 'created_by')),
+    'entrada_saida_pacientes': frozenset((
+        'id', 'paciente_nome', 'responsavel', 'hora_entrada', 'hora_saida', 'tipo_atendimento', 'profissional',
+        'observacoes', 'observacoes_saida', 'status', 'recepcao_id', 'data_registro', 'created_at', 'created_by',
+        'updated_at', 'updated_by')),
+}
+
+def _erro(mensagem):
+    abort(make_response(jsonify({'error': mensagem}), 400))
+
+def _encode_cursor(valor, item_id):
+    raw = json.dumps([valor, item_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+def _decode_cursor(cursor):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        valor, item_id = json.loads(raw)
+        return valor, int(item_id)
+    except (ValueError, TypeError):
+        _erro('Cursor inválido')
+
+class Paginacao:
+    def __init__(self, limit, after=None, fields='*', coluna='created_at', desc=True):
+        self.limit = limit
+        self.after = after
+        self.fields = fields
+        self.coluna = coluna
+        self.desc = desc
+
+    def select(self, tabela):
+        return tabela.select(self.fields)
+
+    def executar(self, query):
+        """Executa a consulta e devolve (itens da página, next_cursor ou None)"""
+        # Busca um item a mais só para saber se existe próxima página
+        result = query.paginate(self.limit + 1, after=self.after, column=self.coluna, desc=self.desc).execute()
+        itens = result.data[:self.limit]
+
+        next_cursor = None
+        if len(result.data) > self.limit:
+            ultimo = itens[-1]
+            next_cursor = _encode_cursor(ultimo[self.coluna], ultimo['id'])
+        return itens, next_cursor
+
+def ler_paginacao(tabela, coluna='created_at', desc=True):
+    """Lê limit, cursor e fields da requisição atual para `tabela` (responde 400 se inválidos)"""
+    try:
+        limit = int(request.args.get('limit', Config.PAGINATION_DEFAULT_LIMIT))
+    except ValueError:
+        _erro('limit deve ser um número')
+    limit = max(1, min(limit, Config.PAGINATION_MAX_LIMIT))
+
+    cursor = request.args.get('cursor')
+    after = _decode_cursor(cursor) if cursor else None
+
+    fields = '*'
+    if request.args.get('fields'):
+        colunas = [c.strip() for c in request.args['fields'].split(',') if c.strip()]
+        if not all(_COLUNA_VALIDA.match(c) for c in colunas):
+            _erro('fields contém colunas inválidas')
+        desconhecidas = [c for c in colunas if c not in COLUNAS[tabela]]
+        if desconhecidas:
+            _erro(f"fields contém colunas desconhecidas: {', '.join(desconhecidas)}")
+        # As colunas do cursor precisam estar sempre presentes
+        for obrigatoria in ('id', coluna):
+            if obrigatoria not in colunas:
+                colunas.append(obrigatoria)
+        fields = ','.join(colunas)
+
+    return Paginacao(limit, after=after, fields=fields, coluna=coluna, desc=desc)
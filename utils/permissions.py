@@ -1,45 +1,80 @@
 from functools import wraps
-from flask import jsonify
-from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+from flask import jsonify, g
+from flask_jwt_extended import get_jwt, get_jwt_identity, verify_jwt_in_request
+from database import SupabaseIndisponivel
 from models.user import User
 
 def is_admin(user_role):
     """Verifica se o role é de admin (qualquer tipo)"""
     return user_role in ['admin', 'admin_geral', 'admin_limitado']
 
+class TokenRevokedError(Exception):
+    """Token emitido para uma versão antiga do usuário (senha/role alterados)"""
+
+def _resolve_user():
+    """Busca o usuário do token uma única vez por requisição (memo em flask.g)"""
+    verify_jwt_in_request()
+    current_user_id = get_jwt_identity()
+    
+    cached = g.get('_current_user_cache')
+    if cached is not None and cached[0] == current_user_id:
+        return cached[1]
+    
+    claims = get_jwt()
+    if 'ver' in claims:
+        # Token com claims: autoriza sem ir ao banco, só confere a versão
+        if User.get_token_version(current_user_id) != claims['ver']:
+            raise TokenRevokedError(current_user_id)
+        user = User.from_claims(current_user_id, claims)
+    else:
+        # Tokens antigos, emitidos sem claims
+        user = User.find_by_username(current_user_id)
+    
+    g._current_user_cache = (current_user_id, user)
+    return user
+
+def _autenticar(mensagem):
+    """(usuário, None) ou (None, resposta 401); token revogado tem mensagem própria"""
+    try:
+        return _resolve_user(), None
+    except SupabaseIndisponivel:
+        raise
+    except TokenRevokedError:
+        return None, (jsonify({'error': 'Sessão expirada, faça login novamente'}), 401)
+    except Exception:
+        return None, (jsonify({'error': mensagem}), 401)
+
 def require_auth(f):
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        try:
-            verify_jwt_in_request()
-            return f(*args, **kwargs)
-        except Exception as e:
-            return jsonify({'error': 'Token inválido'}), 401
+        # Resolve o usuário aqui: a rota lê o memo de flask.g
+        _, erro = _autenticar('Token inválido')
+        if erro:
+            return erro
+        return f(*args, **kwargs)
     return decorated_function
 
 def require_role(allowed_roles):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            try:
-                verify_jwt_in_request()
-                current_user_id = get_jwt_identity()
-                user = User.find_by_username(current_user_id)
-                
-                if not user:
-                    return jsonify({'error': 'Usuário não encontrado'}), 404
-                
-                # Verificar se é admin (aceita qualquer tipo de admin)
-                if 'admin' in allowed_roles and is_admin(user.role):
-                    return f(*args, **kwargs)
-                
-                # Verificar role exato
-                if user.role not in allowed_roles:
-                    return jsonify({'error': 'Acesso negado'}), 403
-                
+            # Só a autenticação fica no try: erros da rota não viram 401
+            user, erro = _autenticar('Erro de autenticação')
+            if erro:
+                return erro
+            
+            if not user:
+                return jsonify({'error': 'Usuário não encontrado'}), 404
+            
+            # Verificar se é admin (aceita qualquer tipo de admin)
+            if 'admin' in allowed_roles and is_admin(user.role):
                 return f(*args, **kwargs)
-            except Exception as e:
-                return jsonify({'error': 'Erro de autenticação'}), 401
+            
+            # Verificar role exato
+            if user.role not in allowed_roles:
+                return jsonify({'error': 'Acesso negado'}), 403
+            
+            return f(*args, **kwargs)
         return decorated_function
     return decorator
 
@@ -47,31 +82,37 @@ def require_recepcao(allowed_recepcoes):
     def decorator(f):
         @wraps(f)
         def decorated_function(*args, **kwargs):
-            try:
-                verify_jwt_in_request()
-                current_user_id = get_jwt_identity()
-                user = User.find_by_username(current_user_id)
-                
-                if not user:
-                    return jsonify({'error': 'Usuário não encontrado'}), 404
-                
-                # Admin tem acesso a tudo
-                if is_admin(user.role):
-                    return f(*args, **kwargs)
-                
-                if user.recepcao_id not in allowed_recepcoes:
-                    return jsonify({'error': 'Acesso negado para esta recepção'}), 403
-                
+            user, erro = _autenticar('Erro de autenticação')
+            if erro:
+                return erro
+            
+            if not user:
+                return jsonify({'error': 'Usuário não encontrado'}), 404
+            
+            # Admin tem acesso a tudo
+            if is_admin(user.role):
                 return f(*args, **kwargs)
-            except Exception as e:
-                return jsonify({'error': 'Erro de autenticação'}), 401
+            
+            if user.recepcao_id not in allowed_recepcoes:
+                return jsonify({'error': 'Acesso negado para esta recepção'}), 403
+            
+            return f(*args, **kwargs)
         return decorated_function
     return decorator
 
+def usuario_resolvido():
+    """
+    Usuário já resolvido nesta requisição (por @require_auth etc.), sem I/O.
+    Para rotas @rota_async: a corrotina roda no loop compartilhado e não pode
+    bloquear numa consulta ao Supabase.
+    """
+    cached = g.get('_current_user_cache')
+    return cached[1] if cached is not None else None
+
 def get_current_user():
     try:
-        verify_jwt_in_request()
-        current_user_id = get_jwt_identity()
-        return User.find_by_username(current_user_id)
-    except:
+        return _resolve_user()
+    except SupabaseIndisponivel:
+        raise
+    except Exception:
         return None
\ No newline at end of file
@@ -0,0 +1,123 @@
+"""
+Rastreio por requisição das chamadas ao Supabase
+
+Cada requisição da API ganha um Rastreio (numa contextvar, herdada pelo
+loop assíncrono) que soma as chamadas HTTP feitas por
+SimpleQuery: quantidade, bytes e tempo. Na resposta vai o header
+
+    Server-Timing: db;dur=153.2;desc="5 chamadas 12034 B", app;dur=201.7
+
+e um aviso no log quando a rota passa do orçamento de chamadas
+(QUERY_BUDGET, ou QUERY_BUDGETS="salas.update_sala=5,...") ou repete a
+mesma tabela mais de QUERY_REPEAT_LIMIT vezes (provável N+1).
+
+'db' soma a duração de cada chamada; com consultas em paralelo pode
+passar do tempo total da requisição.
+"""
+
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from flask import g, request
+from config import Config
+from utils.metricas import Contador
+
+logger = logging.getLogger(__name__)
+
+_rastreio_atual = ContextVar('rastreio_atual', default=None)
+
+excessos = Contador(
+    'query_budget_exceeded_total', 'Requisições acima do orçamento de chamadas ao Supabase ou com tabela repetida',
+    ('endpoint', 'reason')
+)
+
+class Rastreio:
+    def __init__(self):
+        self.chamadas = 0
+        self.bytes = 0
+        self.segundos = 0.0
+        self.por_tabela = {}
+        self.paginas = 0
+        self._lock = threading.Lock()
+
+    def registrar(self, tabela, metodo, tamanho, segundos, pagina=False):
+        with self._lock:
+            self.chamadas += 1
+            self.bytes += tamanho
+            self.segundos += segundos
+            # Páginas de uma mesma leitura (header Range) não contam como repetição
+            if pagina:
+                self.paginas += 1
+                return
+            chave = f"{metodo} {tabela}"
+            self.por_tabela[chave] = self.por_tabela.get(chave, 0) + 1
+
+    def repetidas(self, limite):
+        return {chave: n for chave, n in self.por_tabela.items() if n > limite}
+
+def rastrear_consulta(tabela, metodo, tamanho, segundos, pagina=False):
+    """Chamado por SimpleQuery a cada tentativa; fora de uma requisição não faz nada"""
+    rastreio = _rastreio_atual.get()
+    if rastreio is not None:
+        rastreio.registrar(tabela, metodo, tamanho, segundos, pagina)
+
+def rastreio_atual():
+    return _rastreio_atual.get()
+
+def _orcamentos():
+    orcamentos = {}
+    for item in Config.QUERY_BUDGETS.split(','):
+        if '=' in item:
+            endpoint, limite = item.split('=', 1)
+            orcamentos[endpoint.strip()] = int(limite)
+    return orcamentos
+
+def instalar_rastreio(app):
+    """Abre um Rastreio por requisição e fecha com Server-Timing e aviso de orçamento"""
+    orcamentos = _orcamentos()
+
+    @app.before_request
+    def _abrir_rastreio():
+        g._rastreio_inicio = time.perf_counter()
+        g._rastreio_token = _rastreio_atual.set(Rastreio())
+
+    @app.after_request
+    def _fechar_rastreio(response):
+        rastreio = _rastreio_atual.get()
+        inicio = g.pop('_rastreio_inicio', None)
+        if rastreio is None or inicio is None:
+            return response
+
+        total_ms = (time.perf_counter() - inicio) * 1000
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={rastreio.segundos * 1000:.1f};desc="{rastreio.chamadas} chamadas {rastreio.bytes} B", '
+            f'app;dur={total_ms:.1f}'
+        )
+
+        endpoint = request.endpoint or 'nao_encontrado'
+        orcamento = orcamentos.get(endpoint, Config.QUERY_BUDGET)
+        repetidas = rastreio.repetidas(Config.QUERY_REPEAT_LIMIT)
+        if rastreio.chamadas > orcamento:
+            excessos.inc((endpoint, 'orcamento'))
+        if repetidas:
+            excessos.inc((endpoint, 'repeticao'))
+        if rastreio.chamadas > orcamento or repetidas:
+            logger.warning('Rota acima do orçamento de chamadas ao Supabase', extra={
+                'endpoint': endpoint,
+                'chamadas': rastreio.chamadas,
+                'orcamento': orcamento,
+                'repetidas': repetidas,
+                'por_tabela': rastreio.por_tabela,
+                'paginas': rastreio.paginas,
+                'db_ms': round(rastreio.segundos * 1000, 1),
+                'total_ms': round(total_ms, 1)
+            })
+        return response
+
+    @app.teardown_request
+    def _descartar_rastreio(exc):
+        token = g.pop('_rastreio_token', None)
+        if token is not None:
+            _rastreio_atual.reset(token)
@@ -0,0 +1,161 @@
+"""
+Verificação de senha fora da thread da requisição e limite de tentativas de login
+
+check_password_hash (scrypt/pbkdf2) roda num pool de threads próprio e de
+tamanho fixo (HASH_WORKERS); o hashlib libera o GIL durante o KDF, então o
+resto da API continua sendo atendido. Quando as threads e a fila
+(HASH_QUEUE_MAX) estão cheias, verificar_senha levanta HashSaturado e a rota
+responde 429 em vez de acumular requisições esperando CPU.
+
+Senhas erradas contam por (usuário, IP) e por IP numa janela de LOGIN_JANELA
+segundos; acima do limite o login responde 429 sem gastar hash.
+
+Novos hashes seguem HASH_METHOD. Hashes antigos, fora dessa política, são
+refeitos em segundo plano depois de um login correto (em_segundo_plano).
+"""
+
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from werkzeug.security import check_password_hash, generate_password_hash
+from config import Config
+from utils.cache import TTLCache
+
+class HashSaturado(Exception):
+    """Todas as threads de hash ocupadas e fila cheia"""
+
+_executor = None
+_executor_pid = None
+_executor_lock = threading.Lock()
+_vagas = threading.BoundedSemaphore(Config.HASH_WORKERS + Config.HASH_QUEUE_MAX)
+
+_metricas_lock = threading.Lock()
+_metricas = {'verificacoes': 0, 'saturado': 0, 'segundos_total': 0.0, 'segundos_max': 0.0}
+_latencias = deque(maxlen=1000)
+
+def _get_executor():
+    global _executor, _executor_pid
+    pid = os.getpid()
+    if _executor is None or _executor_pid != pid:
+        with _executor_lock:
+            if _executor is None or _executor_pid != pid:
+                _executor = ThreadPoolExecutor(max_workers=Config.HASH_WORKERS, thread_name_prefix='hash')
+                _executor_pid = pid
+    return _executor
+
+def _registrar_latencia(segundos):
+    with _metricas_lock:
+        _metricas['verificacoes'] += 1
+        _metricas['segundos_total'] += segundos
+        _metricas['segundos_max'] = max(_metricas['segundos_max'], segundos)
+        _latencias.append(segundos)
+
+def _executar_no_pool(funcao, *args):
+    if not _vagas.acquire(blocking=False):
+        with _metricas_lock:
+            _metricas['saturado'] += 1
+        raise HashSaturado()
+
+    inicio = time.perf_counter()
+    try:
+        future = _get_executor().submit(funcao, *args)
+    except Exception:
+        _vagas.release()
+        raise
+    # A vaga só volta quando o hash termina, mesmo se a requisição desistir antes
+    future.add_done_callback(lambda _: _vagas.release())
+    try:
+        return future.result()
+    finally:
+        _registrar_latencia(time.perf_counter() - inicio)
+
+def verificar_senha(password_hash, password):
+    """check_password_hash no pool de hash; levanta HashSaturado se não houver vaga"""
+    return _executar_no_pool(check_password_hash, password_hash, password)
+
+def gerar_hash_no_pool(password):
+    """gerar_hash no pool de hash, para rotas (levanta HashSaturado se não houver vaga)"""
+    return _executar_no_pool(gerar_hash, password)
+
+def em_segundo_plano(funcao, *args):
+    """
+    Executa funcao(*args) no pool de hash sem esperar o resultado e devolve o
+    Future. Com o pool cheio não faz nada e devolve None (trabalho adiável).
+    """
+    if not _vagas.acquire(blocking=False):
+        return None
+    try:
+        future = _get_executor().submit(funcao, *args)
+    except Exception:
+        _vagas.release()
+        raise
+    future.add_done_callback(lambda _: _vagas.release())
+    return future
+
+def gerar_hash(password):
+    return generate_password_hash(password, method=Config.HASH_METHOD)
+
+@lru_cache(maxsize=1)
+def _prefixo_politica():
+    # 'scrypt' vira 'scrypt:32768:8:1' etc.; o prefixo antes do salt identifica os parâmetros
+    return gerar_hash('').split('$', 1)[0]
+
+def fora_da_politica(password_hash):
+    return password_hash.split('$', 1)[0] != _prefixo_politica()
+
+def _percentil(valores, p):
+    if not valores:
+        return 0.0
+    return valores[min(len(valores) - 1, int(len(valores) * p))]
+
+def estatisticas_hash():
+    """Contadores e latência (fila + hash) das verificações de senha"""
+    with _metricas_lock:
+        metricas = dict(_metricas)
+        latencias = sorted(_latencias)
+    metricas.update({
+        'workers': Config.HASH_WORKERS,
+        'fila_max': Config.HASH_QUEUE_MAX,
+        'p50': _percentil(latencias, 0.50),
+        'p95': _percentil(latencias, 0.95),
+        'p99': _percentil(latencias, 0.99)
+    })
+    return metricas
+
+# Tentativas erradas: chave -> (quantidade, fim da janela). Caches separados:
+# espalhar usernames aleatórios não expulsa os contadores por IP
+_tentativas_usuario = TTLCache(maxsize=Config.USER_MISSING_CACHE_MAXSIZE, ttl=Config.LOGIN_JANELA)
+_tentativas_ip = TTLCache(maxsize=Config.USER_MISSING_CACHE_MAXSIZE, ttl=Config.LOGIN_JANELA)
+_tentativas_lock = threading.Lock()
+
+def _chaves(username, ip):
+    # O limite por usuário vale por (usuário, IP): errar a senha de uma conta
+    # conhecida de outro IP não bloqueia o dono dela
+    return [
+        (_tentativas_usuario, ((username or '').lower(), ip), Config.LOGIN_MAX_TENTATIVAS_USUARIO),
+        (_tentativas_ip, ip, Config.LOGIN_MAX_TENTATIVAS_IP)
+    ]
+
+def login_bloqueado(username, ip):
+    """Segundos até liberar o login (0 se não está bloqueado)"""
+    agora = time.monotonic()
+    espera = 0
+    for cache, chave, limite in _chaves(username, ip):
+        quantidade, fim = cache.get(chave, (0, agora))
+        if quantidade >= limite:
+            espera = max(espera, fim - agora)
+    return int(espera) + 1 if espera > 0 else 0
+
+def registrar_falha(username, ip):
+    agora = time.monotonic()
+    with _tentativas_lock:
+        for cache, chave, _ in _chaves(username, ip):
+            quantidade, fim = cache.get(chave, (0, agora + Config.LOGIN_JANELA))
+            cache.set(chave, (quantidade + 1, fim), ttl=max(fim - agora, 0))
+
+def limpar_falhas(username, ip):
+    """Senha correta zera o contador do usuário nesse IP (o do IP continua valendo)"""
+    _tentativas_usuario.delete(((username or '').lower(), ip))
@@ -0,0 +1,114 @@
+"""
+Estatísticas calculadas no Postgres (contagens e views agrupadas)
+
+As contagens usam HEAD + Prefer: count=exact e as agregações leem as views
+dashboard_* (supabase/migrations/20251018120000_dashboard_stats.sql), então
+o volume trafegado não cresce com o histórico das tabelas.
+
+Os resultados prontos ficam num cache por (endpoint, recepção, role), de
+modo que vários usuários da mesma recepção compartilham um único cálculo.
+Rotas de escrita decoradas com @invalida_dashboard limpam esse cache.
+
+As consultas vão pelo cliente assíncrono (database_async): todas as rotas
+de dashboard são @rota_async e aguardam várias delas ao mesmo tempo.
+"""
+
+from functools import wraps
+from config import Config
+from database import SupabaseIndisponivel
+from utils.cache import TTLCache
+from utils.permissions import get_current_user
+
+SEM_RECEPCAO = 'Não definida'
+
+_dashboard_cache = TTLCache(maxsize=Config.DASHBOARD_CACHE_MAXSIZE, ttl=Config.DASHBOARD_CACHE_TTL)
+# Reserva: não é invalidada por escritas, só serve quando o Supabase cai
+_dashboard_reserva = TTLCache(maxsize=Config.DASHBOARD_CACHE_MAXSIZE, ttl=Config.DASHBOARD_STALE_TTL)
+
+def _da_reserva(chave, erro):
+    resultado = _dashboard_reserva.get(chave)
+    if resultado is None:
+        raise erro
+    return resultado
+
+async def dashboard_em_cache(endpoint, user, calcular):
+    """
+    Devolve o snapshot em cache ou calcula e guarda com await calcular().
+    Com o Supabase indisponível, devolve o último snapshot da reserva, se houver.
+    """
+    chave = (endpoint, user.recepcao_id, user.role)
+    resultado = _dashboard_cache.get(chave)
+    if resultado is None:
+        try:
+            resultado = await calcular()
+        except SupabaseIndisponivel as e:
+            return _da_reserva(chave, e)
+        _dashboard_cache.set(chave, resultado)
+        _dashboard_reserva.set(chave, resultado)
+    return resultado
+
+def invalidar_dashboard(recepcao_id=None):
+    """
+    Remove os snapshots da recepção e os globais (admin), que somam todas.
+    Sem recepcao_id (escrita feita por admin), limpa tudo.
+    """
+    if recepcao_id is None:
+        _dashboard_cache.clear()
+    else:
+        _dashboard_cache.delete_where(lambda chave: chave[1] in (recepcao_id, None))
+
+def invalida_dashboard(f):
+    """Decorator para rotas de escrita: invalida o dashboard após sucesso"""
+    @wraps(f)
+    def decorated_function(*args, **kwargs):
+        response = f(*args, **kwargs)
+        status = response[1] if isinstance(response, tuple) else getattr(response, 'status_code', 200)
+        if status < 400:
+            user = get_current_user()
+            invalidar_dashboard(user.recepcao_id if user else None)
+        return response
+    return decorated_function
+
+async def contar(query):
+    """Executa uma consulta criada com select(..., count='exact', head=True)"""
+    return (await query.execute_async()).count or 0
+
+async def contar_tabela(supabase, tabela, **filtros):
+    query = supabase.table(tabela).select('id', count='exact', head=True)
+    for coluna, valor in filtros.items():
+        query = query.eq(coluna, valor)
+    return await contar(query)
+
+async def _linhas_agrupadas(supabase, view, recepcao_id=None):
+    query = supabase.table(view).select('*')
+    if recepcao_id is not None:
+        query = query.eq('recepcao_id', recepcao_id)
+    return (await query.execute_async()).data
+
+def _somar(linhas, chave, padrao):
+    totais = {}
+    for linha in linhas:
+        valor = linha.get(chave) or padrao
+        totais[valor] = totais.get(valor, 0) + int(linha.get('total') or 0)
+    return totais
+
+def _resumo(linhas):
+    return {
+        'total': sum(int(linha.get('total') or 0) for linha in linhas),
+        'por_status': _somar(linhas, 'status', 'indefinido'),
+        'por_recepcao': _somar(linhas, 'recepcao_id', SEM_RECEPCAO)
+    }
+
+async def resumo_salas(supabase, recepcao_id=None):
+    """Total de salas, por status e por recepção"""
+    return _resumo(await _linhas_agrupadas(supabase, 'dashboard_salas_status', recepcao_id))
+
+async def resumo_orcamentos(supabase, recepcao_id=None):
+    """Total de orçamentos, por status e por recepção"""
+    return _resumo(await _linhas_agrupadas(supabase, 'dashboard_orcamentos_status', recepcao_id))
+
+async def orcamentos_por_mes(supabase, recepcao_id=None):
+    return _somar(await _linhas_agrupadas(supabase, 'dashboard_orcamentos_mes', recepcao_id), 'mes', 'indefinido')
+
+async def anamneses_por_mes(supabase, recepcao_id=None):
+    return _somar(await _linhas_agrupadas(supabase, 'dashboard_anamneses_mes', recepcao_id), 'mes', 'indefinido')